@@ -1,4 +1,6 @@
 from __future__ import annotations
+import shlex
+import sys
 from typing import Any, Optional
 from collections.abc import MutableMapping
 
@@ -10,6 +12,7 @@ from appunti.zettelkasten import zettelkasten as zk
 from appunti.zettelkasten.notes import NoteException
 from appunti.wrappers.base_wrapper import WrapperException
 from appunti.wrappers.editor_wrapper import EditorException
+from appunti.wrappers.fzf_wrapper import Fzf
 from appunti.utils import spinner, ask_for_confirmation
 from appunti.zettelkasten.sql import DBManagerException
 from appunti.cli.colors import color
@@ -39,20 +42,42 @@ class SubcommandsMixin:
     @staticmethod
     def _get_zk_id(args: Namespace,
                    my_zk: Zettelkasten) -> Optional[list[str]]:
-        if args.zk_id is None or not args.zk_id:
+        if (args.zk_id is None or not args.zk_id) and args.fzf:
+            try:
+                zk_id = SubcommandsMixin._fzf(args).select(
+                    my_zk.iter_titles())
+            except (WrapperException, DBManagerException) as e:
+                print(e)
+                return None
+        elif args.zk_id is None or not args.zk_id:
             loop = Interactive(my_zk)
             zk_id = loop.run()
         else:
             try:
                 zk_id = []
                 for id in args.zk_id:
-                    zk_id.append(my_zk.get_last() if id == "-1" else id)
+                    if id == "-1":
+                        zk_id.append(my_zk.get_last())
+                    else:
+                        zk_id.append(my_zk.resolve_id(id))
             except zk.ZettelkastenException as e:
                 print(e)
                 return None
 
         return zk_id
 
+    @staticmethod
+    def _fzf(args: Namespace) -> Fzf:
+        """
+        Create an fzf wrapper previewing notes with `appunti print`.
+        """
+        preview = " ".join([
+            shlex.quote(sys.executable), "-m", "appunti", "--vault",
+            shlex.quote(str(args.vault)), "print", "--no-record", "{2}"
+        ])
+
+        return Fzf(multi=True, preview=preview)
+
     @staticmethod
     def _create_zettelkasten(args: Namespace) -> Zettelkasten:
         my_zk = Zettelkasten(vault=args.vault,
@@ -72,7 +97,8 @@ class SubcommandsMixin:
                                             args.git_origin[0],
                                             autocommit=args.autocommit,
                                             autosync=args.autosync,
-                                            force=args.force)
+                                            force=args.force,
+                                            sharded=args.sharded)
             print(f"Vault initialized in '{args.vault}'")
             del my_zk
         except zk.ZettelkastenException:
@@ -105,6 +131,11 @@ class SubcommandsMixin:
             zk_ids = SubcommandsMixin._get_zk_id(args, my_zk)
             if zk_ids is None or not zk_ids:
                 return
+            if args.bulk:
+                my_zk.update_many(zk_ids,
+                                  confirmation=args.no_confirmation,
+                                  strict=args.strict)
+                return
             for zk_id in zk_ids:
                 my_zk.update(zk_id,
                              confirmation=args.no_confirmation,
@@ -170,7 +201,7 @@ class SubcommandsMixin:
         if zk_ids is None or not zk_ids:
             return
         for zk_id in zk_ids:
-            print(my_zk.print_note(zk_id))
+            print(my_zk.print_note(zk_id, record=args.record))
 
     @staticmethod
     def _pretty_print(header_names: list[str],
@@ -203,6 +234,16 @@ class SubcommandsMixin:
         else:
             my_zk.index_vault()
 
+    @staticmethod
+    @spinner("Moving notes...", "Moved {} notes.", format=True)
+    def migrate(args: Namespace) -> int:
+        try:
+            my_zk = SubcommandsMixin._create_zettelkasten(args)
+            return my_zk.migrate_layout(sharded=not args.flat)
+        except zk.ZettelkastenException as e:
+            print(e)
+            return 0
+
     @staticmethod
     def next(args: Namespace) -> None:
         try:
@@ -227,7 +268,7 @@ class SubcommandsMixin:
         "Syncing terminated successfully. You may need to reindex the vault.")
     def sync(args: Namespace) -> None:
         my_zk = SubcommandsMixin._create_zettelkasten(args)
-        my_zk.sync()
+        my_zk.sync(fast=args.fast)
 
     @staticmethod
     @spinner("Committing current changes...",
@@ -300,9 +341,12 @@ class SubcommandsMixin:
     def list(args: Namespace) -> None:
         try:
             my_zk = SubcommandsMixin._create_zettelkasten(args)
+            zk_ids = None if args.zk_id is None else [
+                my_zk.resolve_id(id) for id in args.zk_id
+            ]
             results = my_zk.list_notes(
                 args.title,
-                args.zk_id,
+                zk_ids,
                 args.author_name,
                 args.tags,
                 args.links,
@@ -311,6 +355,14 @@ class SubcommandsMixin:
                 args.sort_by[0],
                 args.descending,
                 args.show)
+            if args.abbrev and 'zk_id' in args.show:
+                column = args.show.index('zk_id')
+                abbreviations = my_zk.abbreviate_ids(
+                    [res[column] for res in results])
+                results = [
+                    res[:column] + (abbreviations[res[column]], ) +
+                    res[column + 1:] for res in results
+                ]
             SubcommandsMixin._pretty_print(args.show,
                                            results,
                                            no_header=args.no_header,
@@ -336,6 +388,7 @@ class Cli(SubcommandsMixin):
     command_print: MutableMapping[str, Any]
     command_list: MutableMapping[str, Any]
     command_reindex: MutableMapping[str, Any]
+    command_migrate: MutableMapping[str, Any]
     command_next: MutableMapping[str, Any]
     command_sync: MutableMapping[str, Any]
     command_commit: MutableMapping[str, Any]
@@ -347,6 +400,7 @@ class Cli(SubcommandsMixin):
     flag_autocommit: MutableMapping[str, Any]
     flag_autosync: MutableMapping[str, Any]
     flag_editor: MutableMapping[str, Any]
+    flag_fzf: MutableMapping[str, Any]
     flag_version: MutableMapping[str, Any]
 
     def __post_init__(self) -> None:
@@ -23,6 +23,10 @@ _COMMANDS: MutableMapping[str, Any] = {
                 "help":
                 "Force creation of vault, overwriting existing files and directories.",
                 "action": "store_true"
+            },
+            "--sharded": {
+                "help": "Keep notes in subdirectories named after their ids.",
+                "action": "store_true"
             }
         }
     },
@@ -59,6 +63,11 @@ _COMMANDS: MutableMapping[str, Any] = {
             "--strict": {
                 "help": "Whether to perform strict checks and raise errors",
                 "action": "store_true"
+            },
+            "--bulk": {
+                "help": ("Edit all the notes in one editor session, and save "
+                         "the changed ones with a single commit."),
+                "action": "store_true"
             }
         }
     },
@@ -93,6 +102,11 @@ _COMMANDS: MutableMapping[str, Any] = {
                 "help": "ID of the note to print.",
                 "nargs": "*",
                 "type": str,
+            },
+            "--no-record": {
+                "help": "Don't count the access in the frecency of the note.",
+                "action": "store_false",
+                "dest": "record"
             }
         }
     },
@@ -151,7 +165,7 @@ _COMMANDS: MutableMapping[str, Any] = {
                 "default": ['creation_date'],
                 "choices": [
                     "title", "author", "zk_id", "tag", "link", "creation_date",
-                    "last_changed"
+                    "last_changed", "frecency"
                 ]
             },
             "--descending": {
@@ -178,6 +192,10 @@ _COMMANDS: MutableMapping[str, Any] = {
             "--no-header": {
                 "help": "Do not show header",
                 "action": "store_true"
+            },
+            "--abbrev": {
+                "help": "Show the shortest unique prefixes of the ids.",
+                "action": "store_true"
             }
         }
     },
@@ -190,6 +208,15 @@ _COMMANDS: MutableMapping[str, Any] = {
             }
         }
     },
+    "command_migrate": {
+        "help": "Move the notes to subdirectories named after their ids.",
+        "flags": {
+            "--flat": {
+                "help": "Move the notes back to the root of the vault.",
+                "action": "store_true"
+            }
+        }
+    },
     "command_next": {
         "help": "Create new note continuing from last one.",
         "flags": {
@@ -216,6 +243,13 @@ _COMMANDS: MutableMapping[str, Any] = {
     },
     "command_sync": {
         "help": "Commit and sync with remote repository if available.",
+        "flags": {
+            "--fast": {
+                "help": ("Compare local and remote refs first, and only pull "
+                         "and push when needed."),
+                "action": "store_true"
+            }
+        }
     },
     "command_commit": {
         "help": "Commit current changes to repo.",
@@ -269,6 +303,10 @@ _COMMANDS: MutableMapping[str, Any] = {
         "nargs": 1,
         "help": "Editor to use."
     },
+    "flag_fzf": {
+        "action": "store_true",
+        "help": "Use fzf instead of the built-in interactive selection."
+    },
     "flag_version": {
         "action": "version",
         "version": '%(prog)s {version}'.format(version=version(_PROG_NAME))
@@ -0,0 +1,282 @@
+"""
+In-memory fuzzy matching of note titles, with fzf-like scoring
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+# characters at the start of a word weigh more
+BONUS_BOUNDARY = 8
+# so do uppercase letters after lowercase ones, and digits after letters
+BONUS_CAMEL = 7
+# a run of matches is worth as much as avoiding a gap
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+# the first character of the query counts double
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+# runs of alphanumeric characters
+_WORD = re.compile(r"[^\W_]+")
+
+
+class _Patterns(NamedTuple):
+    # the query as a subsequence, capturing the position of every character
+    subsequence: re.Pattern[str]
+    # the query as a whole, at the start of a word
+    word_start: re.Pattern[str]
+    # lines of the index containing the query, capturing their number
+    lines: re.Pattern[str]
+
+
+@lru_cache(maxsize=64)
+def _patterns(query: str) -> _Patterns:
+    escaped = [re.escape(char) for char in query]
+    # possessive quantifiers: every character matches its first
+    # occurrence after the previous one, without backtracking
+    subsequence = "".join(f"[^{char}]*+({char})" for char in escaped)
+    lines = "".join(f"[^\n\t{char}]*+{char}" for char in escaped[1:])
+    lines = escaped[0] + lines + "[^\n\t]*+\t(\\d+)"
+
+    return _Patterns(re.compile(subsequence),
+                     re.compile(r"(?<![^\W_])" + re.escape(query)),
+                     re.compile(lines))
+
+
+def fold(title: str) -> str:
+    """
+    Lowercase a title, keeping characters whose lowercase form
+    is longer than one character, so that positions stay aligned.
+    """
+    folded = title.lower()
+    if len(folded) == len(title):
+        return folded
+
+    return "".join(char if len(lower := char.lower()) != 1 else lower
+                   for char in title)
+
+
+def _bonus(prev: str, char: str) -> int:
+    """
+    Bonus for matching char, given the character preceding it.
+    """
+    if not char.isalnum():
+        return 0
+    if not prev or not prev.isalnum():
+        return BONUS_BOUNDARY
+    if prev.islower() and char.isupper():
+        return BONUS_CAMEL
+    if prev.isalpha() and char.isdigit():
+        return BONUS_CAMEL
+
+    return 0
+
+
+def best_score(length: int) -> int:
+    """
+    Highest score a query of the given length can get: the one of
+    a query found as a whole at the start of a word.
+    """
+    return length * SCORE_MATCH + BONUS_BOUNDARY * (
+        BONUS_FIRST_CHAR_MULTIPLIER + length - 1)
+
+
+def score(text: str, folded: str, query: str) -> Optional[int]:
+    """
+    Score how well query matches text.
+
+    Texts containing query as a whole at the start of a word get the
+    best score. Otherwise matches are found like fzf's v1 algorithm
+    does: take the first occurrence of query as a subsequence, and
+    shrink it backwards to the shortest window ending there. Matched
+    characters score more at the start of words and in runs, and
+    characters skipped in between cost.
+
+    :param text: text to match against.
+    :param folded: the text as it's compared to query, for example
+                   lowercased for a case-insensitive match.
+    :param query: the query, not empty.
+    :return: the score, or None if query doesn't match.
+    """
+    patterns = _patterns(query)
+    if query in folded and query[0].isalnum() \
+            and patterns.word_start.search(folded):
+        return best_score(len(query))
+
+    match = patterns.subsequence.match(folded)
+    if match is None:
+        return None
+
+    # backward pass from the end of the first occurrence
+    start = match.end()
+    for char in reversed(query):
+        start = folded.rfind(char, 0, start)
+    if start != match.start(1):
+        match = patterns.subsequence.match(folded, start)
+        assert match is not None
+
+    result = 0
+    first_bonus = 0
+    last = -1
+    for group in range(1, len(query) + 1):
+        position = match.start(group)
+        bonus = _bonus(text[position - 1] if position else "", text[position])
+        if group > 1 and position == last + 1:
+            # a run keeps the bonus of its first character
+            if bonus >= BONUS_BOUNDARY and bonus > first_bonus:
+                first_bonus = bonus
+            bonus = max(bonus, first_bonus, BONUS_CONSECUTIVE)
+        else:
+            if group > 1:
+                result += SCORE_GAP_START + SCORE_GAP_EXTENSION * (
+                    position - last - 2)
+            first_bonus = bonus
+        if group == 1:
+            bonus *= BONUS_FIRST_CHAR_MULTIPLIER
+        result += SCORE_MATCH + bonus
+        last = position
+
+    return result
+
+
+class FuzzyIndex:
+    """
+    Fuzzy finder over note titles, held in memory.
+
+    Titles are joined in a single string, so that the titles matching
+    a query are found by one regular expression search. When a query
+    extends the previous one, only the previous matches are searched
+    again. Only the best matches are sorted.
+
+    Titles containing the query at the start of a word get the best
+    score. They are looked up by the first characters of every word
+    first, and when there are enough of them the other titles aren't
+    even searched.
+
+    Matching is case-insensitive, unless the query contains uppercase
+    letters.
+
+    :param rows: tuples of (title, zk_id), in the order results
+                 are shown when the query is empty.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, ...]]) -> None:
+        self.rows: list[tuple[str, ...]] = [tuple(row) for row in rows]
+        self.titles = [
+            row[0].replace("\n", " ").replace("\t", " ") for row in self.rows
+        ]
+        self.folded = [fold(title) for title in self.titles]
+        self._lengths = [len(title) for title in self.titles]
+        self._blob = "\n".join(
+            f"{title}\t{index}" for index, title in enumerate(self.titles))
+        self._folded_blob = "\n".join(
+            f"{title}\t{index}" for index, title in enumerate(self.folded))
+        # titles by the first one and two characters of their words
+        self._initials: dict[str, list[int]] = {}
+        for index, title in enumerate(self.folded):
+            initials = set()
+            for word in _WORD.findall(title):
+                initials.add(word[0])
+                initials.add(word[:2])
+            for initial in initials:
+                self._initials.setdefault(initial, []).append(index)
+        # matches of the last query, to narrow down incrementally
+        self._last_query = ""
+        self._last_matches: Optional[list[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def matches(self, query: str) -> list[int]:
+        """
+        Find the titles containing query as a subsequence.
+
+        :param query: the query, not empty.
+        :return: indices of the matching titles, in order.
+        """
+        patterns = _patterns(query)
+        previous = self._last_matches
+        if previous is not None and self._last_query \
+                and query.startswith(self._last_query) \
+                and self._texts(query) is self._texts(self._last_query):
+            # every match of the new query matched the previous one
+            texts = self._texts(query)
+            found = [
+                index for index in previous
+                if patterns.subsequence.match(texts[index])
+            ]
+        else:
+            blob = self._folded_blob if query == query.lower() else self._blob
+            found = list(map(int, patterns.lines.findall(blob)))
+
+        self._last_query = query
+        self._last_matches = found
+
+        return found
+
+    def search(self,
+               query: str,
+               limit: Optional[int] = None) -> list[tuple[str, ...]]:
+        """
+        Rank the titles matching query.
+
+        :param query: the query. Whitespace is ignored.
+        :param limit: maximum number of results.
+        :return: the best matching rows, best first.
+        """
+        query = "".join(query.split())
+        if not query:
+            self._last_matches = None
+            return self.rows[:limit]
+
+        lengths = self._lengths
+        if limit is not None:
+            best = self._at_word_start(query)
+            if len(best) >= limit:
+                # on equal scores shorter and older titles win
+                ranked = heapq.nsmallest(limit, best, key=lengths.__getitem__)
+                return [self.rows[index] for index in ranked]
+
+        titles = self.titles
+        texts = self._texts(query)
+
+        def key(index: int) -> tuple[int, int, int]:
+            title_score = score(titles[index], texts[index], query)
+            return (title_score or 0, -lengths[index], -index)
+
+        found = self.matches(query)
+        if limit is None or limit >= len(found):
+            ranked = sorted(found, key=key, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, found, key=key)
+
+        return [self.rows[index] for index in ranked]
+
+    def _texts(self, query: str) -> list[str]:
+        """
+        The titles as they're compared to query.
+        """
+        return self.folded if query == query.lower() else self.titles
+
+    def _at_word_start(self, query: str) -> list[int]:
+        """
+        Find the titles containing query as a whole at the start
+        of a word, which get the best score.
+        """
+        if not query[0].isalnum():
+            return []
+        initial = fold(query[:2]) if query[1:2].isalnum() else fold(
+            query[0])
+        titles = self._initials.get(initial, [])
+        if initial == query:
+            return titles
+        texts = self._texts(query)
+        word_start = _patterns(query).word_start
+
+        return [index for index in titles if word_start.search(texts[index])]
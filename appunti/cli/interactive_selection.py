@@ -1,16 +1,46 @@
+from __future__ import annotations
+
 import curses
 from enum import IntEnum
 import re
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from string import ascii_lowercase, ascii_uppercase
+from threading import Condition, Thread
 
-from collections.abc import MutableMapping
-from typing import Optional
+from collections.abc import Callable, Collection, MutableMapping, Sequence
+from typing import Any, NamedTuple, Optional, overload
 
+from appunti.cli.fuzzy import FuzzyIndex
+from appunti.cli.preview import Preview, PreviewLoader
 from appunti.zettelkasten.zettelkasten import Zettelkasten
+from appunti.zettelkasten.sql import DBManagerCancelled
 
 ESCAPE_DELAY = 50
 POSITION_OFFSET = 2
 TITLE_DELIMITER = "&&"
+# milliseconds getch waits for a key before checking for query results
+INPUT_TIMEOUT = 20
+# seconds to wait for the user to stop typing before running a query
+QUERY_DEBOUNCE = 0.08
+NO_KEY = -1
+# how many result sets the query cache keeps
+QUERY_CACHE_SIZE = 64
+# how many of the best matches to show in fuzzy mode
+FUZZY_RESULTS = 100
+# results up to this many are fetched at once, larger ones page by page
+MATERIALIZE_LIMIT = 5000
+# how many results to fetch at once, and how many pages to keep
+PAGE_SIZE = 200
+MAX_PAGES = 8
+# the preview pane is only shown on terminals at least this wide
+PREVIEW_MIN_COLS = 80
+
+Results = Sequence[tuple[str, ...]]
+
+# SQLite's LIKE only folds the case of ASCII letters
+_ASCII_LOWER = str.maketrans(ascii_uppercase, ascii_lowercase)
 
 
 class OddKeys(IntEnum):
@@ -20,10 +50,368 @@ class OddKeys(IntEnum):
     TAB = 9
     MULTI_SELECTION = 42
     CTRL_A = 1
+    CTRL_F = 6
+    CTRL_R = 18
     ALT_BACKSPACE = 127
 
 
-# TODO: add window to the right containing metadata information if there is enough space
+class QueryWorker:
+    """
+    Run queries on a background thread, so that the input line keeps
+    responding while the index is searched.
+
+    A query only starts once no newer query has been submitted for
+    the debounce delay. Running queries that get superseded are
+    cancelled, and results of superseded queries are discarded.
+
+    :param query: function running the query. It receives the query
+                  arguments and a `cancelled` callback.
+    :param debounce: seconds to wait before running a query.
+    """
+
+    def __init__(self,
+                 query: Callable[..., Results],
+                 debounce: float = QUERY_DEBOUNCE) -> None:
+        self.query = query
+        self.debounce = debounce
+        self.generation = 0
+        self._consumed = 0
+        self._request: Optional[tuple[int, float, dict[str, Any]]] = None
+        self._result: Optional[tuple[int, Any]] = None
+        self._closed = False
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, delay: Optional[float] = None, **kwargs: Any) -> int:
+        """
+        Submit a new query, superseding every previous one.
+
+        :param delay: seconds to wait before running the query.
+                      Defaults to the debounce delay.
+        :return: the generation of the query.
+        """
+        delay = self.debounce if delay is None else delay
+        with self._condition:
+            self.generation += 1
+            self._request = (self.generation, time.monotonic() + delay,
+                             kwargs)
+            self._condition.notify_all()
+
+            return self.generation
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether the results of the latest query have not been consumed yet.
+        """
+        return self._consumed != self.generation
+
+    def poll(self) -> Optional[Results]:
+        """
+        Get the results of the latest query if they arrived,
+        without blocking.
+
+        :return: the results, or None if they're not ready or
+                 they were already consumed.
+        """
+        with self._condition:
+            return self._consume()
+
+    def wait(self) -> Optional[Results]:
+        """
+        Wait for the results of the latest query.
+
+        :return: the results, or None if they were already consumed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._closed or (
+                self._result is not None
+                and self._result[0] == self.generation))
+            return self._consume()
+
+    def cancel(self) -> None:
+        """
+        Supersede every submitted query without running a new one.
+        """
+        with self._condition:
+            self.generation += 1
+            self._consumed = self.generation
+            self._request = None
+
+    def close(self) -> None:
+        """
+        Stop the worker, cancelling the running query.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _consume(self) -> Optional[Results]:
+        if self._result is None or self._result[0] != self.generation \
+                or self._consumed == self.generation:
+            return None
+
+        self._consumed = self.generation
+        generation, results = self._result
+        if isinstance(results, Exception):
+            raise results
+
+        return results
+
+    def _next_request(self) -> Optional[tuple[int, dict[str, Any]]]:
+        """
+        Wait for a request and for its debounce delay to expire.
+        """
+        with self._condition:
+            while not self._closed:
+                if self._request is None:
+                    self._condition.wait()
+                    continue
+                generation, start, kwargs = self._request
+                remaining = start - time.monotonic()
+                if remaining > 0:
+                    # a newer request could arrive in the meantime
+                    self._condition.wait(remaining)
+                    continue
+                self._request = None
+
+                return generation, kwargs
+
+        return None
+
+    def _run(self) -> None:
+        while (request := self._next_request()) is not None:
+            generation, kwargs = request
+
+            def cancelled() -> bool:
+                return self._closed or generation != self.generation
+
+            try:
+                results: Any = self.query(cancelled=cancelled, **kwargs)
+            except DBManagerCancelled:
+                continue
+            except Exception as e:
+                results = e
+
+            with self._condition:
+                if generation == self.generation:
+                    self._result = (generation, results)
+                    self._condition.notify_all()
+
+
+class WindowedResults(Sequence[tuple[str, ...]]):
+    """
+    Results of a query too large to fetch at once. Rows are fetched
+    a page at a time, when they're first accessed, and only the most
+    recently used pages are kept.
+
+    :param fetch: function fetching rows, given offset and limit.
+    :param total: number of rows.
+    :param page_size: how many rows to fetch at once.
+    :param max_pages: how many pages to keep.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[int, int], list[tuple[str, ...]]],
+                 total: int,
+                 page_size: int = PAGE_SIZE,
+                 max_pages: int = MAX_PAGES) -> None:
+        self.fetch = fetch
+        self.total = total
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages: OrderedDict[int, list[tuple[str, ...]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.total
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[str, ...]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[str, ...]]:
+        ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> tuple[str, ...] | list[tuple[str, ...]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.total))]
+        if index < 0:
+            index += self.total
+        if not 0 <= index < self.total:
+            raise IndexError("result index out of range")
+
+        page_number, row = divmod(index, self.page_size)
+
+        return self._page(page_number)[row]
+
+    def _page(self, page_number: int) -> list[tuple[str, ...]]:
+        if (page := self._pages.get(page_number)) is not None:
+            self._pages.move_to_end(page_number)
+            return page
+
+        page = self.fetch(page_number * self.page_size, self.page_size)
+        self._pages[page_number] = page
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+        return page
+
+
+class QueryKey(NamedTuple):
+    """
+    Filters of an interactive query, as produced by
+    `Interactive.parse_text`.
+    """
+    title: tuple[str, ...]
+    tags: tuple[str, ...]
+    links: tuple[str, ...]
+
+    @classmethod
+    def from_filters(cls, title: list[str], tags: Optional[list[str]],
+                     links: Optional[list[str]]) -> QueryKey:
+        return cls(tuple(title), tuple(tags or ()), tuple(links or ()))
+
+    def refines(self, other: QueryKey) -> bool:
+        """
+        Whether every note matching this query also matches other.
+        """
+        return all(
+            _terms_imply(new, old)
+            for new, old in zip(self, other))
+
+
+def _terms_imply(new_terms: tuple[str, ...],
+                 old_terms: tuple[str, ...]) -> bool:
+    """
+    Whether every value matching all the new terms also matches
+    all the old ones.
+    """
+    return all(
+        any(_term_implies(new, old) for new in new_terms)
+        for old in old_terms)
+
+
+def _term_implies(new: str, old: str) -> bool:
+    """
+    Whether a value matching the new LIKE term also matches the old one.
+    Terms look like '%text%', or '!%text%' when negated.
+    """
+    if new.startswith("!") != old.startswith("!"):
+        return False
+    new_text = new.removeprefix("!")[1:-1].translate(_ASCII_LOWER)
+    old_text = old.removeprefix("!")[1:-1].translate(_ASCII_LOWER)
+    if old.startswith("!"):
+        # not containing a shorter text means not containing a longer one
+        return new_text in old_text
+
+    return old_text in new_text
+
+
+@lru_cache(maxsize=256)
+def _like_to_regex(term: str) -> re.Pattern[str]:
+    """
+    Compile a LIKE pattern into the equivalent regular expression.
+    """
+    regex = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in term)
+
+    return re.compile(regex, re.IGNORECASE | re.ASCII | re.DOTALL)
+
+
+class QueryCache:
+    """
+    Per-session cache of the results of interactive queries.
+
+    Repeated queries, like the ones obtained by deleting characters,
+    are served from the cache. Queries that narrow down a cached
+    one, like the ones obtained by typing more characters, are
+    answered by filtering the cached results in memory.
+
+    :param zk: the zettelkasten being queried.
+    :param maxsize: how many result sets to keep.
+    """
+
+    def __init__(self, zk: Zettelkasten,
+                 maxsize: int = QUERY_CACHE_SIZE) -> None:
+        self.zk = zk
+        self.maxsize = maxsize
+        self._results: OrderedDict[QueryKey, list[tuple[str, ...]]] = \
+            OrderedDict()
+        self._tags: Optional[dict[str, set[str]]] = None
+        self._links: Optional[dict[str, set[str]]] = None
+
+    def get(self, key: QueryKey) -> Optional[list[tuple[str, ...]]]:
+        """
+        Get the results of a query without asking the index.
+
+        :param key: the query.
+        :return: the results, or None if the query has to run.
+        """
+        if (results := self._results.get(key)) is not None:
+            self._results.move_to_end(key)
+            return results
+
+        # the smallest cached superset is the cheapest to filter
+        supersets = [
+            cached for cached_key, cached in self._results.items()
+            if key.refines(cached_key)
+        ]
+        if not supersets:
+            return None
+        results = self._filter(min(supersets, key=len), key)
+        self.put(key, results)
+
+        return results
+
+    def put(self, key: QueryKey, results: list[tuple[str, ...]]) -> None:
+        """
+        Store the results of a query.
+
+        :param key: the query.
+        :param results: rows of (title, zk_id).
+        """
+        self._results[key] = results
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def _filter(self, results: list[tuple[str, ...]],
+                key: QueryKey) -> list[tuple[str, ...]]:
+        # load tags and links once, and only if needed
+        if key.tags and self._tags is None:
+            self._tags = self.zk.dbmanager.get_tags_by_note()
+        if key.links and self._links is None:
+            self._links = self.zk.dbmanager.get_links_by_note()
+        tags = self._tags or {}
+        links = self._links or {}
+
+        return [
+            row for row in results
+            if all(_matches(term, (row[0], )) for term in key.title)
+            and all(_matches(term, tags.get(row[1])) for term in key.tags)
+            and all(_matches(term, links.get(row[1])) for term in key.links)
+        ]
+
+
+def _matches(term: str, values: Optional[Collection[str]]) -> bool:
+    """
+    Replicate how the index applies a LIKE term: a note matches a
+    term if any of its values does, and a negated term if it has
+    values but none of them matches.
+    """
+    if not values:
+        return False
+    pattern = _like_to_regex(term.removeprefix("!"))
+    found = any(pattern.fullmatch(value) for value in values)
+
+    return not found if term.startswith("!") else found
+
+
 # TODO: comment!
 class Interactive:
 
@@ -35,17 +423,40 @@ class Interactive:
         self.relative_start = 0
         self.prev_relative_start = 0
         self.selection: MutableMapping[int, int] = defaultdict(int)
+        self.worker = QueryWorker(self.list_notes)
+        self.cache = QueryCache(self.zk)
+        # filters of the query the worker is running
+        self.pending_key: Optional[QueryKey] = None
+        # match titles fuzzily instead of with LIKE filters
+        self.fuzzy_mode = False
+        self.fuzzy: Optional[FuzzyIndex] = None
+        # sort by frecency instead of creation date
+        self.frecency_mode = False
+        # what is drawn on every line of the results
+        self.screen_lines: dict[int, str] = {}
+        # previews of the notes on screen, loaded in the background
+        self.previews = PreviewLoader(self.zk)
+        # what is drawn on every line of the preview pane, and for
+        # which note and page
+        self.preview_lines: dict[int, tuple[str, int]] = {}
+        self.preview_state: Optional[tuple[str, bool]] = None
+        self.preview_page: Optional[tuple[int, int, str]] = None
         curses.start_color()
         curses.init_pair(1, curses.COLOR_BLUE, curses.COLOR_BLACK)
         curses.init_pair(2, curses.COLOR_CYAN, curses.COLOR_BLACK)
 
-    def print_results(self, results: list[tuple[str, ...]], pos: int) -> None:
+    def print_results(self, results: Results, pos: int) -> None:
         curses.curs_set(False)
         template = " {}{}"
+        # only the visible results are formatted, and only the lines
+        # that changed are drawn again
         for i in range(POSITION_OFFSET, curses.LINES):
             text = self.pad_results(i + self.relative_start, results, template)
-            self.w.addstr(i, 0, text)
-            self.w.refresh()
+            if self.screen_lines.get(i) != text:
+                self.w.addstr(i, 0, text)
+                self.screen_lines[i] = text
+        self.w.noutrefresh()
+        curses.doupdate()
         curses.curs_set(True)
 
     @staticmethod
@@ -68,6 +479,21 @@ class Interactive:
             case OddKeys.MULTI_SELECTION:
                 self.selection[pos] = 1 - self.selection[pos]
                 redraw = True
+            case OddKeys.CTRL_F:
+                self.fuzzy_mode = not self.fuzzy_mode
+                pos = 0
+                self.relative_start = 0
+                self.selection = defaultdict(int)
+                redraw = True
+            case OddKeys.CTRL_R:
+                self.frecency_mode = not self.frecency_mode
+                # cached results are in the other order
+                self.cache = QueryCache(self.zk)
+                self.fuzzy = None
+                pos = 0
+                self.relative_start = 0
+                self.selection = defaultdict(int)
+                redraw = True
             case OddKeys.CTRL_A:
                 if all(self.selection.values()):
                     self.selection = defaultdict(int)
@@ -84,6 +510,9 @@ class Interactive:
                 pos -= 1
             case curses.KEY_RESIZE:
                 curses.resize_term(*self.w.getmaxyx())
+                self.w.clear()
+                self.reset_screen()
+                self.draw_mode()
                 redraw = True
             case curses.KEY_BACKSPACE | OddKeys.ALT_BACKSPACE:
                 cursor_pos = self.check_cursor_pos(text, self.cursor_pos - 1)
@@ -125,7 +554,7 @@ class Interactive:
         return text, pos, endit, redraw
 
     def check_pos(self, pos: int,
-                  results: list[tuple[str, ...]]) -> tuple[int, bool]:
+                  results: Results) -> tuple[int, bool]:
         length = len(results)
         redraw = False
         current_position = pos - self.relative_start + POSITION_OFFSET
@@ -159,6 +588,111 @@ class Interactive:
         self.w.addstr(pos - self.relative_start + POSITION_OFFSET, 0, ">",
                       curses.color_pair(1))
 
+    @property
+    def list_width(self) -> int:
+        """
+        Width of the results list: half the screen when there is room
+        for the preview pane, the whole screen otherwise.
+        """
+        if curses.COLS >= PREVIEW_MIN_COLS:
+            return curses.COLS // 2
+
+        return curses.COLS
+
+    def reset_screen(self) -> None:
+        """
+        Forget what is drawn, so that everything is drawn again.
+        """
+        self.screen_lines = {}
+        self.preview_lines = {}
+        self.preview_state = None
+        self.preview_page = None
+
+    def draw_preview(self, results: Results, pos: int) -> None:
+        """
+        Draw the preview of the highlighted note on the right of the
+        results, and request the previews of the other notes on screen.
+        Previews are loaded in the background: until the one of the
+        highlighted note arrives, the pane says so.
+        """
+        width = curses.COLS - self.list_width
+        if width == 0:
+            return
+
+        zk_id = results[pos][1] if 0 <= pos < len(results) else ""
+        page = (id(results), self.relative_start, zk_id)
+        if zk_id and page != self.preview_page:
+            # highlighted note first, then the rest of the page
+            end = min(len(results),
+                      self.relative_start + curses.LINES - POSITION_OFFSET)
+            page_ids = [zk_id] + [
+                results[index][1] for index in range(self.relative_start, end)
+                if index != pos
+            ]
+            self.previews.prefetch(page_ids)
+        self.preview_page = page
+
+        preview = self.previews.get(zk_id) if zk_id else None
+        state = (zk_id, preview is not None)
+        if state == self.preview_state:
+            return
+        self.preview_state = state
+
+        if not self.preview_lines:
+            self.w.vline(POSITION_OFFSET, self.list_width, curses.ACS_VLINE,
+                         curses.LINES - POSITION_OFFSET)
+        if not zk_id:
+            lines = []
+        elif preview is None:
+            lines = [(" loading...", curses.A_DIM)]
+        else:
+            lines = self.format_preview(preview)
+
+        curses.curs_set(False)
+        for i in range(POSITION_OFFSET, curses.LINES):
+            index = i - POSITION_OFFSET
+            text, attr = lines[index] if index < len(lines) else ("", 0)
+            line = (self.pad_text(text, width - 1), attr)
+            if self.preview_lines.get(i) != line:
+                self.w.addstr(i, self.list_width + 1, *line)
+                self.preview_lines[i] = line
+        self.w.noutrefresh()
+        curses.doupdate()
+        curses.curs_set(True)
+
+    @staticmethod
+    def format_preview(preview: Preview) -> list[tuple[str, int]]:
+        """
+        Lines of the preview pane, with their attributes.
+        """
+        metadata = preview.metadata
+        lines = []
+        if metadata:
+            fields = [
+                ("created", metadata['creation_date']),
+                ("changed", metadata['last_changed']),
+                ("author", metadata['author']),
+                ("tags", ", ".join(sorted(metadata['tag']))),
+                ("links", ", ".join(sorted(metadata['link']))),
+            ]
+            lines.append((f" {metadata['title']}",
+                          curses.color_pair(2) | curses.A_BOLD))
+            lines += [(f" {name}: {value}", curses.color_pair(1))
+                      for name, value in fields if value]
+            lines.append(("", 0))
+        lines += [(f" {line}", 0) for line in preview.head]
+
+        return lines
+
+    def draw_mode(self) -> None:
+        modes = [
+            name for name, active in [("fuzzy", self.fuzzy_mode),
+                                      ("frecency", self.frecency_mode)]
+            if active
+        ]
+        mode = " " + " ".join(modes)
+        self.w.addstr(1, 0, self.pad_text(mode), curses.color_pair(1))
+
     @staticmethod
     def parse_text(
         text: str
@@ -202,68 +736,198 @@ class Interactive:
         return final_text, optional_tags, optional_links
 
     @staticmethod
-    def pad_text(text: str) -> str:
+    def pad_text(text: str, width: Optional[int] = None) -> str:
+        width = curses.COLS if width is None else width
         length = len(text)
-        length_to_fill = curses.COLS - length if length < curses.COLS else 0
+        length_to_fill = width - length if length < width else 0
         padding = " " * (length_to_fill - 1)
 
         padded_text = text + padding
 
-        return padded_text[:curses.COLS - 1]
+        return padded_text[:width - 1]
 
-    def pad_results(self, draw_pos: int, results: list[tuple[str, ...]],
+    def pad_results(self, draw_pos: int, results: Results,
                     template: str) -> str:
         if draw_pos < len(results) + POSITION_OFFSET:
             index = draw_pos - POSITION_OFFSET
             title = results[index][0]
             selection_indicator = "*" if self.selection[index] else " "
-            text = self.pad_text(template.format(selection_indicator, title))
+            text = self.pad_text(template.format(selection_indicator, title),
+                                 self.list_width)
         else:
-            text = self.pad_text(" ")
+            text = self.pad_text(" ", self.list_width)
 
         return text
 
+    def query(self,
+              text: str,
+              delay: Optional[float] = None
+              ) -> Optional[Results]:
+        """
+        Get the notes matching the text from the cache, or submit
+        a query to the worker if they're not cached. In fuzzy mode,
+        titles are ranked in memory instead.
+
+        :param text: text typed by the user.
+        :param delay: seconds to wait before running the query.
+        :return: the results, or None if a query was submitted.
+        """
+        if self.fuzzy_mode:
+            # ranking titles in memory is fast enough to do right away
+            self.worker.cancel()
+            self.pending_key = None
+            if self.fuzzy is None:
+                self.fuzzy = FuzzyIndex(
+                    self.zk.list_notes(**self.sort_order(self.frecency_mode)))
+            return self.fuzzy.search(text, limit=FUZZY_RESULTS)
+
+        # parse the text to intercept tag or link filters
+        parsed_text, tags, links = self.parse_text(text)
+        key = QueryKey.from_filters(parsed_text, tags, links)
+        if (cached := self.cache.get(key)) is not None:
+            # results of older queries must not replace these
+            self.worker.cancel()
+            self.pending_key = None
+            return cached
+
+        self.pending_key = key
+        self.worker.submit(delay=delay,
+                           title=parsed_text,
+                           tags=tags,
+                           links=links,
+                           frecency=self.frecency_mode)
+
+        return None
+
+    @staticmethod
+    def sort_order(frecency: bool) -> dict[str, Any]:
+        """
+        How results are sorted: oldest first, or most frecent first.
+        """
+        if frecency:
+            return {'sort_by': 'frecency', 'descending': True}
+
+        return {'sort_by': 'creation_date', 'descending': False}
+
+    def list_notes(self,
+                   title: list[str],
+                   tags: Optional[list[str]] = None,
+                   links: Optional[list[str]] = None,
+                   frecency: bool = False,
+                   cancelled: Optional[Callable[[], bool]] = None) -> Results:
+        """
+        Get the notes matching the filters, oldest or most frecent
+        first. Small results are fetched at once, large ones a page
+        at a time as they're shown.
+        """
+        sort_order = self.sort_order(frecency)
+        total = self.zk.count_notes(title=title,
+                                    tags=tags,
+                                    links=links,
+                                    cancelled=cancelled)
+
+        if total <= MATERIALIZE_LIMIT:
+            return self.zk.list_notes(title=title,
+                                      tags=tags,
+                                      links=links,
+                                      cancelled=cancelled,
+                                      **sort_order)
+
+        def fetch(offset: int, limit: int) -> list[tuple[str, ...]]:
+            # pages are fetched as they're shown, when the query
+            # can't be superseded anymore
+            return self.zk.list_notes(title=title,
+                                      tags=tags,
+                                      links=links,
+                                      limit=limit,
+                                      offset=offset,
+                                      **sort_order)
+
+        results = WindowedResults(fetch, total)
+        # fetch the first page while still in the background
+        results[0]
+
+        return results
+
+    def receive(
+        self, results: Optional[Results]
+    ) -> Optional[Results]:
+        """
+        Store the results coming from the worker in the cache.
+        """
+        # windowed results are too large to be filtered in memory
+        if isinstance(results, list) and self.pending_key is not None:
+            self.cache.put(self.pending_key, results)
+            self.pending_key = None
+
+        return results
+
     def _main(self) -> Optional[list[str]]:
         # clear screen
         self.w.clear()
+        self.reset_screen()
         # show cursor
         curses.curs_set(True)
         # set esc delay to 50 milliseconds
         curses.set_escdelay(ESCAPE_DELAY)
+        # don't block on input, so that query results can be drawn
+        # as soon as they arrive
+        self.w.timeout(INPUT_TIMEOUT)
         # initial text
         text = ""
         # show all the notes at start
-        result_list = self.zk.list_notes(title=[f"%{text}%"],
-                                         sort_by='creation_date',
-                                         descending=False)
+        self.query(text, delay=0)
+        result_list = self.receive(self.worker.wait()) or []
         # inital position of the cursor
         pos = 0
         self.print_results(result_list, pos)
         self.draw_pointer(pos, 0)
+        self.draw_preview(result_list, pos)
         self.w.addstr(0, 0, text, curses.color_pair(2))
         # break the loop when pressing ESC or C-c
         while (c := self.w.getch()) != OddKeys.ESCAPE:
             old_pos = pos
+            if c == NO_KEY:
+                # draw the results of the latest query if they arrived
+                if (new_results := self.receive(self.worker.poll())) is None:
+                    # draw the preview if it arrived
+                    self.draw_preview(result_list, pos)
+                    self.w.move(0, self.cursor_pos)
+                    continue
+                result_list = new_results
+                pos = 0
+                self.relative_start = 0
+                self.print_results(result_list, pos)
+                self.draw_pointer(pos, old_pos)
+                self.draw_preview(result_list, pos)
+                self.w.move(0, self.cursor_pos)
+                continue
+
             # update text and pos based on key pressed
+            modes = (self.fuzzy_mode, self.frecency_mode)
             new_text, pos, endit, redraw_key = self.catch_key(c, text, pos)
             if endit:
+                # make sure the selection refers to the current text
+                if self.worker.pending:
+                    result_list = self.receive(
+                        self.worker.wait()) or result_list
+                    pos = 0
+                    self.selection = defaultdict(int)
                 break
 
             # enforce checks on pos
             pos, redraw_pos = self.check_pos(pos, result_list)
             # only redraw results if input changed
             if redraw_pos or redraw_key:
-                # if text changed, recalculate list
-                if new_text != text:
-                    # parse the text to intercept tag or link filters
-                    parsed_text, tags, links = self.parse_text(new_text)
+                # if text changed, update the list of notes from the
+                # cache, or query them in the background. Results of
+                # background queries are drawn when they arrive.
+                if new_text != text or modes != (self.fuzzy_mode,
+                                                 self.frecency_mode):
                     text = new_text
-                    # update list of notes
-                    result_list = self.zk.list_notes(title=parsed_text,
-                                                     tags=tags,
-                                                     links=links,
-                                                     sort_by='creation_date',
-                                                     descending=False)
+                    if (cached := self.query(text)) is not None:
+                        result_list = cached
+                    self.draw_mode()
 
                 self.print_results(result_list, pos)
 
@@ -272,6 +936,7 @@ class Interactive:
                 self.w.addstr(0, 0, padded_text, curses.color_pair(2))
 
             self.draw_pointer(pos, old_pos)
+            self.draw_preview(result_list, pos)
             # put the cursor at the end of input
             self.w.move(0, self.cursor_pos)
 
@@ -301,6 +966,8 @@ class Interactive:
         except KeyboardInterrupt:
             return None
         finally:
+            self.worker.close()
+            self.previews.close()
             curses.nocbreak()
             self.w.keypad(False)
             curses.echo()
@@ -1,18 +1,39 @@
 import curses
-from pathlib import Path
+import re
 import textwrap
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
 from enum import Enum, IntEnum, auto
+from hashlib import blake2b
+from itertools import accumulate
+from threading import Condition, Lock, Thread
 
-from typing import Optional, cast
+from typing import NamedTuple, Optional, cast
 
 from appunti.zettelkasten.zettelkasten import Zettelkasten, ZettelkastenException
-from appunti.zettelkasten.notes import Note
-from appunti.utils import sluggify
+from appunti.zettelkasten.notes import Note, NoteException
+from appunti.parser.parser import BodyException, FrontmatterException
 from appunti.cli.interactive_selection import Interactive
+from appunti.cli.fuzzy import fold
+from appunti.cli.title_index import TitleIndex
 
 LINKS_RATIO = 4
 ESCAPE_DELAY = 50
 _NEXT_NOTE_SYM = "-> "
+_INCOMING_SYM = "<- "
+_TWO_HOP_SYM = "~ "
+# how many prepared notes the pager keeps
+PREFETCH_CACHE_SIZE = 64
+# how many wrapped lines a note keeps
+WRAP_CACHE_SIZE = 4096
+
+_LINK = re.compile(r"\[\[.*?\]\]")
+# whitespace textwrap would turn into spaces
+_WHITESPACE = str.maketrans("\v\f\r", "   ")
+# color pairs of search matches, and of the current one
+MATCH_PAIR = 6
+CURRENT_MATCH_PAIR = 7
 
 
 class Context(Enum):
@@ -25,6 +46,13 @@ class Context(Enum):
     CODE_IN = auto()
 
 
+class Position(NamedTuple):
+    # index of the line in the note
+    line: int
+    # row of the line, once wrapped
+    row: int
+
+
 class Keybindings(IntEnum):
     J = ord('j')
     S_J = ord('J')
@@ -49,103 +77,554 @@ class Keybindings(IntEnum):
     R = ord('r')
     N = ord('n')
     S_N = ord('N')
+    B = ord('b')
+    O = ord('o')
+    C_N = 14
+    C_P = 16
+    SLASH = ord('/')
+    QUESTION = ord('?')
     ALT_BACKSPACE = 127
 
 
+class Span(NamedTuple):
+    line: int
+    start: int
+    end: int
+    # color pair the characters are drawn with
+    pair: int
+
+
+def normalize(content: str) -> str:
+    """
+    Expand tabs and turn other whitespace into spaces, so that wrapped
+    rows are slices of the lines they come from.
+
+    :param content: the materialized note.
+    """
+    if "\t" in content:
+        content = content.expandtabs()
+
+    return content.translate(_WHITESPACE)
+
+
+def highlight(lines: list[str]) -> list[Span]:
+    """
+    Find what to color in a note, in one pass: frontmatter, headers,
+    code blocks and links.
+
+    :param lines: the lines of the note, normalized.
+    :return: the spans to color, by line.
+    """
+    spans = []
+    context = Context.OUT
+    for index, line in enumerate(lines):
+        if line == "---" and context is Context.OUT:
+            context = Context.FRONTMATTER_IN
+        elif line == "---" and context is Context.FRONTMATTER_IN:
+            context = Context.OUT
+
+        if line.startswith("```") and context is Context.OUT:
+            context = Context.CODEBLOCK_IN
+        elif line.startswith('```') and context is Context.CODEBLOCK_IN:
+            context = Context.OUT
+
+        if context is Context.FRONTMATTER_IN and line != "---":
+            spans.append(Span(index, 0, len(line), 1))
+        elif context is Context.CODEBLOCK_IN and not line.startswith("```"):
+            spans.append(Span(index, 0, len(line), 3))
+        else:
+            if line.startswith('#'):
+                spans.append(Span(index, 0, len(line), 2))
+            if "[[" in line:
+                spans += [
+                    Span(index, *match.span(), 4)
+                    for match in _LINK.finditer(line)
+                ]
+
+    return spans
+
+
+class HighlightCache:
+    """
+    Bounded cache of the spans of notes, keyed by a hash of their
+    content, so that notes read again unchanged aren't highlighted
+    again. It can be shared between threads.
+
+    :param maxsize: how many notes to keep.
+    """
+
+    def __init__(self, maxsize: int = PREFETCH_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._spans: OrderedDict[bytes, list[Span]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, lines: list[str]) -> list[Span]:
+        """
+        Get the spans of a note, highlighting it if it's not cached.
+
+        :param lines: the lines of the note, normalized.
+        """
+        digest = blake2b("\n".join(lines).encode(), digest_size=16).digest()
+        with self._lock:
+            spans = self._spans.get(digest)
+            if spans is not None:
+                self._spans.move_to_end(digest)
+                return spans
+
+        spans = highlight(lines)
+        with self._lock:
+            self._spans[digest] = spans
+            while len(self._spans) > self.maxsize:
+                self._spans.popitem(last=False)
+
+        return spans
+
+
+class WrappedContent:
+    """
+    Content of a note, wrapped lazily to the width of the window.
+
+    The content is split in lines and highlighted once. Lines are only
+    wrapped when they're shown, and kept until the width changes. Spans
+    refer to lines rather than rows, so they stay valid for any width
+    and are just replayed on the rows shown.
+
+    :param content: the materialized note.
+    :param highlights: cache to take the spans from.
+    """
+
+    def __init__(self,
+                 content: str,
+                 highlights: Optional[HighlightCache] = None) -> None:
+        self.content = content
+        self.lines = normalize(content).split("\n")
+        self.spans = highlight(
+            self.lines) if highlights is None else highlights.get(self.lines)
+        # first span of every line
+        self._span_lines = [span.line for span in self.spans]
+        self.width = 0
+        self._wrapped: dict[int, list[tuple[int, str]]] = {}
+        # the lines joined back, folded, and where every line starts
+        # in them, built on the first search
+        self._joined: Optional[str] = None
+        self._folded: Optional[str] = None
+        self._starts: Optional[list[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def set_width(self, width: int) -> None:
+        """
+        Wrap lines to a new width from now on.
+
+        :param width: width of the window.
+        """
+        if width != self.width:
+            self.width = width
+            self._wrapped = {}
+
+    def wrap(self, index: int) -> list[tuple[int, str]]:
+        """
+        The rows a line takes on screen, with where they start in the
+        line. Empty lines take one.
+
+        :param index: index of the line.
+        """
+        rows = self._wrapped.get(index)
+        if rows is None:
+            if len(self._wrapped) >= WRAP_CACHE_SIZE:
+                self._wrapped = {}
+            line = self.lines[index]
+            rows = []
+            offset = 0
+            for text in textwrap.wrap(line, self.width,
+                                      expand_tabs=False) or [""]:
+                offset = line.find(text, offset)
+                rows.append((offset, text))
+                offset += len(text)
+            self._wrapped[index] = rows
+
+        return rows
+
+    def searchable(self, folded: bool = False) -> str:
+        """
+        The lines joined back, so that a search runs over all of them
+        at once.
+
+        :param folded: whether to lowercase them, for case-insensitive
+                       searches. Offsets are the same either way.
+        """
+        if self._joined is None:
+            self._joined = "\n".join(self.lines)
+        if not folded:
+            return self._joined
+        if self._folded is None:
+            self._folded = fold(self._joined)
+
+        return self._folded
+
+    def _line_starts(self) -> list[int]:
+        if self._starts is None:
+            self._starts = [
+                0, *accumulate(len(line) + 1 for line in self.lines[:-1])
+            ]
+
+        return self._starts
+
+    def offset(self, pos: Position) -> int:
+        """
+        Where a row starts in the joined lines.
+
+        :param pos: the row.
+        """
+        return self._line_starts()[pos.line] + self.wrap(
+            pos.line)[pos.row][0]
+
+    def locate(self, offset: int) -> Position:
+        """
+        The row an offset of the joined lines is shown on.
+
+        :param offset: the offset.
+        """
+        starts = self._line_starts()
+        line = bisect_right(starts, offset) - 1
+        rows = [start for start, _ in self.wrap(line)]
+
+        return Position(line,
+                        max(bisect_right(rows, offset - starts[line]) - 1, 0))
+
+    def line_spans(self, index: int) -> list[Span]:
+        """
+        The spans of a line.
+
+        :param index: index of the line.
+        """
+        start = bisect_left(self._span_lines, index)
+        end = bisect_right(self._span_lines, index, start)
+
+        return self.spans[start:end]
+
+    def forward(self, pos: Position, rows: int) -> Position:
+        """
+        Move down some rows, stopping at the last one.
+
+        :param pos: the starting row.
+        :param rows: how many rows to move.
+        """
+        line, row = pos
+        while rows > 0:
+            if row + 1 < len(self.wrap(line)):
+                row += 1
+            elif line + 1 < len(self.lines):
+                line, row = line + 1, 0
+            else:
+                break
+            rows -= 1
+
+        return Position(line, row)
+
+    def backward(self, pos: Position, rows: int) -> Position:
+        """
+        Move up some rows, stopping at the first one.
+
+        :param pos: the starting row.
+        :param rows: how many rows to move.
+        """
+        line, row = pos
+        while rows > 0:
+            if row > 0:
+                row -= 1
+            elif line > 0:
+                line -= 1
+                row = len(self.wrap(line)) - 1
+            else:
+                break
+            rows -= 1
+
+        return Position(line, row)
+
+    def last(self) -> Position:
+        """
+        The last row.
+        """
+        line = len(self.lines) - 1
+
+        return Position(line, len(self.wrap(line)) - 1)
+
+    def rows(
+        self,
+        pos: Position,
+        count: int,
+        marks: Optional[Callable[[int], list[Span]]] = None
+    ) -> Iterator[tuple[str, list[tuple[int, str, int]]]]:
+        """
+        The rows to draw from a position on, with the parts of them to
+        color as (column, text, color pair).
+
+        :param pos: the first row.
+        :param count: how many rows at most.
+        :param marks: more spans of a line, drawn over its highlights.
+        """
+        line, row = pos
+        while count > 0 and line < len(self.lines):
+            spans = self.line_spans(line)
+            if marks is not None:
+                spans = spans + marks(line)
+            for offset, text in self.wrap(line)[row:row + count]:
+                end = offset + len(text)
+                colored = [(max(span.start, offset) - offset,
+                            text[max(span.start, offset) - offset:
+                                 min(span.end, end) - offset], span.pair)
+                           for span in spans
+                           if span.start < end and span.end > offset]
+                yield text, colored
+                count -= 1
+            line, row = line + 1, 0
+
+
+class NoteSearch:
+    """
+    Incremental search for some text in a note.
+
+    The whole note is searched at once, from an offset on, and wrapping
+    around at the end. When the query grows, the search goes on from
+    the current match: nothing before it can match the longer query.
+    The search is case-insensitive, unless the query contains uppercase
+    letters.
+
+    :param text: the note.
+    :param origin: offset the search starts from.
+    :param forward: whether to search forward.
+    """
+
+    def __init__(self,
+                 text: WrappedContent,
+                 origin: int = 0,
+                 forward: bool = True) -> None:
+        self.text = text
+        self.origin = origin
+        self.forward = forward
+        self.query = ""
+        # offset of the current match
+        self.match: Optional[int] = None
+
+    @property
+    def _folded(self) -> bool:
+        return self.query == self.query.lower()
+
+    def _find(self, start: int, forward: bool) -> Optional[int]:
+        """
+        Find the first match starting from start on, or the last one
+        starting before it, wrapping around.
+        """
+        text = self.text.searchable(self._folded)
+        # end of the matches starting before start
+        before = start + len(self.query) - 1
+        if forward:
+            found = text.find(self.query, start)
+            if found < 0:
+                found = text.find(self.query, 0, before)
+        else:
+            found = text.rfind(self.query, 0, before)
+            if found < 0:
+                found = text.rfind(self.query, start)
+
+        return found if found >= 0 else None
+
+    def update(self, query: str) -> Optional[int]:
+        """
+        Search for a new query.
+
+        :param query: the query.
+        :return: offset of the match, or None if there is none.
+        """
+        extends = (self.match is not None and self.query
+                   and query.startswith(self.query)
+                   and (query == query.lower()) == self._folded)
+        if not extends:
+            start = self.origin
+        else:
+            assert self.match is not None
+            start = self.match if self.forward else self.match + 1
+        self.query = query
+        self.match = self._find(start, self.forward) if query else None
+
+        return self.match
+
+    def next(self, forward: bool = True) -> Optional[int]:
+        """
+        Move to the next match.
+
+        :param forward: whether to move in the direction of the
+                        search, or in the opposite one.
+        :return: offset of the match, or None if there is none.
+        """
+        if self.match is not None:
+            forward = forward == self.forward
+            self.match = self._find(
+                self.match + 1 if forward else self.match, forward)
+
+        return self.match
+
+    def line_matches(self, index: int) -> list[Span]:
+        """
+        The matches in a line.
+
+        :param index: index of the line.
+        """
+        if not self.query or self.match is None:
+            return []
+        line = self.text.lines[index]
+        if self._folded:
+            line = fold(line)
+        current = self.text.locate(self.match).line == index
+        start = self.match - self.text.offset(Position(index, 0))
+
+        spans = []
+        found = line.find(self.query)
+        while found >= 0:
+            end = found + len(self.query)
+            pair = CURRENT_MATCH_PAIR if current and found == start \
+                else MATCH_PAIR
+            spans.append(Span(index, found, end, pair))
+            found = line.find(self.query, end)
+
+        return spans
+
+
 class MainWindow:
+    """
+    Window showing the content of a note. Only the rows on screen
+    are wrapped and drawn, so scrolling costs the same for any size
+    of note.
 
-    def __init__(self, width: int, content: str):
-        self.width = width
-        self.content = content
-        self.pos = 0
+    :param width: width of the window.
+    :param content: the content of the note, wrapped or not.
+    """
 
-        self.lines = self._wrap_content()
-        self.limit = len(self.lines) + 1
+    def __init__(self, width: int, content: str | WrappedContent):
+        self.width = width
+        self.text = content if isinstance(
+            content, WrappedContent) else WrappedContent(content)
+        self.text.set_width(width)
+        self.content = self.text.content
+        self.pos = Position(0, 0)
         self.page = curses.LINES // 2
-        self.pad = curses.newpad(self.limit, self.width)
-        self._draw_content()
+        # top row when the end of the note is shown
+        self._end: Optional[Position] = None
+        self.search: Optional[NoteSearch] = None
+        self.win = curses.newwin(curses.LINES, self.width + 1, 0, 0)
         self.refresh()
 
-    def _wrap_content(self) -> list[str]:
-        lines = []
-        unwrapped_lines = self.content.split("\n")
-        for line in unwrapped_lines:
-            if line == "":
-                lines.append("\n")
-            else:
-                for wrapped_line in textwrap.wrap(line, self.width):
-                    lines.append(wrapped_line)
-
-        return lines
+    @property
+    def end(self) -> Position:
+        if self._end is None:
+            # the last row sits one row above the bottom of the screen
+            self._end = self.text.backward(self.text.last(), curses.LINES - 2)
 
-    def _correct_pos(self, pos: int) -> int:
-        if pos < 0:
-            pos = 0
-        elif pos > self.limit - curses.LINES:
-            pos = self.limit - curses.LINES
+        return self._end
 
-        return pos
+    def _correct_pos(self, pos: Position) -> Position:
+        return min(pos, self.end)
 
     def scroll_down(self) -> None:
-        self.pos = self._correct_pos(self.pos + 1)
+        self.pos = self._correct_pos(self.text.forward(self.pos, 1))
         self.refresh()
 
     def scroll_up(self) -> None:
-        self.pos = self._correct_pos(self.pos - 1)
+        self.pos = self.text.backward(self.pos, 1)
         self.refresh()
 
     def go_to_start(self) -> None:
-        self.pos = 0
+        self.pos = Position(0, 0)
         self.refresh()
 
     def go_to_end(self) -> None:
-        self.pos = self._correct_pos(self.limit - curses.LINES)
+        self.pos = self.end
         self.refresh()
 
     def page_down(self) -> None:
-        self.pos = self._correct_pos(self.pos + self.page)
+        self.pos = self._correct_pos(self.text.forward(self.pos, self.page))
         self.refresh()
 
     def page_up(self) -> None:
-        self.pos = self._correct_pos(self.pos - self.page)
+        self.pos = self.text.backward(self.pos, self.page)
         self.refresh()
 
-    def _draw_content(self) -> None:
+    def resize(self, width: int) -> None:
+        """
+        Wrap the note to a new width, keeping the line at the top of
+        the screen. Only the rows shown are wrapped again.
 
-        context = Context.OUT
-
-        for index, line in enumerate(self.lines):
-            if line == "---" and context is Context.OUT:
-                context = Context.FRONTMATTER_IN
-            elif line == "---" and context is Context.FRONTMATTER_IN:
-                context = Context.OUT
-
-            if line.startswith("```") and context is Context.OUT:
-                context = Context.CODEBLOCK_IN
-            elif line.startswith('```') and context is Context.CODEBLOCK_IN:
-                context = Context.OUT
-
-            if context is Context.FRONTMATTER_IN and line != "---":
-                self.pad.addstr(index, 0, line, curses.color_pair(1))
-            elif context is Context.CODEBLOCK_IN and not line.startswith(
-                    "```"):
-                self.pad.addstr(index, 0, line, curses.color_pair(3))
-            elif line.startswith('#'):
-                self.pad.addstr(index, 0, line, curses.color_pair(2))
-            else:
-                self.pad.addstr(index, 0, line)
+        :param width: width of the window.
+        """
+        self.width = width
+        self.text.set_width(width)
+        self.pos = Position(self.pos.line, 0)
+        self.page = curses.LINES // 2
+        self._end = None
+        self.pos = self._correct_pos(self.pos)
+        self.win = curses.newwin(curses.LINES, self.width + 1, 0, 0)
+        self.refresh()
+
+    def start_search(self, forward: bool = True) -> None:
+        """
+        Start searching from the top of the screen.
+
+        :param forward: whether to search forward.
+        """
+        self.search = NoteSearch(self.text, self.text.offset(self.pos),
+                                 forward)
+
+    def show_match(self) -> None:
+        """
+        Scroll to the current match, if it's not on screen.
+        """
+        if self.search is None or self.search.match is None:
+            self.refresh()
+            return
+        target = self.text.locate(self.search.match)
+        # the last row sits one row above the bottom of the screen
+        if not self.pos <= target <= self.text.forward(self.pos,
+                                                       curses.LINES - 2):
+            self.pos = self._correct_pos(
+                self.text.backward(target, curses.LINES // 3))
+        self.refresh()
+
+    def clear_search(self) -> None:
+        self.search = None
+        self.refresh()
+
+    def _draw_content(self) -> None:
+        self.win.erase()
+        marks = self.search.line_matches if self.search is not None else None
+        for index, (line, colored) in enumerate(
+                self.text.rows(self.pos, curses.LINES, marks)):
+            self.win.addstr(index, 0, line)
+            for column, text, pair in colored:
+                self.win.addstr(index, column, text, curses.color_pair(pair))
 
     def refresh(self) -> None:
-        self.pad.refresh(self.pos, 0, 0, 0, curses.LINES - 1, self.width)
+        self._draw_content()
+        self.win.refresh()
 
 
 class LinksWindow:
 
-    def __init__(self, width: int, links: set[str], next: set[str]) -> None:
+    def __init__(self,
+                 width: int,
+                 links: set[str],
+                 next: set[str],
+                 incoming: Sequence[tuple[str, str]] = (),
+                 two_hop: Sequence[tuple[str, str]] = ()) -> None:
         self.width = width
         self.next = list(next)
         self.other_links = list(links - next)
         self.links = self.next + self.other_links
+        # (title, zk_id) of the notes linking here, and of the notes
+        # two links away
+        self.incoming = list(incoming)
+        self.two_hop = list(two_hop)
         self.pos = 0
 
         self.wrapped_links = self._wrap_links()
@@ -168,9 +647,32 @@ class LinksWindow:
             line_nr = f"[{index+final_index+1}] {line}"
             for wrapped_line in textwrap.wrap(line_nr, self.width):
                 lines.append(wrapped_line)
+        final_index = len(self.links)
+
+        # then the neighborhood, numbered after the links
+        neighbors = [(_INCOMING_SYM, title) for title, _ in self.incoming]
+        neighbors += [(_TWO_HOP_SYM, title) for title, _ in self.two_hop]
+        for index, (symbol, title) in enumerate(neighbors):
+            line_nr = f"[{index+final_index+1}] {symbol}{title}"
+            for wrapped_line in textwrap.wrap(line_nr, self.width):
+                lines.append(wrapped_line)
 
         return lines
 
+    def __len__(self) -> int:
+        return len(self.links) + len(self.incoming) + len(self.two_hop)
+
+    def neighbor(self, index: int) -> Optional[str]:
+        """
+        ID of the note at a number past the links, if any.
+
+        :param index: the number, starting from 0.
+        """
+        neighbors = self.incoming + self.two_hop
+        index -= len(self.links)
+
+        return neighbors[index][1] if 0 <= index < len(neighbors) else None
+
     def _correct_pos(self, pos: int) -> int:
         if pos < 0:
             pos = 0
@@ -196,6 +698,65 @@ class LinksWindow:
                          curses.LINES - 2, curses.COLS)
 
 
+class QuickOpenWindow:
+    """
+    Prompt to open any note by title, drawn over the links.
+
+    :param width: width of the window.
+    :param index: the titles to choose from.
+    """
+
+    def __init__(self, width: int, index: TitleIndex) -> None:
+        self.width = width
+        self.index = index
+        self.query = ""
+        self.pos = 0
+        self.win = curses.newwin(curses.LINES - 1, self.width, 0,
+                                 curses.COLS - self.width)
+        self.results = self.index.search(self.query, self.limit)
+        self.refresh()
+
+    @property
+    def limit(self) -> int:
+        # the first row holds the query
+        return max(curses.LINES - 2, 1)
+
+    def update(self, query: str) -> None:
+        self.query = query
+        self.results = self.index.search(query, self.limit)
+        self.pos = 0
+        self.refresh()
+
+    def move(self, delta: int) -> None:
+        if self.results:
+            self.pos = min(max(self.pos + delta, 0), len(self.results) - 1)
+        self.refresh()
+
+    def selected(self) -> Optional[str]:
+        """
+        ID of the note under the cursor, if any.
+        """
+        return self.results[self.pos][1] if self.results else None
+
+    def close(self) -> None:
+        self.win.erase()
+        self.win.refresh()
+
+    def _draw_content(self) -> None:
+        self.win.erase()
+        prompt = ("> " + self.query)[-(self.width - 1):]
+        self.win.addstr(0, 0, prompt, curses.color_pair(5))
+        for index, row in enumerate(self.results):
+            title = row[0].replace("\n", " ")[:self.width - 1]
+            attr = curses.A_REVERSE if index == self.pos else curses.A_NORMAL
+            self.win.addstr(index + 1, 0, title,
+                            curses.color_pair(4) | attr)
+
+    def refresh(self) -> None:
+        self._draw_content()
+        self.win.refresh()
+
+
 class StatusBar:
 
     def __init__(self, stack_len: int, head: int, width: int) -> None:
@@ -215,7 +776,9 @@ class StatusBar:
         self.pad.addstr(0, 0, pad + stack_indicator, curses.color_pair(5))
 
     def link_input(self, text: str) -> None:
-        prefix = "#: "
+        self.prompt("#: ", text)
+
+    def prompt(self, prefix: str, text: str) -> None:
         input = prefix + text[:self.width - len(prefix) - 1]
         padding_with = self.width - len(input) - 1
         pad = " " * padding_with if padding_with >= 0 else ""
@@ -234,6 +797,180 @@ class StatusBar:
                          curses.LINES, curses.COLS)
 
 
+class PreparedNote(NamedTuple):
+    note: Note
+    # content, with its first screen wrapped when it was prefetched
+    text: WrappedContent
+    # modification time and size of the file when it was read
+    signature: tuple[int, int]
+
+
+class NotePrefetcher:
+    """
+    Prepare the notes the pager may show next on a background thread,
+    while the current one is read.
+
+    The links of the note on screen are resolved to IDs through the
+    index, and the notes they point to and the ones linking to it are
+    parsed and
+    highlighted, and their first screen is wrapped to the width of the
+    window. Prepared notes are kept in a
+    bounded cache, and are valid as long as their file is unchanged.
+
+    :param zk: the zettelkasten to browse.
+    :param maxsize: how many prepared notes to keep.
+    """
+
+    def __init__(self,
+                 zk: Zettelkasten,
+                 maxsize: int = PREFETCH_CACHE_SIZE) -> None:
+        self.zk = zk
+        self.maxsize = maxsize
+        self._notes: OrderedDict[str, PreparedNote] = OrderedDict()
+        self.highlights = HighlightCache(maxsize)
+        # links to resolve, or IDs
+        self._wanted: list[tuple[Optional[str], Optional[str]]] = []
+        self._width = 0
+        self._rows = 0
+        self._busy = False
+        self._closed = False
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get(self, zk_id: str) -> PreparedNote:
+        """
+        Get a note, preparing it now if it wasn't prefetched.
+
+        :param zk_id: ID of the note.
+        """
+        signature = self._signature(zk_id)
+        if (prepared := self._cached(zk_id, signature)) is not None:
+            return prepared
+
+        return self._prepare(zk_id, signature)
+
+    def resolve(self, link: str) -> Optional[str]:
+        """
+        Get the ID of the note a link points to.
+
+        :param link: the sluggified title of the note.
+        :return: the ID, or None if no note has that title.
+        """
+        return self.zk.resolve_link(link)
+
+    def prefetch(self,
+                 links: list[str],
+                 width: int,
+                 rows: int,
+                 zk_ids: Sequence[str] = ()) -> None:
+        """
+        Prepare the notes some links point to, and some other notes,
+        replacing the previous request.
+
+        :param links: links of the note on screen, in order.
+        :param width: width of the main window.
+        :param rows: how many rows to wrap.
+        :param zk_ids: IDs of other notes, prepared after the links.
+        """
+        with self._condition:
+            self._wanted = [(link, None) for link in links]
+            self._wanted += [(None, zk_id) for zk_id in zk_ids]
+            self._width = width
+            self._rows = rows
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the last request to be prefetched.
+
+        :param timeout: seconds to wait at most.
+        :return: whether the request was prefetched.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._closed or not (self._wanted or self._busy),
+                timeout)
+
+    def close(self) -> None:
+        """
+        Stop prefetching.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _signature(self, zk_id: str) -> tuple[int, int]:
+        stat = self.zk.note_path(zk_id).stat()
+
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _cached(self, zk_id: str,
+                signature: tuple[int, int]) -> Optional[PreparedNote]:
+        with self._condition:
+            prepared = self._notes.get(zk_id)
+            if prepared is None or prepared.signature != signature:
+                return None
+            self._notes.move_to_end(zk_id)
+
+            return prepared
+
+    def _prepare(self,
+                 zk_id: str,
+                 signature: tuple[int, int],
+                 width: int = 0,
+                 rows: int = 0) -> PreparedNote:
+        # the signature is taken before reading: if the file changes
+        # while it's read, the note is prepared again next time
+        note = self.zk.read_note(zk_id)
+        text = WrappedContent(note.materialize(), self.highlights)
+        if rows:
+            text.set_width(width)
+            text.forward(Position(0, 0), rows)
+        prepared = PreparedNote(note, text, signature)
+        with self._condition:
+            self._notes[zk_id] = prepared
+            self._notes.move_to_end(zk_id)
+            while len(self._notes) > self.maxsize:
+                self._notes.popitem(last=False)
+
+        return prepared
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or bool(self._wanted))
+                if self._closed:
+                    return
+                wanted, self._wanted = self._wanted, []
+                width, rows = self._width, self._rows
+                self._busy = True
+
+            for link, zk_id in wanted:
+                with self._condition:
+                    # a newer request supersedes this one
+                    if self._closed or self._wanted:
+                        break
+                try:
+                    if link is not None:
+                        zk_id = self.resolve(link)
+                    if zk_id is None:
+                        continue
+                    signature = self._signature(zk_id)
+                    if self._cached(zk_id, signature) is None:
+                        self._prepare(zk_id, signature, width, rows)
+                except (OSError, ZettelkastenException, NoteException,
+                        FrontmatterException, BodyException):
+                    # the note is read again when it's followed, and
+                    # the error shown then
+                    continue
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+
 class Pager:
 
     def __init__(self, zk: Zettelkasten):
@@ -241,6 +978,9 @@ class Pager:
         self.zk = zk
         self.stack: list[str] = []
         self.head = -1
+        self.prefetcher = NotePrefetcher(self.zk)
+        # titles to open notes by, loaded the first time they're needed
+        self.titles: Optional[TitleIndex] = None
 
     def _check_head(self, head: int) -> int:
         if head < -1 * len(self.stack):
@@ -250,39 +990,67 @@ class Pager:
 
         return head
 
-    def _read_note(self, zk_id: str) -> Note:
-        # check that the note exists
-        if not self.zk._note_exists(zk_id):
-            raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
+    def get_id_from_link(self, link: str) -> Optional[str]:
+        return self.prefetcher.resolve(link)
 
-        filename = self.zk.vault / Path(zk_id).with_suffix(".md")
-        note = Note.read(filename)
+    def follow(self, links_window: LinksWindow, index: int) -> Optional[str]:
+        """
+        ID of the note at a number of the links window: a link, or a
+        note of the neighborhood.
+        """
+        if index < len(links_window.links):
+            return self.get_id_from_link(links_window.links[index])
 
-        return note
+        return links_window.neighbor(index)
 
-    def get_id_from_link(self, link: str) -> Optional[str]:
-        results = self.zk.list_notes(show=['title', 'zk_id'])
-        titles = [sluggify(title) for title, _ in results]
+    def title_index(self) -> TitleIndex:
+        """
+        The titles of all the notes, most used first. They're loaded
+        once, and again only after notes are created or edited.
+        """
+        if self.titles is None:
+            self.titles = TitleIndex(
+                self.zk.list_notes(sort_by='frecency', descending=True))
 
-        try:
-            position = titles.index(link)
-            return results[position][1]
-        except ValueError:
-            return None
+        return self.titles
 
     def next_note(self, zk_id: str, main_window_width: int,
                   ratio: int) -> tuple[MainWindow, LinksWindow, list[int]]:
         self.w.clear()
         self.w.refresh()
-        note = self._read_note(zk_id)
-        main_window = MainWindow(main_window_width, note.materialize())
-        links_window = LinksWindow(ratio, set(note.links), set(note.next))
-        link_nr = [
-            ord(str(i)) for i in range(1, min(len(links_window.links) + 1, 10))
-        ]
+        # check that the note exists
+        if not self.zk._note_exists(zk_id):
+            raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
+        prepared = self.prefetcher.get(zk_id)
+        note = prepared.note
+        self.zk.record_access(zk_id, 'browse')
+        main_window = MainWindow(main_window_width, prepared.text)
+        neighborhood = self.zk.get_neighborhood(zk_id)
+        links_window = LinksWindow(ratio, set(note.links), set(note.next),
+                                   neighborhood['incoming'],
+                                   neighborhood['two_hop'])
+        link_nr = [ord(str(i)) for i in range(1, min(len(links_window) + 1, 10))]
+        # get the linked notes ready while this one is read
+        self.prefetcher.prefetch(
+            links_window.links, main_window_width, curses.LINES,
+            [zk_id for _, zk_id in links_window.incoming])
 
         return main_window, links_window, link_nr
 
+    def resize(self, main_window: MainWindow, links_window: LinksWindow,
+               main_window_width: int, ratio: int) -> LinksWindow:
+        """
+        Fit the windows to a new terminal size, without reading the
+        note again. Only the rows on screen are wrapped again.
+        """
+        self.w.clear()
+        self.w.refresh()
+        main_window.resize(main_window_width)
+
+        return LinksWindow(ratio, set(links_window.links),
+                           set(links_window.next), links_window.incoming,
+                           links_window.two_hop)
+
     def _setup(self) -> None:
         curses.start_color()
         # frontmatter
@@ -295,6 +1063,10 @@ class Pager:
         curses.init_pair(4, curses.COLOR_BLUE, curses.COLOR_BLACK)
         # statusbar
         curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
+        # search matches
+        curses.init_pair(MATCH_PAIR, curses.COLOR_BLACK, curses.COLOR_YELLOW)
+        curses.init_pair(CURRENT_MATCH_PAIR, curses.COLOR_BLACK,
+                         curses.COLOR_CYAN)
 
         curses.curs_set(False)
         curses.noecho()
@@ -371,10 +1143,65 @@ class Pager:
                      link_nr) = self.next_note(zk_id, main_window_width, ratio)
                 case Keybindings.E:
                     zk_id = self.stack[self.head]
-                    self.zk.update(zk_id, confirmation=False)
+                    if self.zk.update(zk_id, confirmation=False):
+                        self.titles = None
                     (main_window, links_window,
                      link_nr) = self.next_note(zk_id, main_window_width, ratio)
                     self._setup()
+                case Keybindings.N if main_window.search is not None:
+                    # n and N move between matches while searching
+                    main_window.search.next()
+                    main_window.show_match()
+                case Keybindings.S_N if main_window.search is not None:
+                    main_window.search.next(forward=False)
+                    main_window.show_match()
+                case Keybindings.ESCAPE if main_window.search is not None:
+                    main_window.clear_search()
+                case Keybindings.SLASH | Keybindings.QUESTION:
+                    prefix = chr(c)
+                    origin = main_window.pos
+                    main_window.start_search(forward=c == Keybindings.SLASH)
+                    search = cast(NoteSearch, main_window.search)
+                    query = ""
+                    statusbar.prompt(prefix, query)
+                    # wide characters, so that any text can be searched
+                    while (d := self.w.get_wch()) != chr(Keybindings.ESCAPE):
+                        if d == curses.KEY_ENTER \
+                                or d == chr(Keybindings.ALT_ENTER_1) \
+                                or d == chr(Keybindings.ALT_ENTER_2):
+                            break
+                        elif d == curses.KEY_BACKSPACE \
+                                or d == chr(Keybindings.ALT_BACKSPACE):
+                            query = query[:-1]
+                        elif d == curses.KEY_RESIZE:
+                            curses.resize_term(*self.w.getmaxyx())
+                            self.w.refresh()
+                            ratio = curses.COLS // 4
+                            main_window_width = curses.COLS - ratio - 1
+                            links_window = self.resize(
+                                main_window, links_window, main_window_width,
+                                ratio)
+                            statusbar = StatusBar(
+                                len(self.stack),
+                                len(self.stack) + self.head + 1, ratio)
+                            links_window.refresh()
+                            origin = main_window.pos
+                        elif isinstance(d, str) and d.isprintable():
+                            query += d
+                        else:
+                            continue
+
+                        if search.update(query) is None:
+                            main_window.pos = origin
+                        main_window.show_match()
+                        statusbar.prompt(prefix, query)
+                    else:
+                        # cancelled: back where the search started
+                        main_window.pos = origin
+                        main_window.clear_search()
+                    if main_window.search is not None and search.match is None:
+                        main_window.clear_search()
+                    statusbar.refresh()
                 case Keybindings.N:
                     zk_id = self.stack[self.head]
                     curses.endwin()
@@ -387,6 +1214,7 @@ class Pager:
                         self.w.refresh()
                         continue
                     note = cast(Note, self.zk.next(title, [zk_id]))
+                    self.titles = None
                     zk_id = note.zk_id
                     if self.head == -1:
                         self.stack.append(zk_id)
@@ -406,6 +1234,7 @@ class Pager:
                         self.w.refresh()
                         continue
                     note = cast(Note, self.zk.new(title, self.zk.author))
+                    self.titles = None
                     zk_id = note.zk_id
                     if self.head == -1:
                         self.stack.append(zk_id)
@@ -419,15 +1248,17 @@ class Pager:
                     self.w.refresh()
                     ratio = curses.COLS // 4
                     main_window_width = curses.COLS - ratio - 1
-                    zk_id = self.stack[self.head]
-                    (main_window, links_window,
-                     link_nr) = self.next_note(zk_id, main_window_width, ratio)
+                    links_window = self.resize(main_window, links_window,
+                                               main_window_width, ratio)
                     statusbar = StatusBar(len(self.stack),
                                           len(self.stack) + self.head + 1,
                                           ratio)
-                case c if c in link_nr:
-                    link = links_window.links[int(chr(c)) - 1]
-                    tmp_res = self.get_id_from_link(link)
+                case c if c in link_nr or (c == Keybindings.B
+                                           and links_window.incoming):
+                    # b follows the first backlink
+                    index = int(chr(c)) - 1 if c in link_nr else len(
+                        links_window.links)
+                    tmp_res = self.follow(links_window, index)
                     if tmp_res is None:
                         continue
                     zk_id = tmp_res
@@ -446,11 +1277,10 @@ class Pager:
                                 or d == Keybindings.ALT_ENTER_1 \
                                 or d == Keybindings.ALT_ENTER_2:
                             if link_identifier == '' \
-                                    or (link_index := int(link_identifier) - 1) >= len(links_window.links):
+                                    or (link_index := int(link_identifier) - 1) >= len(links_window):
                                 break
 
-                            link = links_window.links[link_index]
-                            tmp_res = self.get_id_from_link(link)
+                            tmp_res = self.follow(links_window, link_index)
                             if tmp_res is None:
                                 break
                             zk_id = tmp_res
@@ -471,11 +1301,9 @@ class Pager:
                             self.w.refresh()
                             ratio = curses.COLS // 4
                             main_window_width = curses.COLS - ratio - 1
-                            zk_id = self.stack[self.head]
-                            (main_window, links_window,
-                             link_nr) = self.next_note(zk_id,
-                                                       main_window_width,
-                                                       ratio)
+                            links_window = self.resize(
+                                main_window, links_window, main_window_width,
+                                ratio)
                             statusbar = StatusBar(
                                 len(self.stack),
                                 len(self.stack) + self.head + 1, ratio)
@@ -487,6 +1315,52 @@ class Pager:
                             link_identifier += chr(d)
 
                         statusbar.link_input(link_identifier)
+                case Keybindings.O:
+                    quick_open = QuickOpenWindow(ratio, self.title_index())
+                    tmp_res = None
+                    while (d := self.w.get_wch()) != chr(Keybindings.ESCAPE):
+                        if d == curses.KEY_ENTER \
+                                or d == chr(Keybindings.ALT_ENTER_1) \
+                                or d == chr(Keybindings.ALT_ENTER_2):
+                            tmp_res = quick_open.selected()
+                            break
+                        elif d == curses.KEY_BACKSPACE \
+                                or d == chr(Keybindings.ALT_BACKSPACE):
+                            quick_open.update(quick_open.query[:-1])
+                        elif d == curses.KEY_DOWN or d == chr(Keybindings.C_N):
+                            quick_open.move(1)
+                        elif d == curses.KEY_UP or d == chr(Keybindings.C_P):
+                            quick_open.move(-1)
+                        elif d == curses.KEY_RESIZE:
+                            curses.resize_term(*self.w.getmaxyx())
+                            self.w.refresh()
+                            ratio = curses.COLS // 4
+                            main_window_width = curses.COLS - ratio - 1
+                            links_window = self.resize(
+                                main_window, links_window, main_window_width,
+                                ratio)
+                            statusbar = StatusBar(
+                                len(self.stack),
+                                len(self.stack) + self.head + 1, ratio)
+                            query = quick_open.query
+                            quick_open = QuickOpenWindow(
+                                ratio, self.title_index())
+                            quick_open.update(query)
+                        elif isinstance(d, str) and d.isprintable():
+                            quick_open.update(quick_open.query + d)
+                    quick_open.close()
+                    if tmp_res is None:
+                        main_window.refresh()
+                        links_window.refresh()
+                        continue
+                    zk_id = tmp_res
+                    (main_window, links_window,
+                     link_nr) = self.next_note(zk_id, main_window_width, ratio)
+
+                    self.stack = self.stack[:self.head +
+                                            1] if self.head < -1 else self.stack
+                    self.stack.append(zk_id)
+                    self.head = -1
                 case Keybindings.S:
                     curses.endwin()
                     loop = Interactive(self.zk)
@@ -533,6 +1407,7 @@ class Pager:
         except KeyboardInterrupt:
             return None
         finally:
+            self.prefetcher.close()
             curses.nocbreak()
             self.w.keypad(False)
             curses.echo()
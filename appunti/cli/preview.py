@@ -0,0 +1,135 @@
+"""
+Background loading of note previews for the interactive selection
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Condition, Thread
+from typing import Any, NamedTuple, Optional
+
+from appunti.zettelkasten.sql import DBManagerException
+from appunti.zettelkasten.zettelkasten import (Zettelkasten,
+                                               ZettelkastenException)
+
+# how many lines of the body a preview shows
+PREVIEW_LINES = 20
+# how many previews to keep
+PREVIEW_CACHE_SIZE = 512
+
+
+class Preview(NamedTuple):
+    metadata: dict[str, Any]
+    head: list[str]
+
+
+class PreviewLoader:
+    """
+    Load previews of notes on a background thread, so that moving
+    through the results never waits for the index or the disk.
+
+    Previews are requested a page at a time: metadata of the notes
+    that are not cached yet is loaded with a single query, then the
+    first lines of their bodies are read.
+
+    :param zk: the zettelkasten the notes belong to.
+    :param lines: how many lines of the body to load.
+    :param maxsize: how many previews to keep.
+    """
+
+    def __init__(self,
+                 zk: Zettelkasten,
+                 lines: int = PREVIEW_LINES,
+                 maxsize: int = PREVIEW_CACHE_SIZE) -> None:
+        self.zk = zk
+        self.lines = lines
+        self.maxsize = maxsize
+        self._previews: OrderedDict[str, Preview] = OrderedDict()
+        self._wanted: list[str] = []
+        self._closed = False
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get(self, zk_id: str) -> Optional[Preview]:
+        """
+        Get the preview of a note, without waiting for it.
+
+        :param zk_id: ID of the note.
+        :return: the preview, or None if it's not loaded yet.
+        """
+        with self._condition:
+            preview = self._previews.get(zk_id)
+            if preview is not None:
+                self._previews.move_to_end(zk_id)
+
+            return preview
+
+    def prefetch(self, zk_ids: list[str]) -> None:
+        """
+        Request the previews of some notes, replacing the previous
+        request. Previews are loaded in order.
+
+        :param zk_ids: IDs of the notes.
+        """
+        with self._condition:
+            self._wanted = [
+                zk_id for zk_id in zk_ids if zk_id not in self._previews
+            ]
+            if self._wanted:
+                self._condition.notify_all()
+
+    def wait(self, zk_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the preview of a note to be loaded.
+
+        :param zk_id: ID of the note.
+        :param timeout: seconds to wait at most.
+        :return: whether the preview is loaded.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._closed or zk_id in self._previews, timeout)
+
+    def close(self) -> None:
+        """
+        Stop loading previews.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or bool(self._wanted))
+                if self._closed:
+                    return
+                wanted, self._wanted = self._wanted, []
+
+            previews = self._load(wanted)
+            with self._condition:
+                for zk_id, preview in previews.items():
+                    self._previews[zk_id] = preview
+                    self._previews.move_to_end(zk_id)
+                while len(self._previews) > self.maxsize:
+                    self._previews.popitem(last=False)
+                self._condition.notify_all()
+
+    def _load(self, zk_ids: list[str]) -> dict[str, Preview]:
+        try:
+            metadata = self.zk.get_metadata_many(zk_ids)
+        except (DBManagerException, ZettelkastenException):
+            # show what can be read from the files
+            metadata = {}
+
+        previews = {}
+        for zk_id in zk_ids:
+            try:
+                head = self.zk.read_head(zk_id, self.lines)
+            except (OSError, UnicodeDecodeError):
+                head = []
+            previews[zk_id] = Preview(metadata.get(zk_id, {}), head)
+
+        return previews
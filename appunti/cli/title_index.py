@@ -0,0 +1,105 @@
+"""
+In-memory index of note titles and slugs, to open notes by name
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from itertools import accumulate
+from typing import Optional
+
+from appunti.cli.fuzzy import fold
+from appunti.utils import sluggify
+
+# sorts after any character a key can contain
+_LAST_CHAR = "\U0010ffff"
+
+
+class TitleIndex:
+    """
+    Titles and slugs of the notes, held in memory.
+
+    Notes whose title or slug starts with the query come first, found
+    by bisecting the sorted keys. Then come the notes containing the
+    query anywhere: keys are joined in a single string, one line per
+    note, so that they're found by scanning it once. Within each group
+    notes keep the order they were given in.
+
+    Matching is case-insensitive.
+
+    :param rows: tuples of (title, zk_id), in order of preference.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, ...]]) -> None:
+        self.rows: list[tuple[str, ...]] = [tuple(row) for row in rows]
+        keys = []
+        for row in self.rows:
+            title = fold(row[0].replace("\n", " ").replace("\t", " "))
+            keys.append((title, sluggify(title)))
+        self._sorted = sorted((key, index)
+                              for index, note_keys in enumerate(keys)
+                              for key in set(note_keys))
+        self._keys = [key for key, _ in self._sorted]
+        self._blob = "\n".join(f"{title}\t{slug}" for title, slug in keys)
+        # where the line of every note starts in the blob
+        self._starts = [
+            0, *accumulate(len(title) + len(slug) + 2 for title, slug in keys)
+        ][:len(keys)]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def prefix(self, query: str) -> list[int]:
+        """
+        Find the notes whose title or slug starts with query.
+
+        :param query: the query, folded.
+        :return: indices of the notes, in order.
+        """
+        start = bisect_left(self._keys, query)
+        end = bisect_right(self._keys, query + _LAST_CHAR, start)
+
+        return sorted({index for _, index in self._sorted[start:end]})
+
+    def substring(self, query: str) -> list[int]:
+        """
+        Find the notes whose title or slug contains query.
+
+        :param query: the query, folded.
+        :return: indices of the notes, in order.
+        """
+        found = []
+        offset = self._blob.find(query)
+        while offset >= 0:
+            index = bisect_right(self._starts, offset) - 1
+            found.append(index)
+            if index + 1 == len(self._starts):
+                break
+            # on to the next note
+            offset = self._blob.find(query, self._starts[index + 1])
+
+        return found
+
+    def search(self,
+               query: str,
+               limit: Optional[int] = None) -> list[tuple[str, ...]]:
+        """
+        Find the notes matching query.
+
+        :param query: the query. Surrounding whitespace is ignored.
+        :param limit: maximum number of results.
+        :return: the matching rows, prefix matches first.
+        """
+        query = fold(query.strip())
+        if not query:
+            return self.rows[:limit]
+
+        found = self.prefix(query)
+        if limit is None or len(found) < limit:
+            seen = set(found)
+            found += [
+                index for index in self.substring(query) if index not in seen
+            ]
+
+        return [self.rows[index] for index in found[:limit]]
@@ -1,2 +1,2 @@
-from appunti.parser.parser import HeaderParser, BodyParser
+from appunti.parser.parser import HeaderParser, BodyParser, MmapParser
 from appunti.parser.parser import FrontmatterException, BodyException
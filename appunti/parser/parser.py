@@ -2,10 +2,12 @@
 Parsers for various elements of a note
 """
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 from datetime import datetime
-from io import TextIOWrapper
+from io import TextIOWrapper, StringIO
 from pathlib import Path
+import mmap
 import re
 from string import punctuation
 
@@ -23,6 +25,10 @@ _OUT_CONTEXT = False
 _DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
 _INVALID_CHARS = punctuation.replace("_", "").replace("#", "")
 _NEXT_NOTE_FMT = "Next -> "
+# whitespace stripped by str.strip, minus the newline
+_BYTES_BLANK = rb"[ \t\r\f\v]*"
+# carriage returns ending a line on their own
+_BARE_CR = re.compile(rb"\r(?!\n)")
 
 
 def _open_or_return_handle(
@@ -222,57 +228,91 @@ class HeaderParser(BaseParser):
         return obj
 
 
+@lru_cache
+def _compile_link_patterns(
+        link_del: tuple[str, str]) -> tuple[re.Pattern[str], re.Pattern[str]]:
+    """
+    Compile the patterns used to find links and next links, once
+    per link delimiter.
+
+    :param link_del: how a link is delimited.
+    :return: the link pattern, capturing the link text, and
+             the next link pattern.
+    """
+    start_link = re.escape(link_del[0])
+    end_link = re.escape(link_del[1])
+    link_pattern = re.compile(f"{start_link}(.*?){end_link}")
+    next_pattern = re.compile(
+        f"{re.escape(_NEXT_NOTE_FMT)}{start_link}.*?{end_link}$")
+
+    return link_pattern, next_pattern
+
+
 class BodyParser(BaseParser):
     """
     Parser for body of note.
 
     :param header1: identifier for header of note.
     :param link_del: identifier for link encapsulation
+    :param keep_body: whether to collect the lines of the body.
+                      Indexing only needs headers and links.
     """
 
     def __init__(self,
                  header1: str = "# ",
-                 link_del: tuple[str, str] = ("[[", "]]")):
+                 link_del: tuple[str, str] = ("[[", "]]"),
+                 keep_body: bool = True):
         self.header1 = header1
         self.link_del = link_del
+        self.keep_body = keep_body
 
     def parse(self,
               path: Optional[Target] = None,
               handle: Optional[TextIOWrapper] = None) -> Output:
         file_obj = _open_or_return_handle(path=path, handle=handle)
+        header1 = self.header1
+        keep_body = self.keep_body
+        link_pattern, next_pattern = _compile_link_patterns(
+            tuple(self.link_del))
         headers: list[str] = []
-        links: list[str] = []
-        next: list[str] = []
+        links: set[str] = set()
+        next: set[str] = set()
         body: list[str] = []
         context = _OUT_CONTEXT
 
+        # single pass: every line is checked for a header, and only lines
+        # containing links are checked for a next link
         for line in file_obj:
             clean_line = line.rstrip()
-            body.append(clean_line)
-
-            # first line needs to be a title
-            if clean_line != "" and not clean_line.startswith(
-                    self.header1) and not context:
-                raise BodyException("The body needs to start with a title")
-            elif clean_line.startswith(self.header1) and not context:
-                context = _IN_CONTEXT
+            if keep_body:
+                body.append(clean_line)
+            if clean_line == "":
+                continue
 
             # parse for header 1
-            if clean_line.startswith(self.header1):
+            if clean_line.startswith(header1):
+                context = _IN_CONTEXT
                 headers.append(clean_line)
                 continue
+            # first line needs to be a title
+            elif not context:
+                raise BodyException("The body needs to start with a title")
 
             # parse for links
-            line_links = self._link_parser(clean_line)
+            raw_links = link_pattern.findall(clean_line)
+            if not raw_links:
+                continue
+            line_links = set(sluggify(link) for link in raw_links if link != "")
             # check if it specifies a next note
-            if self._next_parser(clean_line):
-                next.extend(line_links)
-            links.extend(line_links)
+            if clean_line.startswith(_NEXT_NOTE_FMT) \
+                    and next_pattern.match(clean_line):
+                next.update(line_links)
+            links.update(line_links)
 
         return {
             'header': headers,
-            'links': set(links),
-            'next': set(next),
+            'links': links,
+            'next': next,
             'body': body
         }, file_obj
 
@@ -283,20 +323,11 @@ class BodyParser(BaseParser):
         :param line: line to parse
         :return: set of links contained in the line
         """
-
-        start_link = self.link_del[0]
-        end_link = self.link_del[1]
-        # find links with regex
-        pattern = re.compile(
-            f"{re.escape(start_link)}.*?{re.escape(end_link)}")
-        # remove link pre- and suffixes
-        line_links = [
-            link.removeprefix(start_link).removesuffix(end_link)
-            for link in pattern.findall(line)
-        ]
+        link_pattern, _ = _compile_link_patterns(tuple(self.link_del))
         # remove empty link
         line_links_set = set(
-            sluggify(link) for link in line_links if link != "")
+            sluggify(link) for link in link_pattern.findall(line)
+            if link != "")
 
         return line_links_set
 
@@ -309,14 +340,166 @@ class BodyParser(BaseParser):
         :param line: line to parse
         :return: True if specifies next link, False otherwise
         """
+        _, next_pattern = _compile_link_patterns(tuple(self.link_del))
+
+        return bool(next_pattern.match(line))
+
+
+class MmapParser:
+    """
+    Parser for a whole note working on its memory-mapped bytes, meant
+    for bulk operations. Frontmatter delimiters, headers and links are
+    located with compiled byte regexes, and only the slices needed are
+    decoded. The output is the same as running HeaderParser and
+    then BodyParser on the note. Notes with lines ending in a bare
+    carriage return are copied and read with universal newlines, like
+    text files are.
+
+    :param parsing_obj: the values the frontmatter parser should collect
+    :param delimiter: the delimiter symbol that represents start
+                      and end of the frontmatter
+    :param special_names: names of the frontmatter that need
+                          to be specially parsed
+    :param header1: identifier for header of note.
+    :param link_del: identifier for link encapsulation
+    :param keep_body: whether to collect the lines of the body.
+    :param encoding: encoding of the notes.
+    """
 
-        start_link = self.link_del[0]
-        end_link = self.link_del[1]
-        pattern = re.compile(
-            f"^{_NEXT_NOTE_FMT}{re.escape(start_link)}.*?{re.escape(end_link)}$"
-        )
+    def __init__(self,
+                 parsing_obj: Collection[str],
+                 delimiter: str = '---',
+                 special_names: Collection[str] = ['date', 'last', 'tags'],
+                 header1: str = "# ",
+                 link_del: tuple[str, str] = ("[[", "]]"),
+                 keep_body: bool = False,
+                 encoding: str = "utf-8"):
+        self.header_parser = HeaderParser(parsing_obj=parsing_obj,
+                                          delimiter=delimiter,
+                                          special_names=special_names)
+        self.header1 = header1
+        self.link_del = link_del
+        self.keep_body = keep_body
+        self.encoding = encoding
+
+        start_link = re.escape(link_del[0].encode(encoding))
+        end_link = re.escape(link_del[1].encode(encoding))
+        header = re.escape(header1.encode(encoding))
+        next_fmt = re.escape(_NEXT_NOTE_FMT.encode(encoding))
+        self._delimiter_pattern = re.compile(
+            rb"^" + _BYTES_BLANK + re.escape(delimiter.encode(encoding)) +
+            _BYTES_BLANK + rb"$", re.MULTILINE)
+        self._content_pattern = re.compile(rb"[^ \t\r\n\f\v]")
+        self._link_pattern = re.compile(start_link + rb"(.*?)" + end_link)
+        # headers consume their whole line, so that their links are
+        # ignored. Next links consume their line as well.
+        self._body_pattern = re.compile(
+            rb"(?P<header>^" + header + rb"[^\n]*)"
+            rb"|(?P<next>^" + next_fmt + start_link + rb"[^\n]*?" + end_link +
+            _BYTES_BLANK + rb"$)"
+            rb"|" + start_link + rb"(?P<link>.*?)" + end_link, re.MULTILINE)
+
+    def parse(self, path: Target) -> tuple[Parsed, Parsed]:
+        """
+        Parse the note at path.
+
+        :param path: path to the note to parse
+        :return: parsed frontmatter and parsed body
+        """
+        with open(Path(path).expanduser(), "rb") as f:
+            # empty files cannot be memory-mapped
+            if not f.seek(0, 2):
+                raise FrontmatterException("Frontmatter has not been closed.")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if _BARE_CR.search(data) is None:
+                    return self._parse(data)
+                content = data[:].replace(b"\r\n", b"\n").replace(
+                    b"\r", b"\n")
+
+        return self._parse(content)
+
+    def _parse(self, data: mmap.mmap | bytes) -> tuple[Parsed, Parsed]:
+        """
+        Parse the frontmatter and the body of a note.
+
+        The mapping can only be closed when nothing holds a buffer on
+        it, so errors are raised while no regex scanner is alive: the
+        frames of the traceback would keep it.
+
+        :param data: the note bytes.
+        :return: parsed frontmatter and parsed body
+        """
+        frontmatter, body_start = self._locate_frontmatter(data)
+        parsed_obj, _ = self.header_parser.parse(
+            handle=StringIO(frontmatter.decode(self.encoding)))
+        body = self._parse_body(data, body_start)
+
+        return parsed_obj, body
+
+    def _locate_frontmatter(self,
+                            data: mmap.mmap | bytes) -> tuple[bytes, int]:
+        """
+        Locate the frontmatter.
+
+        :param data: the note bytes.
+        :return: a copy of the frontmatter, and where the body starts.
+        """
+        opening = self._delimiter_pattern.search(data)
+        closing = None if opening is None else self._delimiter_pattern.search(
+            data, opening.end())
+        if opening is None or closing is None:
+            raise FrontmatterException("Frontmatter has not been closed.")
+
+        return data[opening.start():closing.end()], closing.end() + 1
+
+    def _parse_body(self, data: mmap.mmap | bytes, start: int) -> Parsed:
+        """
+        Parse headers, links and next links of the body.
+
+        :param data: the note bytes.
+        :param start: where the body starts.
+        :return: the parsed body.
+        """
+        encoding = self.encoding
+        headers: list[str] = []
+        links: set[str] = set()
+        next: set[str] = set()
+        body: list[str] = []
+
+        # first line needs to be a title
+        if (first := self._content_pattern.search(data, start)) is not None:
+            line_start = data.rfind(b"\n", start, first.start()) + 1
+            line_end = data.find(b"\n", first.start())
+            line_end = len(data) if line_end == -1 else line_end
+            first_line = data[max(line_start, start):line_end]
+            if not first_line.decode(encoding).rstrip().startswith(
+                    self.header1):
+                raise BodyException("The body needs to start with a title")
 
-        return bool(pattern.match(line))
+        # the scanner is done before anything is decoded
+        for match in list(self._body_pattern.finditer(data, start)):
+            if (header := match['header']) is not None:
+                clean_header = header.decode(encoding).rstrip()
+                if clean_header.startswith(self.header1):
+                    headers.append(clean_header)
+            elif (next_line := match['next']) is not None:
+                line_links = set(
+                    sluggify(link.decode(encoding))
+                    for link in self._link_pattern.findall(next_line)
+                    if link != b"")
+                next.update(line_links)
+                links.update(line_links)
+            elif (link := match['link']) != b"":
+                links.add(sluggify(link.decode(encoding)))
+
+        if self.keep_body:
+            text = data[start:].decode(encoding)
+            body = [line.rstrip() for line in text.split("\n")]
+            # a trailing newline doesn't start a new line
+            if text.endswith("\n") or text == "":
+                body.pop()
+
+        return {'header': headers, 'links': links, 'next': next, 'body': body}
 
 
 class FrontmatterException(Exception):
@@ -9,6 +9,8 @@ from typing import Optional, Any, ParamSpec, TypeVar, TypeAlias
 
 
 _WAIT_TIME = 0.08
+# translation table deleting every punctuation character except '-'
+_SLUG_TABLE = str.maketrans("", "", punctuation.replace("-", ""))
 
 # from: https://stackoverflow.com/questions/47060133/python-3-type-hinting-for-decorator
 Param = ParamSpec('Param')
@@ -108,9 +110,7 @@ def sluggify(title: str) -> str:
     :param title: title to sluggify.
     :return: sluggified title (duh).
     """
-    clean_title = "".join(list(map(lambda x: x
-                                   if x not in punctuation or x == "-"
-                                   else "", title)))
+    clean_title = title.translate(_SLUG_TABLE)
     slug = clean_title.lower().replace(" ", "-")
 
     return slug
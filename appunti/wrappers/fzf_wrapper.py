@@ -0,0 +1,92 @@
+"""
+Small fzf wrapper to select notes
+"""
+
+from __future__ import annotations
+import subprocess
+from collections.abc import Iterable
+from typing import Optional
+
+from appunti.wrappers.base_wrapper import BaseWrapper, WrapperException
+
+# exit codes of fzf when nothing was selected
+_NO_MATCH = 1
+_INTERRUPTED = 130
+
+
+class Fzf(BaseWrapper):
+    """
+    Wrapper for fzf, to select notes by title.
+
+    :param multi: whether more than one note can be selected.
+    :param preview: shell command fzf runs to preview the note under
+                    the cursor. `{2}` is replaced by its ID.
+    """
+
+    def __init__(self, multi: bool = True, preview: Optional[str] = None):
+        super().__init__('fzf')
+        self.multi = multi
+        self.preview = preview
+
+    @property
+    def command(self) -> list[str]:
+        """
+        The fzf command line. Only titles are shown and searched,
+        while IDs travel along in the second field.
+        """
+        command = [self.cmd, '--delimiter', '\t', '--with-nth', '1']
+        if self.multi:
+            command.append('--multi')
+        if self.preview is not None:
+            command += ['--preview', self.preview]
+
+        return command
+
+    def select(self, notes: Iterable[tuple[str, str]]) -> list[str]:
+        """
+        Let the user select notes. Notes are written to fzf as they
+        come, so it can show the first ones while the rest are read.
+
+        :param notes: tuples of (title, zk_id).
+        :return: the IDs of the selected notes, empty if the user
+                 quit without selecting.
+        """
+        process = subprocess.Popen(self.command,
+                                   stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE)
+        assert process.stdin is not None and process.stdout is not None
+        try:
+            for title, zk_id in notes:
+                title = title.replace("\t", " ").replace("\n", " ")
+                process.stdin.write(f"{title}\t{zk_id}\n".encode('utf-8'))
+        except BrokenPipeError:
+            # fzf quit before reading all the notes
+            pass
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        output = process.stdout.read().decode('utf-8')
+        returncode = process.wait()
+        if returncode in (_NO_MATCH, _INTERRUPTED):
+            return []
+        if returncode != 0:
+            raise FzfException(f"fzf returned a non-zero exit status "
+                               f"{returncode}.")
+
+        zk_ids = [
+            line.rsplit("\t", 1)[1] for line in output.splitlines()
+            if "\t" in line
+        ]
+
+        return zk_ids
+
+
+class FzfException(WrapperException):
+    """Error raised when fzf is involved"""
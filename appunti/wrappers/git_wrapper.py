@@ -134,6 +134,80 @@ class Git(BaseWrapper):
             self.add()
             self.commit(msg)
 
+    def local_ref(self) -> str:
+        """
+        Get the commit hash the local branch points to.
+        """
+        process = run_and_handle(f'git rev-parse refs/heads/{self.branch}',
+                                 exception=GitException,
+                                 cwd=self.path)
+        ref = process.stdout.decode('utf-8').strip()
+
+        return ref
+
+    def remote_ref(self) -> str:
+        """
+        Get the commit hash the branch points to on origin, without
+        fetching any object. Return an empty string if the branch
+        does not exist on origin yet.
+        """
+        if not self._origin_exists():
+            raise GitException("""Origin does not exist.""")
+
+        process = run_and_handle(
+            f'git ls-remote origin refs/heads/{self.branch}',
+            exception=GitException,
+            cwd=self.path,
+            comment="Check that origin is correct")
+        output = process.stdout.decode('utf-8').split()
+        ref = output[0] if output else ""
+
+        return ref
+
+    def _is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """
+        Check whether a commit is an ancestor of another one.
+        Commits that are not known locally are never ancestors.
+
+        :param ancestor: hash of the supposed ancestor.
+        :param descendant: hash of the supposed descendant.
+        """
+        command = ['git', 'merge-base', '--is-ancestor', ancestor, descendant]
+        process = subprocess.run(command, cwd=self.path, capture_output=True)
+
+        return process.returncode == 0
+
+    def fast_sync(self, msg: str = "commit notes") -> tuple[bool, bool]:
+        """
+        Commit changes and synchronize with origin, comparing local and
+        remote refs first. The pull is skipped when origin hasn't moved
+        since the last sync, and the push is skipped when there is
+        nothing ahead of origin.
+
+        :param msg: commit message used if there are changes.
+        :return: whether a pull and a push were performed.
+        """
+        self.commit_on_change(msg)
+
+        remote = self.remote_ref()
+        local = self.local_ref()
+        pulled = False
+        pushed = False
+
+        # origin has commits we don't have
+        if remote and remote != local \
+                and not self._is_ancestor(remote, local):
+            self.pull()
+            pulled = True
+            local = self.local_ref()
+
+        # we have commits origin doesn't have
+        if remote != local:
+            self.push()
+            pushed = True
+
+        return pulled, pushed
+
     def save(self, msg: str = "commit notes") -> None:
         self.commit_on_change(msg)
         if self.origin:
@@ -331,11 +405,17 @@ class GitMixin:
         if (git := self._detect_git_repo(self.vault)):
             git.commit_on_change("Committing current changes.")
 
-    def sync(self: GitMixinProtocol) -> None:
+    def sync(self: GitMixinProtocol, fast: bool = False) -> None:
         """
         Synchronize with remote origin.
+
+        :param fast: compare local and remote refs first, and only
+                     pull and push when needed.
         """
         if (git := self._detect_git_repo(self.vault)):
+            if fast:
+                git.fast_sync("Synchronizing.")
+                return
             git.commit_on_change("Synchronizing.")
             git.pull()
             git.push()
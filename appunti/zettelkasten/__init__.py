@@ -1,2 +1,3 @@
-from appunti.zettelkasten.notes import Note, BaseNote
+from appunti.zettelkasten.notes import Note, BaseNote, NoteRecord, NoteColumns
 from appunti.zettelkasten.zettelkasten import Zettelkasten
+from appunti.zettelkasten.cache import NoteCache
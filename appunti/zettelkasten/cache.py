@@ -0,0 +1,125 @@
+"""
+Cache of parsed notes
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from collections.abc import Callable
+from copy import copy
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+
+from appunti.zettelkasten.notes import Note
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _copy_note(note: Note) -> Note:
+    """
+    Copy a note and its collections, so that callers can modify
+    it without affecting the cached one.
+    """
+    copied = copy(note)
+    copied.tags = copy(note.tags)
+    copied.links = copy(note.links)
+    copied.next = copy(note.next)
+
+    return copied
+
+
+class NoteCache:
+    """
+    Bounded LRU cache of parsed notes, keyed by path. A cached note
+    is only valid as long as modification time and size of its file
+    are unchanged.
+
+    The cache can be shared between threads. Notes are parsed outside
+    the lock, so a slow parse doesn't hold up other threads.
+
+    :param maxsize: maximum number of notes to keep.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._notes: OrderedDict[Path, tuple[tuple[int, int], Note]] = \
+            OrderedDict()
+        self._lock = Lock()
+
+    def get(self,
+            path: str | Path,
+            loader: Callable[[Path], Note],
+            refresh: bool = False) -> Note:
+        """
+        Get the note at path, parsing it with loader if it's not
+        cached or if the file changed.
+
+        :param path: path to the note.
+        :param loader: function parsing the note at path.
+        :param refresh: whether to parse the note even if it's cached,
+                        for loaders that check the note while parsing.
+        :return: a copy of the cached note.
+        """
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            # let the loader deal with missing files
+            self.invalidate(path)
+            return loader(path)
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._notes.get(path)
+            if not refresh and entry is not None and entry[0] == signature:
+                self.hits += 1
+                self._notes.move_to_end(path)
+                return _copy_note(entry[1])
+            self.misses += 1
+
+        note = loader(path)
+        with self._lock:
+            self._notes[path] = (signature, note)
+            self._notes.move_to_end(path)
+            while len(self._notes) > self.maxsize:
+                self._notes.popitem(last=False)
+
+        return _copy_note(note)
+
+    def invalidate(self, path: str | Path) -> None:
+        """
+        Remove the note at path from the cache.
+
+        :param path: path to the note.
+        """
+        with self._lock:
+            self._notes.pop(Path(path), None)
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset the counters.
+        """
+        with self._lock:
+            self._notes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Statistics of the cache, for tuning its size.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._notes))
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, Path)) and Path(path) in self._notes
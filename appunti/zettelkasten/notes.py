@@ -3,21 +3,120 @@ Define the main class that models a zettelkasten note.
 """
 
 from __future__ import annotations
-from collections.abc import Collection
-from typing import Any
+from collections.abc import Collection, Iterable, Iterator
+from typing import Any, Optional
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field, fields
 from string import ascii_letters
 from pathlib import Path
 from hashlib import md5
+from sys import intern
 import random
 
-from appunti.parser.parser import HeaderParser, BodyParser
+from appunti.parser.parser import HeaderParser, BodyParser, MmapParser
 from appunti.utils import sluggify
 
 
+_SECOND = timedelta(seconds=1)
+
+
+def _to_seconds(date: datetime) -> int:
+    """
+    Whole seconds from datetime.min to a naive date. Unlike timestamps
+    they don't depend on the local time zone, so every date, including
+    the ones skipped or repeated when clocks change, converts back to
+    itself.
+
+    :param date: the date.
+    """
+    return (date - datetime.min) // _SECOND
+
+
+def _from_seconds(seconds: int) -> datetime:
+    """
+    Naive date from whole seconds since datetime.min.
+
+    :param seconds: the seconds.
+    """
+    return datetime.min + timedelta(seconds=seconds)
+
+
+def _read_body(path: str | Path, delimiter: str = "---") -> str:
+    """
+    Read the body of a note from its file, skipping the frontmatter.
+
+    :param path: path to the note.
+    :param delimiter: delimiter of the frontmatter.
+    :return: the body, formatted like Note.read does.
+    """
+    with open(path) as f:
+        delimiters_found = 0
+        for line in f:
+            if line.strip() == delimiter:
+                delimiters_found += 1
+            if delimiters_found == 2:
+                break
+        body = "\n".join(line.rstrip() for line in f).strip()
+
+    return body
+
+
+def read_head(path: str | Path,
+               delimiter: str = "---",
+               lines: int = 10) -> list[str]:
+    """
+    Read the first lines of the body of a note, without reading
+    the rest of the file.
+
+    :param path: path to the note.
+    :param delimiter: delimiter of the frontmatter.
+    :param lines: how many lines to read.
+    :return: the lines, without leading blank ones.
+    """
+    head: list[str] = []
+    with open(path) as f:
+        delimiters_found = 0
+        for line in f:
+            if line.strip() == delimiter:
+                delimiters_found += 1
+            if delimiters_found == 2:
+                break
+        for line in f:
+            line = line.rstrip()
+            if not head and not line:
+                continue
+            head.append(line)
+            if len(head) == lines:
+                break
+
+    return head
+
+
+class _LazyBody:
+    """
+    Descriptor for the body of a note. The body of a scanned note
+    is only read from its file the first time it's accessed.
+    """
+
+    def __get__(self, note: Optional[Note], owner: Any = None) -> str:
+        # accessed from the class: the dataclass field has no default
+        if note is None:
+            raise AttributeError("body")
+
+        body: Optional[str] = note.__dict__.get('_body')
+        if body is None:
+            source = note.__dict__.get('_body_source')
+            body = _read_body(*source) if source is not None else ""
+            note.__dict__['_body'] = body
+
+        return body
+
+    def __set__(self, note: Note, body: Optional[str]) -> None:
+        note.__dict__['_body'] = body
+
+
 class BaseNote(ABC):
 
     @classmethod
@@ -83,7 +182,8 @@ class Note(BaseNote):
     :param tags: tags of the note
     :param links: links the note points to
     :param next: links to the note directly next to this one
-    :param body: the whole body of the note
+    :param body: the whole body of the note. It is loaded lazily
+                 for notes created with `Note.scan`.
     """
     title: str
     author: str
@@ -93,7 +193,7 @@ class Note(BaseNote):
     tags: Collection[str]
     links: Collection[str]
     next: Collection[str]
-    body: str
+    body: str = _LazyBody()  # type: ignore[assignment]
 
     @classmethod
     def new(cls, title: str, author: str) -> Note:
@@ -134,22 +234,109 @@ class Note(BaseNote):
         :param link_del: how a link is delimited.
         :return: the note
         """
-        header_parser = HeaderParser(parsing_obj=parsing_obj,
-                                     delimiter=delimiter,
-                                     special_names=special_names)
-        body_parser = BodyParser(header1=header, link_del=link_del)
+        frontmatter_meta, body_meta = cls._parse(path, parsing_obj,
+                                                 delimiter, special_names,
+                                                 header, link_del, strict,
+                                                 quiet, keep_body=True)
+
+        body = "\n".join(body_meta['body']).strip()
+        new_note = cls(links=body_meta['links'],
+                       next=body_meta['next'],
+                       body=body,
+                       **frontmatter_meta)
+
+        return new_note
 
+    @classmethod
+    def scan(cls,
+             path: str | Path,
+             parsing_obj: Collection[str] = [
+                 'title', 'author', 'date', 'last', 'zk_id', 'tags'
+             ],
+             delimiter: str = "---",
+             special_names: Collection[str] = ("date", "last", "tags",
+                                               'zk_id'),
+             header: str = "# ",
+             link_del: tuple[str, str] = ('[[', ']]'),
+             strict: bool = False,
+             quiet: bool = False,
+             parser: Optional[MmapParser] = None) -> Note:
+        """
+        Read only the fields of a note needed for indexing: frontmatter,
+        links and headers. The body is not kept in memory, and it is
+        read again from the file only if it's accessed.
+
+        :param path: path to the note.
+        :param parsing_obj: what names to parse in the frontmatter.
+        :param delimiter: delimiter of the frontmatter.
+        :param special_names: names of the frontmatter that need to be specially parsed.
+        :param header: how a header is defined.
+        :param link_del: how a link is delimited.
+        :param parser: parser shared by many notes, configured like the
+                       arguments above. It is built if not given.
+        :return: the note, with a lazily loaded body
+        """
+        frontmatter_meta, body_meta = cls._parse(path, parsing_obj,
+                                                 delimiter, special_names,
+                                                 header, link_del, strict,
+                                                 quiet, keep_body=False,
+                                                 memory_map=True,
+                                                 mmap_parser=parser)
+
+        new_note = cls(links=body_meta['links'],
+                       next=body_meta['next'],
+                       body=None,  # type: ignore[arg-type]
+                       **frontmatter_meta)
+        new_note.__dict__['_body_source'] = (Path(path), delimiter)
+
+        return new_note
+
+    @staticmethod
+    def _parse(path: str | Path, parsing_obj: Collection[str],
+               delimiter: str, special_names: Collection[str], header: str,
+               link_del: tuple[str, str], strict: bool, quiet: bool,
+               keep_body: bool,
+               memory_map: bool = False,
+               mmap_parser: Optional[MmapParser] = None
+               ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Parse frontmatter and body of a note, and check that the
+        first header and the title coincide.
+
+        :param keep_body: whether to collect the lines of the body.
+        :param memory_map: whether to parse the memory-mapped bytes
+                           of the note instead of its lines.
+        :param mmap_parser: the parser to use when memory_map=True.
+        :return: the parsed frontmatter and body.
+        """
         if not Path(path).exists():
             raise NoteException(
                 "Note does not exist. Consider reindexing the vault.")
 
-        with open(path) as f:
-            frontmatter_meta, _ = header_parser.parse(handle=f)
-            body_meta, _ = body_parser.parse(handle=f)
+        if memory_map and mmap_parser is not None:
+            frontmatter_meta, body_meta = mmap_parser.parse(path)
+        elif memory_map:
+            mmap_parser = MmapParser(parsing_obj=parsing_obj,
+                                     delimiter=delimiter,
+                                     special_names=special_names,
+                                     header1=header,
+                                     link_del=link_del,
+                                     keep_body=keep_body)
+            frontmatter_meta, body_meta = mmap_parser.parse(path)
+        else:
+            header_parser = HeaderParser(parsing_obj=parsing_obj,
+                                         delimiter=delimiter,
+                                         special_names=special_names)
+            body_parser = BodyParser(header1=header,
+                                     link_del=link_del,
+                                     keep_body=keep_body)
+            with open(path) as f:
+                frontmatter_meta, _ = header_parser.parse(handle=f)
+                body_meta, _ = body_parser.parse(handle=f)
 
         # raise exception if first header is different from title
         if not quiet:
-            if body_meta['header'][0].removeprefix(
+            if not body_meta['header'] or body_meta['header'][0].removeprefix(
                     header).strip() != frontmatter_meta['title']:
                 if strict:
                     raise NoteException(
@@ -159,22 +346,15 @@ class Note(BaseNote):
                         f"First header and title of note {frontmatter_meta['zk_id']} do not coincide."
                     )
 
-        links = body_meta['links']
-        next = body_meta['next']
-        body = "\n".join(body_meta['body']).strip()
-        new_note = Note(links=links, next=next, body=body, **frontmatter_meta)
-
-        return new_note
+        return dict(frontmatter_meta), dict(body_meta)
 
     def materialize(self) -> str:
         """
         Return content of note
         """
 
-        note = self.generate_frontmatter()
-        note += "\n\n\n"
-        note += self.body
-        note += "\n"
+        note = "".join(
+            [self.generate_frontmatter(), "\n\n\n", self.body, "\n"])
 
         return note
 
@@ -258,5 +438,162 @@ class Note(BaseNote):
         return id
 
 
+@dataclass(frozen=True, slots=True)
+class NoteRecord:
+    """
+    Compact and immutable representation of the index-relevant fields
+    of a note, returned by bulk operations. Tags and links are
+    interned and stored in frozensets, and dates are stored as
+    seconds since datetime.min.
+
+    :param title: title of the note
+    :param author: author of the note
+    :param created: creation date of the note, in seconds
+    :param changed: date of last change of the note, in seconds
+    :param zk_id: unique id of the note
+    :param tags: tags of the note
+    :param links: links the note points to
+    :param next: links to the note directly next to this one
+    """
+    title: str
+    author: str
+    created: int
+    changed: int
+    zk_id: str
+    tags: frozenset[str]
+    links: frozenset[str]
+    next: frozenset[str]
+
+    @classmethod
+    def from_note(cls, note: Note) -> NoteRecord:
+        """
+        Create a record from a note. The body is not read.
+
+        :param note: the note.
+        :return: the compact record.
+        """
+        record = cls(title=note.title,
+                     author=intern(note.author),
+                     created=_to_seconds(note.date),
+                     changed=_to_seconds(note.last),
+                     zk_id=note.zk_id,
+                     tags=frozenset(intern(tag) for tag in note.tags),
+                     links=frozenset(intern(link) for link in note.links),
+                     next=frozenset(intern(link) for link in note.next))
+
+        return record
+
+    def to_note(self, body: str = "") -> Note:
+        """
+        Create a note from the record.
+
+        :param body: body of the note.
+        :return: the note.
+        """
+        note = Note(title=self.title,
+                    author=self.author,
+                    date=self.date,
+                    last=self.last,
+                    zk_id=self.zk_id,
+                    tags=set(self.tags),
+                    links=set(self.links),
+                    next=set(self.next),
+                    body=body)
+
+        return note
+
+    @property
+    def date(self) -> datetime:
+        return _from_seconds(self.created)
+
+    @property
+    def last(self) -> datetime:
+        return _from_seconds(self.changed)
+
+
+@dataclass
+class NoteColumns:
+    """
+    Columnar representation of many notes, as parallel lists: the i-th
+    element of every list belongs to the same note. Rows for the index
+    tables are generated on the fly, ready for `executemany`.
+    """
+    zk_id: list[str] = field(default_factory=list)
+    title: list[str] = field(default_factory=list)
+    author: list[str] = field(default_factory=list)
+    created: list[int] = field(default_factory=list)
+    changed: list[int] = field(default_factory=list)
+    tags: list[frozenset[str]] = field(default_factory=list)
+    links: list[frozenset[str]] = field(default_factory=list)
+    next: list[frozenset[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: Iterable[NoteRecord]) -> NoteColumns:
+        """
+        Create the columns from note records.
+
+        :param records: the records, in order.
+        :return: the columns.
+        """
+        columns = cls()
+        for record in records:
+            columns.append(record)
+
+        return columns
+
+    def append(self, record: NoteRecord) -> None:
+        """
+        Add a note record at the end of the columns.
+
+        :param record: the record to add.
+        """
+        self.zk_id.append(record.zk_id)
+        self.title.append(record.title)
+        self.author.append(record.author)
+        self.created.append(record.created)
+        self.changed.append(record.changed)
+        self.tags.append(record.tags)
+        self.links.append(record.links)
+        self.next.append(record.next)
+
+    def records(self) -> Iterator[NoteRecord]:
+        """
+        Iterate over the notes as records.
+        """
+        for row in zip(self.title, self.author, self.created, self.changed,
+                       self.zk_id, self.tags, self.links, self.next):
+            yield NoteRecord(*row)
+
+    def main_rows(self) -> Iterator[tuple[str, str, str, datetime, datetime]]:
+        """
+        Rows for the main table of the index:
+        (zk_id, title, author, creation_date, last_changed).
+        """
+        for zk_id, title, author, created, changed in zip(
+                self.zk_id, self.title, self.author, self.created,
+                self.changed):
+            yield (zk_id, title, author, _from_seconds(created),
+                   _from_seconds(changed))
+
+    def tag_rows(self) -> Iterator[tuple[str, str]]:
+        """
+        Rows for the tags table of the index: (tag, zk_id).
+        """
+        for zk_id, tags in zip(self.zk_id, self.tags):
+            for tag in tags:
+                yield tag, zk_id
+
+    def link_rows(self) -> Iterator[tuple[str, str]]:
+        """
+        Rows for the links table of the index: (link, zk_id).
+        """
+        for zk_id, links in zip(self.zk_id, self.links):
+            for link in links:
+                yield link, zk_id
+
+    def __len__(self) -> int:
+        return len(self.zk_id)
+
+
 class NoteException(Exception):
     """Exception raised when there is an issue with a note."""
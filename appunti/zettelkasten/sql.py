@@ -2,12 +2,16 @@
 SQLite statements to manage index
 """
 
+import math
 import sqlite3
+from datetime import datetime
 from pathlib import Path
 
-from typing import Optional
+from collections.abc import Callable, Collection, Iterator
+from typing import Any, Optional
 
-from appunti.zettelkasten.notes import Note
+from appunti.zettelkasten.notes import Note, NoteRecord, NoteColumns
+from appunti.utils import sluggify
 
 _CREATE_MAIN_TABLE_STMT = """
     CREATE TABLE IF NOT EXISTS zettelkasten(zk_id STRING NOT NULL,
@@ -15,6 +19,7 @@ _CREATE_MAIN_TABLE_STMT = """
     author STRING NOT NULL,
     creation_date DATETIME NOT NULL,
     last_changed DATETIME NOT NULL,
+    slug STRING,
     PRIMARY KEY(zk_id))
 """
 _CREATE_TAGS_TABLE_STMT = """
@@ -33,10 +38,41 @@ _CREATE_LINKS_TABLE_STMT = """
         ON UPDATE CASCADE
         ON DELETE CASCADE)
 """
+_CREATE_CREATION_DATE_INDEX_STMT = """
+    CREATE INDEX IF NOT EXISTS zettelkasten_creation_date
+    ON zettelkasten(creation_date)
+"""
+_CREATE_TITLE_INDEX_STMT = """
+    CREATE INDEX IF NOT EXISTS zettelkasten_title
+    ON zettelkasten(title)
+"""
+_CREATE_SLUG_INDEX_STMT = """
+    CREATE INDEX IF NOT EXISTS zettelkasten_slug
+    ON zettelkasten(slug)
+"""
+# links by their target, to find backlinks
+_CREATE_LINK_INDEX_STMT = """
+    CREATE INDEX IF NOT EXISTS links_link
+    ON links(link)
+"""
+_CREATE_ACCESS_LOG_TABLE_STMT = """
+    CREATE TABLE IF NOT EXISTS access_log(zk_id STRING NOT NULL,
+    timestamp DATETIME NOT NULL,
+    action STRING NOT NULL)
+"""
+_CREATE_FRECENCY_TABLE_STMT = """
+    CREATE TABLE IF NOT EXISTS frecency(zk_id STRING NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY(zk_id))
+"""
 _DROP_MAIN_TABLE_STMT = "DROP TABLE IF EXISTS zettelkasten;"
 _DROP_TAGS_TABLE_STMT = "DROP TABLE IF EXISTS tags;"
 _DROP_LINKS_TABLE_STMT = "DROP TABLE IF EXISTS links;"
-_INSERT_MAIN_STMT = "INSERT INTO zettelkasten VALUES (?, ?, ?, ?, ?)"
+_INSERT_MAIN_STMT = """
+    INSERT INTO zettelkasten
+    (zk_id, title, author, creation_date, last_changed, slug)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 _INSERT_TAGS_STMT = "INSERT INTO tags VALUES (?, ?)"
 _INSERT_LINKS_STMT = "INSERT INTO links VALUES (?, ?)"
 _DELETE_MAIN_STMT = "DELETE FROM zettelkasten WHERE zk_id = ?"
@@ -46,12 +82,101 @@ _UPDATE_MAIN_STMT = """
     UPDATE zettelkasten SET
     title = ?,
     author = ?,
-    last_changed = ?
+    last_changed = ?,
+    slug = ?
     WHERE zk_id = ?
 """
+_ADD_SLUG_COLUMN_STMT = "ALTER TABLE zettelkasten ADD COLUMN slug STRING"
+_SET_SLUG_STMT = "UPDATE zettelkasten SET slug = ? WHERE zk_id = ?"
+# titles may clash, so these are point lookups on plain indices
+_TITLE_EXISTS_STMT = """
+    SELECT EXISTS(SELECT 1 FROM zettelkasten
+    WHERE (title = ? OR slug = ?) AND zk_id NOT IN ({}))
+"""
+_ID_EXISTS_STMT = "SELECT EXISTS(SELECT 1 FROM zettelkasten WHERE zk_id = ?)"
+_ID_RANGE_STMT = """
+    SELECT zk_id FROM zettelkasten WHERE zk_id > ? AND zk_id < ?
+    ORDER BY zk_id LIMIT ?
+"""
+_PREVIOUS_ID_STMT = """
+    SELECT zk_id FROM zettelkasten WHERE zk_id < ?
+    ORDER BY zk_id DESC LIMIT 1
+"""
+_NEXT_ID_STMT = """
+    SELECT zk_id FROM zettelkasten WHERE zk_id > ?
+    ORDER BY zk_id ASC LIMIT 1
+"""
+_RESOLVE_SLUG_STMT = """
+    SELECT zk_id FROM zettelkasten WHERE slug = ?
+    ORDER BY creation_date ASC LIMIT 1
+"""
+# notes linked from a note, linking to it, and one more hop away from
+# those in either direction
+_NEIGHBORHOOD_STMT = """
+    WITH
+    outgoing(zk_id) AS (
+        SELECT DISTINCT target.zk_id FROM links
+        JOIN zettelkasten AS target ON target.slug = links.link
+        WHERE links.zk_id = :zk_id),
+    incoming(zk_id) AS (
+        SELECT DISTINCT links.zk_id FROM links
+        WHERE links.link = (
+            SELECT slug FROM zettelkasten WHERE zk_id = :zk_id)),
+    near(zk_id) AS (
+        SELECT zk_id FROM outgoing UNION SELECT zk_id FROM incoming),
+    far(zk_id) AS (
+        SELECT target.zk_id FROM near
+        JOIN links ON links.zk_id = near.zk_id
+        JOIN zettelkasten AS target ON target.slug = links.link
+        UNION
+        SELECT links.zk_id FROM near
+        JOIN zettelkasten AS source ON source.zk_id = near.zk_id
+        JOIN links ON links.link = source.slug),
+    two_hop(zk_id) AS (
+        SELECT zk_id FROM far
+        WHERE zk_id != :zk_id AND zk_id NOT IN (SELECT zk_id FROM near)
+        LIMIT :limit)
+    SELECT 'incoming', zettelkasten.title, zettelkasten.zk_id
+    FROM incoming JOIN zettelkasten USING (zk_id)
+    UNION ALL
+    SELECT 'two_hop', zettelkasten.title, zettelkasten.zk_id
+    FROM two_hop JOIN zettelkasten USING (zk_id)
+"""
+_INSERT_ACCESS_STMT = "INSERT INTO access_log VALUES (?, ?, ?)"
+_GET_SCORE_STMT = "SELECT score FROM frecency WHERE zk_id = ?"
+_UPSERT_SCORE_STMT = """
+    INSERT INTO frecency VALUES (?, ?)
+    ON CONFLICT(zk_id) DO UPDATE SET score = excluded.score
+"""
 _LIST_STMT = "SELECT zk_id, title FROM zettelkasten;"
+_ITER_TITLES_STMT = """
+    SELECT title, zk_id FROM zettelkasten
+    ORDER BY creation_date ASC
+"""
 _GET_LINKS_ID = "SELECT link FROM links WHERE zk_id = ?;"
 
+# how many SQLite virtual machine instructions between cancellation checks
+_CANCEL_CHECK_STEPS = 1000
+
+# how much every kind of access counts towards the frecency of a note
+ACCESS_WEIGHTS = {
+    'new': 1.0,
+    'update': 1.0,
+    'open': 1.0,
+    'print': 0.5,
+    'browse': 0.5
+}
+# seconds after which an access counts half
+FRECENCY_HALF_LIFE = 14 * 24 * 60 * 60
+# how many notes two hops away to list at most
+NEIGHBORHOOD_LIMIT = 50
+# shortest abbreviation of IDs
+ABBREV_LENGTH = 7
+# bounds of the IDs starting with a prefix. SQLite compares prefixes
+# made of digits only as numbers, bounds never look like one
+_PREFIX_START = "\x00"
+_PREFIX_END = "\U0010ffff"
+
 _JOINED_ALL = """
     (SELECT *
     FROM (
@@ -71,6 +196,7 @@ class DBManager:
 
     def __init__(self, index: Path) -> None:
         self.index = index
+        self._migrated = False
 
     def create_tables(self) -> None:
         """
@@ -80,6 +206,49 @@ class DBManager:
             conn.execute(_CREATE_MAIN_TABLE_STMT)
             conn.execute(_CREATE_TAGS_TABLE_STMT)
             conn.execute(_CREATE_LINKS_TABLE_STMT)
+            conn.execute(_CREATE_CREATION_DATE_INDEX_STMT)
+            conn.execute(_CREATE_TITLE_INDEX_STMT)
+            conn.execute(_CREATE_SLUG_INDEX_STMT)
+            conn.execute(_CREATE_LINK_INDEX_STMT)
+        self.create_access_tables()
+        self._migrated = True
+
+    def migrate(self) -> None:
+        """
+        Bring the index of a vault created by an older version up to
+        date: add the sluggified titles to the notes, the indices to
+        follow links both ways and to look titles up. Only checked once.
+        """
+        if self._migrated:
+            return
+        with sqlite3.connect(self.index) as conn:
+            columns = [
+                row[1]
+                for row in conn.execute("PRAGMA table_info(zettelkasten)")
+            ]
+            if not columns:
+                # not indexed yet
+                return
+            if 'slug' not in columns:
+                conn.execute(_ADD_SLUG_COLUMN_STMT)
+                conn.executemany(
+                    _SET_SLUG_STMT,
+                    [(sluggify(title), zk_id) for zk_id, title in
+                     conn.execute("SELECT zk_id, title FROM zettelkasten")])
+            conn.execute(_CREATE_TITLE_INDEX_STMT)
+            conn.execute(_CREATE_SLUG_INDEX_STMT)
+            conn.execute(_CREATE_LINK_INDEX_STMT)
+        self._migrated = True
+
+    def create_access_tables(self) -> None:
+        """
+        Create the access log and the frecency scores. They are kept
+        when the index is rebuilt, and created on first use in vaults
+        initialized before they existed.
+        """
+        with sqlite3.connect(self.index) as conn:
+            conn.execute(_CREATE_ACCESS_LOG_TABLE_STMT)
+            conn.execute(_CREATE_FRECENCY_TABLE_STMT)
 
     def drop_tables(self) -> None:
         """
@@ -96,16 +265,30 @@ class DBManager:
 
         :param note: the updated note.
         """
-        main_payload = (note.title, note.author, note.last, note.zk_id)
-        tags_payload = [(tag, note.zk_id) for tag in note.tags]
-        links_payload = [(link, note.zk_id) for link in note.links]
+        self.update_many_to_index([note])
 
+    def update_many_to_index(self, notes: list[Note]) -> None:
+        """
+        Add to the index the updated metadata of many notes, in a
+        single transaction.
+
+        :param notes: the updated notes.
+        """
+        main_payload = [(note.title, note.author, note.last,
+                         sluggify(note.title), note.zk_id) for note in notes]
+        ids_payload = [(note.zk_id, ) for note in notes]
+        tags_payload = [(tag, note.zk_id) for note in notes
+                        for tag in note.tags]
+        links_payload = [(link, note.zk_id) for note in notes
+                         for link in note.links]
+
+        self.migrate()
         try:
             with sqlite3.connect(self.index) as conn:
-                conn.execute(_UPDATE_MAIN_STMT, main_payload)
+                conn.executemany(_UPDATE_MAIN_STMT, main_payload)
                 # update tags and links
-                conn.execute(_DELETE_TAGS_STMT, (note.zk_id, ))
-                conn.execute(_DELETE_LINKS_STMT, (note.zk_id, ))
+                conn.executemany(_DELETE_TAGS_STMT, ids_payload)
+                conn.executemany(_DELETE_LINKS_STMT, ids_payload)
                 conn.executemany(_INSERT_TAGS_STMT, tags_payload)
                 conn.executemany(_INSERT_LINKS_STMT, links_payload)
         # TODO: investigate sqlite3 exceptions
@@ -113,17 +296,18 @@ class DBManager:
             raise DBManagerException("SQL error") from e
 
     # TODO: make it so payload is note-agnostic
-    def add_to_index(self, note: Note) -> None:
+    def add_to_index(self, note: Note | NoteRecord) -> None:
         """
         Add a new note to the vault
 
-        :param note: note to process.
+        :param note: note or note record to process.
         """
         main_payload = (note.zk_id, note.title, note.author, note.date,
-                        note.last)
+                        note.last, sluggify(note.title))
         tags_payload = [(tag, note.zk_id) for tag in note.tags]
         links_payload = [(link, note.zk_id) for link in note.links]
 
+        self.migrate()
         try:
             with sqlite3.connect(self.index) as conn:
                 conn.execute(_INSERT_MAIN_STMT, main_payload)
@@ -132,6 +316,74 @@ class DBManager:
         except sqlite3.IntegrityError as e:
             raise DBManagerException("SQL error") from e
 
+    def add_many_to_index(self, columns: NoteColumns) -> None:
+        """
+        Add many new notes to the vault in a single transaction.
+
+        :param columns: the notes to add, in columnar form.
+        """
+        main_rows = ((*row, sluggify(row[1])) for row in columns.main_rows())
+
+        self.migrate()
+        try:
+            with sqlite3.connect(self.index) as conn:
+                conn.executemany(_INSERT_MAIN_STMT, main_rows)
+                conn.executemany(_INSERT_TAGS_STMT, columns.tag_rows())
+                conn.executemany(_INSERT_LINKS_STMT, columns.link_rows())
+        except sqlite3.IntegrityError as e:
+            raise DBManagerException("SQL error") from e
+
+    def record_access(self,
+                      zk_id: str,
+                      action: str,
+                      timestamp: Optional[datetime] = None) -> None:
+        """
+        Append an access to a note to the log, and add it to the
+        frecency score of the note.
+
+        Scores decay exponentially with FRECENCY_HALF_LIFE. Instead of
+        decaying every score as time passes, every access is weighted
+        by how recent it is, growing exponentially with its timestamp:
+        the order of the notes is the same, and only the accessed note
+        needs updating. Scores are kept as base 2 logarithms, so that
+        they don't overflow.
+
+        :param zk_id: ID of the note.
+        :param action: what was done with the note, one of
+                       ACCESS_WEIGHTS.
+        :param timestamp: when the note was accessed. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        weight = ACCESS_WEIGHTS[action]
+        access_score = math.log2(weight) + (timestamp.timestamp() /
+                                            FRECENCY_HALF_LIFE)
+
+        self.create_access_tables()
+        with sqlite3.connect(self.index) as conn:
+            conn.execute(_INSERT_ACCESS_STMT, (zk_id, timestamp, action))
+            row = conn.execute(_GET_SCORE_STMT, (zk_id, )).fetchone()
+            score = access_score if row is None else _log2_add(
+                row[0], access_score)
+            conn.execute(_UPSERT_SCORE_STMT, (zk_id, score))
+
+    def get_last_access(self, actions: Collection[str]) -> Optional[str]:
+        """
+        Get the note accessed last with one of the given actions.
+
+        :param actions: the actions to consider.
+        :return: ID of the note, or None if there is none.
+        """
+        placeholders = ", ".join("?" * len(actions))
+        self.create_access_tables()
+        with sqlite3.connect(self.index) as conn:
+            row = conn.execute(
+                "SELECT zk_id FROM access_log "
+                f"WHERE action IN ({placeholders}) "
+                "ORDER BY rowid DESC LIMIT 1", tuple(actions)).fetchone()
+
+        return None if row is None else row[0]
+
     def delete_from_index(self, zk_id: str) -> None:
         """
         Delete note from index.
@@ -157,21 +409,86 @@ class DBManager:
             # access_date: Optional[list[str]] = None,
             sort_by: Optional[str] = None,
             descending: bool = True,
-            show: list[str] = ['title', 'zk_id']) -> list[tuple[str, ...]]:
+            show: list[str] = ['title', 'zk_id'],
+            cancelled: Optional[Callable[[], bool]] = None,
+            limit: Optional[int] = None,
+            offset: int = 0) -> list[tuple[str, ...]]:
         """
+        List and filter the notes in the index.
+
+        :param sort_by: column to sort on, or 'frecency' to sort on how
+                        often and how recently notes were accessed.
+        :param cancelled: function called periodically while the query
+                          runs. If it returns True the query is aborted
+                          and DBManagerCancelled is raised.
+        :param limit: maximum number of notes to return.
+        :param offset: how many notes to skip.
         """
-        query: str = _JOINED_ALL
-        payload = []
+        # tags and links are only joined when they're shown or sorted on
+        columns = set(show) | {sort_by}
+        joined = bool(columns & {'tag', 'link'})
         select_cols = "SELECT DISTINCT " + ", ".join(
             f"{col}" for col in show) + " FROM "
+        select_cols += _JOINED_ALL if joined else "zettelkasten"
+        if sort_by == 'frecency':
+            self.create_access_tables()
+            select_cols += " LEFT JOIN frecency USING (zk_id)"
+        where_query, payload = self._filter_query(title, zk_id, author, tag,
+                                                  link)
 
-        queries = []
-        for name, table in [('title', 'zettelkasten'),
-                            ('zk_id', 'zettelkasten'),
-                            ('author', 'zettelkasten'), ('tag', 'tags'),
-                            ('link', 'links')]:
+        ascending_query = "DESC" if descending else "ASC"
+        sort_query = ""
+        if sort_by == 'frecency':
+            # notes never accessed come in order of creation
+            sort_query = (f"\nORDER BY score {ascending_query}, "
+                          f"creation_date {ascending_query}")
+        elif sort_by is not None:
+            sort_query = f"\nORDER BY {sort_by} {ascending_query}"
+        limit_query = ""
+        if limit is not None:
+            limit_query = "\nLIMIT ? OFFSET ?"
+            payload += [limit, offset]
+
+        query = select_cols + where_query + sort_query + limit_query
+
+        return self._fetch(query, payload, cancelled)
+        # return query
+
+    def count_notes(self,
+                    title: Optional[list[str]] = None,
+                    zk_id: Optional[list[str]] = None,
+                    author: Optional[list[str]] = None,
+                    tag: Optional[list[str]] = None,
+                    link: Optional[list[str]] = None,
+                    cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count the notes `list_notes` would return with these filters.
+
+        :param cancelled: function called periodically while the query
+                          runs. If it returns True the query is aborted
+                          and DBManagerCancelled is raised.
+        """
+        where_query, payload = self._filter_query(title, zk_id, author, tag,
+                                                  link)
+        query = "SELECT COUNT(*) FROM zettelkasten" + where_query
+        (count, ), = self._fetch(query, payload, cancelled)
+
+        return count
 
-            value = locals()[name]
+    def _filter_query(
+            self, title: Optional[list[str]], zk_id: Optional[list[str]],
+            author: Optional[list[str]], tag: Optional[list[str]],
+            link: Optional[list[str]]) -> tuple[str, list[str | int]]:
+        """
+        Build the WHERE clause filtering the notes, and its payload.
+        """
+        payload: list[str | int] = []
+        queries = []
+        for name, table, value in [('title', 'zettelkasten', title),
+                                   ('zk_id', 'zettelkasten', zk_id),
+                                   ('author', 'zettelkasten', author),
+                                   ('tag', 'tags', tag),
+                                   ('link', 'links', link)]:
             if value is None:
                 continue
             tmp_query, tmp_payload = self._assemble_templated_query(
@@ -183,25 +500,27 @@ class DBManager:
             [f"zk_id IN ({tmp_query})" for tmp_query in queries])
         where_query = " WHERE " + sub_queries if sub_queries else ""
 
-        ascending_query = "DESC" if descending else "ASC"
-        sort_query = ""
-        if sort_by is not None:
-            sort_query = f"\nORDER BY {sort_by} {ascending_query}"
-
-        query = select_cols + query + where_query + sort_query
+        return where_query, payload
 
+    def _fetch(
+        self, query: str, payload: list[str | int],
+        cancelled: Optional[Callable[[], bool]]
+    ) -> list[tuple[str, ...]]:
         try:
             with sqlite3.connect(self.index) as conn:
+                if cancelled is not None:
+                    conn.set_progress_handler(cancelled, _CANCEL_CHECK_STEPS)
                 cur = conn.cursor()
                 results = cur.execute(query, tuple(payload)).fetchall()
                 cur.close()
         except sqlite3.OperationalError as e:
+            if cancelled is not None and cancelled():
+                raise DBManagerCancelled("Query was cancelled.") from e
             raise DBManagerException(
                 "Something went wrong. Have you tried indexing your notes first?"
                 f"\nError: {e}")
 
         return results
-        # return query
 
     @staticmethod
     def _assemble_templated_query(
@@ -221,6 +540,225 @@ class DBManager:
 
         return query, payload
 
+    def iter_titles(self) -> Iterator[tuple[str, str]]:
+        """
+        Stream title and ID of every note, oldest first, straight
+        from the cursor, without loading them all in memory.
+
+        :return: iterator over tuples of (title, zk_id).
+        """
+        conn = sqlite3.connect(self.index)
+        try:
+            yield from conn.execute(_ITER_TITLES_STMT)
+        except sqlite3.OperationalError as e:
+            raise DBManagerException(
+                "Something went wrong. Have you tried indexing your notes first?"
+                f"\nError: {e}")
+        finally:
+            conn.close()
+
+    def get_metadata_many(
+            self, zk_ids: Collection[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get the metadata of many notes at once.
+
+        :param zk_ids: IDs of the notes.
+        :return: mapping from note ID to its metadata, with the same
+                 keys `Zettelkasten.get_metadata` uses. Notes that are
+                 not in the index are missing.
+        """
+        zk_ids = list(zk_ids)
+        metadata: dict[str, dict[str, Any]] = {}
+        if not zk_ids:
+            return metadata
+
+        placeholders = ", ".join("?" * len(zk_ids))
+        try:
+            with sqlite3.connect(self.index) as conn:
+                for zk_id, title, author, creation, changed in conn.execute(
+                        "SELECT zk_id, title, author, creation_date, "
+                        "last_changed FROM zettelkasten "
+                        f"WHERE zk_id IN ({placeholders})", zk_ids):
+                    metadata[zk_id] = {
+                        'zk_id': zk_id,
+                        'title': title,
+                        'author': author,
+                        'creation_date': creation,
+                        'last_changed': changed,
+                        'tag': set(),
+                        'link': set()
+                    }
+                for table, column in [('tags', 'tag'), ('links', 'link')]:
+                    for zk_id, value in conn.execute(
+                            f"SELECT zk_id, {column} FROM {table} "
+                            f"WHERE zk_id IN ({placeholders})", zk_ids):
+                        if zk_id in metadata:
+                            metadata[zk_id][column].add(value)
+        except sqlite3.OperationalError as e:
+            raise DBManagerException(
+                "Something went wrong. Have you tried indexing your notes first?"
+                f"\nError: {e}")
+
+        return metadata
+
+    def title_exists(self,
+                     title: str,
+                     exclude: Optional[str | Collection[str]] = None) -> bool:
+        """
+        Check whether a note has a title, or one that links to it
+        would clash with, without reading every title.
+
+        :param title: the title.
+        :param exclude: ID of a note not to check, such as the note
+                        being renamed, or IDs of many notes.
+        """
+        if exclude is None:
+            exclude = []
+        elif isinstance(exclude, str):
+            exclude = [exclude]
+        placeholders = ", ".join("?" * len(exclude))
+        self.migrate()
+        results = self._fetch(_TITLE_EXISTS_STMT.format(placeholders),
+                              [title, sluggify(title), *exclude], None)
+
+        return bool(results[0][0])
+
+    def id_exists(self, zk_id: str) -> bool:
+        """
+        Check whether a note has an ID.
+
+        :param zk_id: the ID.
+        """
+        results = self._fetch(_ID_EXISTS_STMT, [zk_id], None)
+
+        return bool(results[0][0])
+
+    def match_id_prefix(self, prefix: str, limit: int = 2) -> list[str]:
+        """
+        Find the notes whose ID starts with a prefix, scanning a range
+        of the primary key.
+
+        :param prefix: the prefix.
+        :param limit: how many IDs to return at most.
+        :return: the IDs, in order. Only the ID itself if the prefix is
+                 a whole ID.
+        """
+        if self.id_exists(prefix):
+            return [prefix]
+        results = self._fetch(
+            _ID_RANGE_STMT,
+            [prefix + _PREFIX_START, prefix + _PREFIX_END, limit], None)
+
+        return [str(row[0]) for row in results]
+
+    def abbreviate_ids(self,
+                       zk_ids: list[str],
+                       length: int = ABBREV_LENGTH) -> dict[str, str]:
+        """
+        Abbreviate IDs to the shortest prefixes no other note shares.
+        Only the IDs sorting right before and after each one need
+        comparing.
+
+        :param zk_ids: the IDs.
+        :param length: shortest abbreviation.
+        :return: mapping from IDs to their abbreviations.
+        """
+        abbreviations = {}
+        try:
+            with sqlite3.connect(self.index) as conn:
+                for zk_id in zk_ids:
+                    shared = 0
+                    for stmt in (_PREVIOUS_ID_STMT, _NEXT_ID_STMT):
+                        row = conn.execute(stmt, (zk_id, )).fetchone()
+                        if row is not None:
+                            shared = max(shared,
+                                         _common_prefix(zk_id, str(row[0])))
+                    abbreviations[zk_id] = zk_id[:max(length, shared + 1)]
+        except sqlite3.OperationalError as e:
+            raise DBManagerException(
+                "Something went wrong. Have you tried indexing your notes first?"
+                f"\nError: {e}")
+
+        return abbreviations
+
+    def resolve_slug(self, slug: str) -> Optional[str]:
+        """
+        Find the note a link points to.
+
+        :param slug: the sluggified title of the note.
+        :return: ID of the note, the oldest one if titles clash, or None
+                 if there is none.
+        """
+        self.migrate()
+        results = self._fetch(_RESOLVE_SLUG_STMT, [slug], None)
+
+        return results[0][0] if results else None
+
+    def get_neighborhood(
+            self,
+            zk_id: str,
+            limit: int = NEIGHBORHOOD_LIMIT
+    ) -> dict[str, list[tuple[str, str]]]:
+        """
+        Get the notes linking to a note, and the notes two links away
+        from it in either direction, with a single query.
+
+        :param zk_id: ID of the note.
+        :param limit: how many notes two links away to get at most.
+        :return: mapping from 'incoming' and 'two_hop' to lists of
+                 (title, zk_id), sorted by title.
+        """
+        self.migrate()
+        neighborhood: dict[str, list[tuple[str, str]]] = {
+            'incoming': [],
+            'two_hop': []
+        }
+        try:
+            with sqlite3.connect(self.index) as conn:
+                for kind, title, note_id in conn.execute(
+                        _NEIGHBORHOOD_STMT, {
+                            'zk_id': zk_id,
+                            'limit': limit
+                        }):
+                    neighborhood[kind].append((title, note_id))
+        except sqlite3.OperationalError as e:
+            raise DBManagerException(
+                "Something went wrong. Have you tried indexing your notes first?"
+                f"\nError: {e}")
+        for notes in neighborhood.values():
+            notes.sort()
+
+        return neighborhood
+
+    def get_tags_by_note(self) -> dict[str, set[str]]:
+        """
+        Get the tags of every note that has any.
+
+        :return: mapping from note ID to its tags.
+        """
+        return self._get_by_note("SELECT zk_id, tag FROM tags")
+
+    def get_links_by_note(self) -> dict[str, set[str]]:
+        """
+        Get the links of every note that has any.
+
+        :return: mapping from note ID to its links.
+        """
+        return self._get_by_note("SELECT zk_id, link FROM links")
+
+    def _get_by_note(self, query: str) -> dict[str, set[str]]:
+        by_note: dict[str, set[str]] = {}
+        try:
+            with sqlite3.connect(self.index) as conn:
+                for zk_id, value in conn.execute(query):
+                    by_note.setdefault(zk_id, set()).add(value)
+        except sqlite3.OperationalError as e:
+            raise DBManagerException(
+                "Something went wrong. Have you tried indexing your notes first?"
+                f"\nError: {e}")
+
+        return by_note
+
     def get_title(self) -> list[str]:
         with sqlite3.connect(self.index) as conn:
             results = conn.execute("select title from zettelkasten").fetchall()
@@ -236,5 +774,31 @@ class DBManager:
         return results
 
 
+def _log2_add(a: float, b: float) -> float:
+    """
+    log2(2**a + 2**b), without computing the powers.
+    """
+    high, low = max(a, b), min(a, b)
+
+    return high + math.log2(1 + 2**(low - high))
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """
+    Length of the common prefix of two strings.
+    """
+    length = 0
+    for char_a, char_b in zip(a, b):
+        if char_a != char_b:
+            break
+        length += 1
+
+    return length
+
+
 class DBManagerException(Exception):
     """Errors related to the index database"""
+
+
+class DBManagerCancelled(DBManagerException):
+    """Raised when a running query is cancelled"""
@@ -1,22 +1,78 @@
 from __future__ import annotations
 
 from typing import Any, Optional
-from collections.abc import MutableMapping, Collection
+from collections.abc import Callable, Iterator, MutableMapping, Collection
 
 from dataclasses import dataclass, fields
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from glob import glob1
+from tempfile import NamedTemporaryFile, TemporaryDirectory, mkstemp
 from multiprocessing import Pool
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
-
-from appunti.zettelkasten.notes import Note
+from string import hexdigits
+import os
+
+from appunti.zettelkasten.notes import (Note, NoteRecord, NoteColumns,
+                                        NoteException, read_head)
+from appunti.parser.parser import (MmapParser, FrontmatterException,
+                                   BodyException)
+from appunti.zettelkasten.cache import NoteCache
 from appunti.wrappers.git_wrapper import Git, GitMixin
 from appunti.wrappers.editor_wrapper import Editor
-from appunti.zettelkasten.sql import DBManager
+from appunti.zettelkasten.sql import DBManager, DBManagerException
 from appunti.utils import ask_for_confirmation
 
 
+def _parse_record(note_obj: type[Note], scan_args: dict[str, Any],
+                  path: Path) -> NoteRecord:
+    """
+    Utility function for bulk reading. It reads the index-relevant
+    content of a note with `Note.scan`. It lives at module level
+    so that it can be sent to worker processes.
+
+    :param note_obj: the type of note.
+    :param scan_args: the arguments of scan shared by all the notes.
+    :param path: path to the note.
+    :return: the compact record of the note.
+    """
+    note = note_obj.scan(path, **scan_args)
+
+    return NoteRecord.from_note(note)
+
+
+def _scan_shard(shard: Path) -> list[str]:
+    """
+    Paths of the notes in a shard, relative to the vault.
+
+    :param shard: path to the shard.
+    """
+    with os.scandir(shard) as entries:
+        return [
+            os.path.join(shard.name, entry.name) for entry in entries
+            if entry.name.endswith(".md") and entry.is_file()
+        ]
+
+
+def _is_shard(name: str) -> bool:
+    return len(name) == SHARD_LENGTH and all(char in hexdigits
+                                             for char in name)
+
+
+# accesses that make a note the last one
+_LAST_ACTIONS = ('new', 'update')
+# errors of a note that can't be read back after editing. Missing
+# fields surface as KeyError and TypeError
+_EDITED_NOTE_ERRORS = (FrontmatterException, BodyException, NoteException,
+                       KeyError, TypeError)
+# values that bulk reads always parse, as records store them as dates
+_RECORD_SPECIAL_VALUES = ('date', 'last')
+# notes are kept in subdirectories named after the first characters
+# of their IDs, as git does with objects, when this file is in the vault
+SHARDED_MARKER = ".sharded"
+SHARD_LENGTH = 2
+
+
 # TODO: implement an abstract class for this.
 @dataclass
 class Zettelkasten(GitMixin):
@@ -31,6 +87,7 @@ class Zettelkasten(GitMixin):
     :param link_del: delimiter for links. Defaults to '("[[", "]]")'
     :param special_values: values of the frontmatter
                            that require special parsing.
+    :param cache_size: how many parsed notes to keep in memory.
     """
     vault: Path
     author: str
@@ -42,6 +99,7 @@ class Zettelkasten(GitMixin):
     header: str = "# "
     link_del: tuple[str, str] = ('[[', ']]')
     special_values: Collection[str] = ('date', 'last', 'tags')
+    cache_size: int = 128
 
     def __post_init__(self) -> None:
         self.vault = Path(self.vault).expanduser()
@@ -50,6 +108,8 @@ class Zettelkasten(GitMixin):
         self.dbmanager = DBManager(self.index)
         self.git = self._detect_git_repo(self.vault)
         self.tmp = self.vault / ".tmp"
+        self.sharded = (self.vault / SHARDED_MARKER).is_file()
+        self.note_cache = NoteCache(self.cache_size)
         self.header_obj = [
             note_field.name for note_field in fields(self.note_obj)
             if note_field.name not in ['links', 'body']
@@ -74,6 +134,7 @@ class Zettelkasten(GitMixin):
             header: str = "# ",
             link_del: tuple[str, str] = ('[[', ']]'),
             special_values: tuple[str, str] = ('date', 'tags'),
+            sharded: bool = False,
     ) -> Zettelkasten:
         """
         Initialize a new vault. A vault is made of a collection of
@@ -83,6 +144,7 @@ class Zettelkasten(GitMixin):
         :param path: path to the new vault.
         :param git_init: whether to initialize a git repo.
         :param force: whether to force initialization.
+        :param sharded: whether to keep notes in subdirectories by ID.
         :return: a new Zettelkasten object
         """
 
@@ -109,6 +171,9 @@ class Zettelkasten(GitMixin):
         tmp = path / '.tmp'
         tmp.mkdir(exist_ok=True)
 
+        if sharded:
+            (path / SHARDED_MARKER).touch()
+
         # create git repo
         if git_init:
             to_ignore = ['.last', '.tmp', '.index.db']
@@ -159,6 +224,20 @@ class Zettelkasten(GitMixin):
             raise ZettelkastenException(
                 f"'{self.vault}' must be initialized first.")
 
+    def record_access(self, zk_id: str, action: str) -> None:
+        """
+        Record in the access log of the index that a note was accessed,
+        updating its frecency.
+
+        :param zk_id: ID of the note.
+        :param action: what was done with the note: 'new', 'update',
+                       'open', 'print' or 'browse'.
+        """
+        self.dbmanager.record_access(zk_id, action)
+        # .last follows the log, for vaults whose index is rebuilt
+        if action in _LAST_ACTIONS:
+            self._add_last_opened(zk_id)
+
     def _add_last_opened(self, name: str | Path) -> None:
         """
         Add the last opened note to .last file
@@ -172,7 +251,8 @@ class Zettelkasten(GitMixin):
     def _edit_temporary_note(self,
                              note: Note,
                              confirmation: bool = False,
-                             strict: bool = False) -> Note | None:
+                             strict: bool = False,
+                             skip_unchanged: bool = False) -> Note | None:
         """
         Edit a note in a temporary file. The temporary file is created
         in the tmp so not to interfere with git. The temporary
@@ -180,8 +260,12 @@ class Zettelkasten(GitMixin):
 
         :param note: the note to edit.
         :param confirmation: whether to ask for confirmation.
-        :return: if confirmation=True and input was no,
-                 return None. Else the note.
+        :param skip_unchanged: whether to give up when the editor
+                               leaves the note as it was, without
+                               parsing it again.
+        :return: if confirmation=True and input was no, or if the note
+                 is unchanged and skip_unchanged=True, return None.
+                 Else the note.
         """
 
         # check if tmp dir exists. We are going to create the temporary
@@ -191,25 +275,63 @@ class Zettelkasten(GitMixin):
 
         with NamedTemporaryFile("w", dir=self.tmp, suffix=".md") as f:
             # write the note in the temporary file
-            f.write(note.materialize())
+            content = note.materialize()
+            f.write(content)
             f.seek(0)
 
             # edit the note
             editor = Editor(self.editor)
             editor.edit(f.name, cwd=self.vault)
 
+            # editors may replace the file, so read it by name
+            if skip_unchanged and Path(f.name).read_text() == content:
+                return None
+
             # TODO: consider whether opening two handles to same file is good
             # idea
-            # TODO: make read arguments less implementation dependent.
             # create the note from the new data
-            new_note = self.note_obj.read(path=f.name,
-                                          parsing_obj=self.header_obj,
-                                          delimiter=self.delimiter,
-                                          special_names=self.special_values,
-                                          header=self.header,
-                                          link_del=self.link_del,
-                                          strict=strict)
+            new_note = self._read_edited_note(Path(f.name), strict=strict)
+
+        new_note = self._check_edited_note(note, new_note, strict=strict)
 
+        # ask for confirmation
+        if confirmation and not ask_for_confirmation("Save note?"):
+            return None
+
+        # change access time
+        new_note.last = datetime.now()
+
+        return new_note
+
+    # TODO: make read arguments less implementation dependent.
+    def _read_edited_note(self, path: Path, strict: bool = False) -> Note:
+        """
+        Parse a note edited outside the vault.
+
+        :param path: path to the edited note.
+        """
+        return self.note_obj.read(path=path,
+                                  parsing_obj=self.header_obj,
+                                  delimiter=self.delimiter,
+                                  special_names=self.special_values,
+                                  header=self.header,
+                                  link_del=self.link_del,
+                                  strict=strict)
+
+    def _check_edited_note(self,
+                           note: Note,
+                           new_note: Note,
+                           strict: bool = False,
+                           exclude: Collection[str] = ()) -> Note:
+        """
+        Check an edited note against the original: its ID must not
+        change, and its title should not clash with other notes.
+
+        :param note: the note before editing.
+        :param new_note: the note after editing.
+        :param exclude: IDs of other notes whose title is not checked.
+        :return: the edited note, with its original ID.
+        """
         # if id was changed, raise an error.
         if new_note.zk_id != note.zk_id:
             if strict:
@@ -225,32 +347,75 @@ class Zettelkasten(GitMixin):
         if new_note.title != note.title:
             self._check_unique_title(new_note.title,
                                      strict=strict,
-                                     blocking=False)
-
-        # ask for confirmation
-        if confirmation and not ask_for_confirmation("Save note?"):
-            return None
-
-        # change access time
-        new_note.last = datetime.now()
+                                     blocking=False,
+                                     zk_id=note.zk_id,
+                                     exclude=exclude)
 
         return new_note
 
     def _check_unique_title(self,
                             note_title: str,
                             strict: bool = False,
-                            blocking: bool = False) -> None:
-        all_titles = [title[0] for title in self.dbmanager.get_title()]
-        if note_title in all_titles:
-            if strict:
-                raise TitleClashError("Title is already used in another note.")
-            else:
-                print("Title is already in use in another note. Please "
-                      "consider changing it to something different, as it may "
-                      "cause ambiguous links in your vault.")
-                if blocking:
-                    print("\nPress any key to continue ", end="")
-                    input()
+                            blocking: bool = False,
+                            zk_id: Optional[str] = None,
+                            exclude: Collection[str] = ()) -> None:
+        """
+        Warn about, or refuse, a title already used by another note,
+        or one that makes the same link.
+
+        :param zk_id: ID of the note the title is for, if it exists.
+        :param exclude: IDs of other notes whose title is not checked.
+        """
+        excluded = [*exclude] if zk_id is None else [zk_id, *exclude]
+        if self.dbmanager.title_exists(note_title, exclude=excluded):
+            self._title_clash(strict=strict, blocking=blocking)
+
+    def _check_unique_titles(self,
+                             notes: list[Note],
+                             strict: bool = False) -> None:
+        """
+        Warn about, or refuse, titles that clash among notes saved
+        together, or that make the same link. The index only knows the
+        titles they had before, so _check_unique_title must exclude
+        them.
+
+        :param notes: the notes.
+        """
+        seen: dict[tuple[str, str], str] = {}
+        for note in notes:
+            for key in [('title', note.title), ('slug', note.sluggify())]:
+                if seen.setdefault(key, note.zk_id) != note.zk_id:
+                    self._title_clash(strict=strict)
+                    return
+
+    @staticmethod
+    def _title_clash(strict: bool = False, blocking: bool = False) -> None:
+        """
+        Warn about, or refuse, a title already used by another note.
+        """
+        if strict:
+            raise TitleClashError("Title is already used in another note.")
+        else:
+            print("Title is already in use in another note. Please "
+                  "consider changing it to something different, as it may "
+                  "cause ambiguous links in your vault.")
+            if blocking:
+                print("\nPress any key to continue ", end="")
+                input()
+
+    def _keep_edited_note(self, path: Path) -> Path:
+        """
+        Move an edited note out of a temporary directory, so that the
+        changes are not lost when it's deleted.
+
+        :param path: path to the edited note.
+        :return: where the note was moved, in tmp.
+        """
+        fd, kept = mkstemp(dir=self.tmp, prefix=f"{path.stem}-", suffix=".md")
+        os.close(fd)
+        os.replace(path, kept)
+
+        return Path(kept)
 
     def _generate_hash_collision_free_note(self, note: Note) -> Note:
         """
@@ -258,8 +423,7 @@ class Zettelkasten(GitMixin):
         """
         zk_id = note.zk_id
         note_date = note.date
-        all_zk_ids = [zk_id[0] for zk_id in self.dbmanager.get_zk_id()]
-        while zk_id in all_zk_ids:
+        while self.dbmanager.id_exists(zk_id):
             zk_id = note._generate_id(note_date)
         note.zk_id = zk_id
 
@@ -295,17 +459,17 @@ class Zettelkasten(GitMixin):
         if new_note is None:
             return None
 
-        filename = Path(new_note.zk_id).with_suffix(".md")
-
-        note_path = self.vault / filename
+        note_path = self.note_path(new_note.zk_id)
         self.dbmanager.add_to_index(new_note)
 
         # save the new note
+        note_path.parent.mkdir(exist_ok=True)
         with open(note_path, "w") as f:
             f.write(new_note.materialize())
+        self.note_cache.invalidate(note_path)
 
-        # update .last file
-        self._add_last_opened(filename)
+        # log the access
+        self.record_access(new_note.zk_id, 'new')
 
         # add and commit
         self.commit_and_sync(msg=f'Commit "{new_note.zk_id}"',
@@ -317,12 +481,16 @@ class Zettelkasten(GitMixin):
     def update(self,
                zk_id: str,
                confirmation: bool = False,
-               strict: bool = False) -> None:
+               strict: bool = False,
+               skip_unchanged: bool = True) -> bool:
         """
         Update the note corresponding to the provded ID.
 
         :param zk_id: the ID of the note.
         :param confirmation: whether to ask for confirmation to save the note.
+        :param skip_unchanged: whether to leave note, index and repo
+                               alone when the note wasn't changed.
+        :return: whether the note was saved.
         """
 
         # check if vault is a zettelkasten
@@ -332,38 +500,146 @@ class Zettelkasten(GitMixin):
             raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
 
         # read the note
-        filename = Path(zk_id).with_suffix(".md")
-        note_path = self.vault / filename
-        note = self.note_obj.read(path=note_path,
-                                  parsing_obj=self.header_obj,
-                                  delimiter=self.delimiter,
-                                  special_names=self.special_values,
-                                  header=self.header,
-                                  link_del=self.link_del,
-                                  strict=strict,
-                                  quiet=True)
+        note_path = self.note_path(zk_id)
+        note = self.read_note(zk_id, strict=strict, quiet=True)
 
         new_note = self._edit_temporary_note(note,
                                              confirmation=confirmation,
-                                             strict=strict)
+                                             strict=strict,
+                                             skip_unchanged=skip_unchanged)
         if new_note is None:
-            return None
+            return False
 
         # save the new note
         with open(note_path, "w") as f:
             f.write(new_note.materialize())
+        self.note_cache.invalidate(note_path)
 
         # update the index
         self.dbmanager.update_note_to_index(new_note)
 
-        # update .last file
-        self._add_last_opened(filename)
+        # log the access
+        self.record_access(new_note.zk_id, 'update')
 
         # add and commit
         self.commit_and_sync(msg=f'Updated "{new_note.zk_id}"',
                              commit=self.autocommit,
                              push=self.autosync)
 
+        return True
+
+    def update_many(self,
+                    zk_ids: list[str],
+                    confirmation: bool = False,
+                    strict: bool = False) -> int:
+        """
+        Update many notes in a single editor session. Only the notes
+        that were changed are parsed again and saved: their index is
+        updated in one transaction, and they're committed together.
+
+        Notes that can't be read back are skipped, and their edited
+        file is kept in tmp. If the notes can't be saved with
+        strict=True, all the edited files are kept.
+
+        :param zk_ids: the IDs of the notes.
+        :param confirmation: whether to ask for confirmation to save the notes.
+        :return: how many notes were saved.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+        zk_ids = list(dict.fromkeys(zk_ids))
+        # check that the notes exist
+        for zk_id in zk_ids:
+            if not self._note_exists(zk_id):
+                raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
+
+        notes = [
+            self.read_note(zk_id, strict=strict, quiet=True)
+            for zk_id in zk_ids
+        ]
+
+        self.tmp.mkdir(exist_ok=True)
+        with TemporaryDirectory(dir=self.tmp) as tmp_dir:
+            # temporary files are named after the notes, to tell them
+            # apart in the editor
+            paths = [
+                Path(tmp_dir) / Path(note.zk_id).with_suffix(".md")
+                for note in notes
+            ]
+            contents = [note.materialize() for note in notes]
+            for path, content in zip(paths, contents):
+                path.write_text(content)
+
+            editor = Editor(self.editor)
+            editor.multiple_edit(list(paths), cwd=self.vault)
+
+            changed = [
+                index for index, (path, content) in enumerate(
+                    zip(paths, contents)) if path.read_text() != content
+            ]
+            if not changed:
+                return 0
+
+            edited = []
+            for index in changed:
+                try:
+                    new_note = self._read_edited_note(paths[index],
+                                                      strict=strict)
+                except _EDITED_NOTE_ERRORS as e:
+                    kept = self._keep_edited_note(paths[index])
+                    print(f"Note '{notes[index].zk_id}' has been "
+                          f"skipped, your changes are in '{kept}': {e}")
+                    continue
+                edited.append((notes[index], new_note))
+
+            # the notes saved together are checked against each other,
+            # and not against the titles they had before
+            saved = [note.zk_id for note, _ in edited]
+            try:
+                new_notes = [
+                    self._check_edited_note(note,
+                                            new_note,
+                                            strict=strict,
+                                            exclude=saved)
+                    for note, new_note in edited
+                ]
+                self._check_unique_titles(new_notes, strict=strict)
+            except ZettelkastenException:
+                for index in changed:
+                    if paths[index].exists():
+                        kept = self._keep_edited_note(paths[index])
+                        print(f"Your changes to note '{notes[index].zk_id}' "
+                              f"are in '{kept}'.")
+                raise
+
+        # ask for confirmation
+        if not new_notes or confirmation and not ask_for_confirmation(
+                f"Save {len(new_notes)} notes?"):
+            return 0
+
+        # save the new notes
+        now = datetime.now()
+        for new_note in new_notes:
+            new_note.last = now
+            note_path = self.note_path(new_note.zk_id)
+            with open(note_path, "w") as f:
+                f.write(new_note.materialize())
+            self.note_cache.invalidate(note_path)
+
+        # update the index
+        self.dbmanager.update_many_to_index(new_notes)
+
+        # log the accesses
+        for new_note in new_notes:
+            self.record_access(new_note.zk_id, 'update')
+
+        # add and commit
+        self.commit_and_sync(msg=f'Updated {len(new_notes)} notes',
+                             commit=self.autocommit,
+                             push=self.autosync)
+
+        return len(new_notes)
+
     def open(self, zk_id: list[str]) -> None:
         # check if vault is a zettelkasten
         self._check_zettelkasten()
@@ -374,11 +650,14 @@ class Zettelkasten(GitMixin):
             if not self._note_exists(id):
                 raise ZettelkastenException(f"Note '{id}' does not exist.")
 
-            filenames.append(Path(str(id)).with_suffix(".md"))
+            filenames.append(self.note_path(str(id)).relative_to(self.vault))
 
         editor = Editor(self.editor)
         editor.multiple_edit(filenames, self.vault)
 
+        for id in set(zk_id):
+            self.record_access(id, 'open')
+
     def delete(self, zk_id: str, confirmation: bool = False) -> None:
         """
         Delete a note.
@@ -393,8 +672,7 @@ class Zettelkasten(GitMixin):
         if not self._note_exists(zk_id):
             raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
 
-        filename = Path(zk_id).with_suffix(".md")
-        note_path = self.vault / filename
+        note_path = self.note_path(zk_id)
 
         # ask for confirmation
         if confirmation and not ask_for_confirmation("Delete note?"):
@@ -405,6 +683,7 @@ class Zettelkasten(GitMixin):
 
         # remove note
         note_path.unlink(missing_ok=True)
+        self.note_cache.invalidate(note_path)
 
         # add and commit
         self.commit_and_sync(msg=f'Removed note "{zk_id}"',
@@ -422,8 +701,7 @@ class Zettelkasten(GitMixin):
             print(f"Note '{zk_id}' does not exist.")
             return 0
 
-        filename = Path(zk_id).with_suffix(".md")
-        note_path = self.vault / filename
+        note_path = self.note_path(zk_id)
 
         # remove from index
         self.dbmanager.delete_from_index(zk_id)
@@ -452,6 +730,9 @@ class Zettelkasten(GitMixin):
         # delete in parallel
         with Pool() as executor:
             no_deleted_files = executor.map(self._delete_single_note, zk_ids)
+        # notes are deleted in other processes
+        for zk_id in zk_ids:
+            self.note_cache.invalidate(self.note_path(zk_id))
 
         # add and commit
         self.commit_and_sync(msg='Removed batch of notes',
@@ -471,9 +752,20 @@ class Zettelkasten(GitMixin):
             # access_date: Optional[list[str]] = None,
             sort_by: Optional[str] = None,
             descending: bool = True,
-            show: list[str] = ['title', 'zk_id']) -> list[tuple[str, ...]]:
+            show: list[str] = ['title', 'zk_id'],
+            cancelled: Optional[Callable[[], bool]] = None,
+            limit: Optional[int] = None,
+            offset: int = 0) -> list[tuple[str, ...]]:
         """
         List and filter based on tags, links and date
+
+        :param sort_by: column to sort on, or 'frecency' to put the
+                        notes accessed most often and most recently
+                        first when descending.
+        :param cancelled: function called periodically while the query
+                          runs. If it returns True the query is aborted.
+        :param limit: maximum number of notes to return.
+        :param offset: how many notes to skip.
         """
         # check if vault is a zettelkasten
         self._check_zettelkasten()
@@ -487,21 +779,186 @@ class Zettelkasten(GitMixin):
             # access_date,
             sort_by,
             descending,
-            show)
+            show,
+            cancelled,
+            limit,
+            offset)
 
         return results
 
-    def _note_exists(self, zk_id: str) -> bool:
+    def count_notes(self,
+                    title: Optional[list[str]] = None,
+                    zk_id: Optional[list[str]] = None,
+                    author: Optional[list[str]] = None,
+                    tags: Optional[list[str]] = None,
+                    links: Optional[list[str]] = None,
+                    cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count the notes `list_notes` would return with these filters.
+
+        :param cancelled: function called periodically while the query
+                          runs. If it returns True the query is aborted.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+        count = self.dbmanager.count_notes(title, zk_id, author, tags, links,
+                                           cancelled)
+
+        return count
+
+    def iter_titles(self) -> Iterator[tuple[str, str]]:
+        """
+        Stream title and ID of every note from the index, oldest first.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        return self.dbmanager.iter_titles()
+
+    def _layout_path(self, zk_id: str, sharded: bool) -> Path:
         filename = Path(zk_id).with_suffix(".md")
-        path = self.vault / filename
+        if sharded:
+            return self.vault / zk_id[:SHARD_LENGTH] / filename
+
+        return self.vault / filename
+
+    def note_path(self, zk_id: str) -> Path:
+        """
+        Path of the note with the corresponding ID. Notes are looked
+        for in the other layout too, so that notes pulled from a clone
+        that wasn't migrated yet are still found.
+
+        :param zk_id: ID of the note.
+        :return: the path, in the layout of the vault if the note
+                 doesn't exist.
+        """
+        path = self._layout_path(zk_id, self.sharded)
+        if not path.is_file():
+            other = self._layout_path(zk_id, not self.sharded)
+            if other.is_file():
+                return other
+
+        return path
+
+    def _note_exists(self, zk_id: str) -> bool:
+        return self.note_path(zk_id).is_file()
+
+    def notes_paths(self) -> list[str]:
+        """
+        Paths of all the notes, relative to the vault. Notes in the
+        root and in every shard are listed, whatever the layout.
+        Shards are scanned in parallel.
+        """
+        paths = []
+        shards = []
+        with os.scandir(self.vault) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and entry.is_file():
+                    paths.append(entry.name)
+                elif _is_shard(entry.name) and entry.is_dir():
+                    shards.append(self.vault / entry.name)
+
+        if shards:
+            with ThreadPoolExecutor() as executor:
+                for shard_paths in executor.map(_scan_shard, shards):
+                    paths += shard_paths
+
+        return paths
+
+    def migrate_layout(self, sharded: bool = True) -> int:
+        """
+        Move every note to the sharded layout, or back to the root of
+        the vault. The index only knows IDs, so it stays valid.
+
+        :param sharded: whether to shard the notes.
+        :return: how many notes were moved.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        moved = 0
+        for note_path in self.notes_paths():
+            source = self.vault / note_path
+            target = self._layout_path(source.stem, sharded)
+            if source == target:
+                continue
+            target.parent.mkdir(exist_ok=True)
+            source.replace(target)
+            moved += 1
+
+        marker = self.vault / SHARDED_MARKER
+        if sharded:
+            marker.touch()
+        else:
+            marker.unlink(missing_ok=True)
+            for shard in os.scandir(self.vault):
+                if _is_shard(shard.name) and shard.is_dir():
+                    try:
+                        os.rmdir(shard.path)
+                    except OSError:
+                        # something else lives there
+                        pass
+        self.sharded = sharded
+        # cached notes are keyed by path
+        self.note_cache.clear()
+
+        # add and commit
+        layout = "sharded" if sharded else "flat"
+        self.commit_and_sync(msg=f'Moved notes to the {layout} layout',
+                             commit=self.autocommit,
+                             push=self.autosync)
+
+        return moved
+
+    def read_note(self,
+                  zk_id: str,
+                  strict: bool = False,
+                  quiet: bool = True) -> Note:
+        """
+        Read the note with the corresponding ID, going through the cache
+        of parsed notes. A cached note was parsed without checks, so
+        the note is parsed again when they're asked for.
+
+        :param zk_id: ID of the note.
+        :param strict: whether a failed check raises an error.
+        :param quiet: whether to skip checking that first header and
+                      title coincide.
+        :return: a copy of the parsed note, safe to modify.
+        """
+        note_path = self.note_path(zk_id)
 
-        return path.is_file()
+        def load(path: Path) -> Note:
+            return self.note_obj.read(path=path,
+                                      parsing_obj=self.header_obj,
+                                      delimiter=self.delimiter,
+                                      special_names=self.special_values,
+                                      header=self.header,
+                                      link_del=self.link_del,
+                                      strict=strict,
+                                      quiet=quiet)
+
+        return self.note_cache.get(note_path, load, refresh=not quiet)
+
+    def read_head(self, zk_id: str, lines: int = 10) -> list[str]:
+        """
+        Read the first lines of the body of the note with the
+        corresponding ID, without parsing the whole note.
+
+        :param zk_id: ID of the note.
+        :param lines: how many lines to read.
+        """
+        note_path = self.note_path(zk_id)
 
-    def print_note(self, zk_id: str) -> str:
+        return read_head(note_path, self.delimiter, lines)
+
+    def print_note(self, zk_id: str, record: bool = True) -> str:
         """
         Print the content of the note with the corresponding ID.
 
         :param zk_id: ID of the note.
+        :param record: whether to log the access. Previews shouldn't,
+                       or they would inflate the frecency of every note
+                       they go through.
         :return: content of the note.
         """
         # check if vault is a zettelkasten
@@ -510,16 +967,11 @@ class Zettelkasten(GitMixin):
         if not self._note_exists(zk_id):
             raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
 
-        filename = Path(zk_id).with_suffix(".md")
-        note_path = self.vault / filename
-        note = self.note_obj.read(path=note_path,
-                                  parsing_obj=self.header_obj,
-                                  delimiter=self.delimiter,
-                                  special_names=self.special_values,
-                                  header=self.header,
-                                  link_del=self.link_del)
+        note = self.read_note(zk_id, quiet=False)
 
         content = note.materialize()
+        if record:
+            self.record_access(zk_id, 'print')
 
         return content
 
@@ -530,40 +982,105 @@ class Zettelkasten(GitMixin):
         """
         # check if vault is a zettelkasten
         self._check_zettelkasten()
-        notes_paths: list[str] = glob1(str(self.vault), "*.md")
+        notes_paths = self.notes_paths()
         # drop the tables
         self.dbmanager.drop_tables()
         # create new tables
         self.dbmanager.create_tables()
 
-        # index all the notes
-        for note_path in notes_paths:
-            full_path = self.vault / note_path
-            note = self.note_obj.read(path=full_path,
-                                      parsing_obj=self.header_obj,
-                                      delimiter=self.delimiter,
-                                      special_names=self.special_values,
-                                      header=self.header,
-                                      link_del=self.link_del)
-            self.dbmanager.add_to_index(note)
+        # index all the notes. Only index-relevant fields are read.
+        self.dbmanager.add_many_to_index(
+            self.read_many(notes_paths, quiet=False))
 
-    def _read_note(self, note_path: str) -> Note:
+    def _bulk_scan_args(self, quiet: bool = True) -> dict[str, Any]:
         """
-        Utility function for multi core vault reindexing.
-        It reads the content of a note given its path.
+        Arguments of `Note.scan` shared by all the notes read in a
+        bulk operation, parser included. Dates are parsed even when
+        they're not in special_values.
 
-        :param note_path: path to the note to read.
-        :return: the note object.
+        :param quiet: whether to skip checking that first header and
+                      title coincide.
         """
-        full_path = self.vault / note_path
-        note = self.note_obj.read(path=full_path,
-                                  parsing_obj=self.header_obj,
-                                  delimiter=self.delimiter,
-                                  special_names=self.special_values,
-                                  header=self.header,
-                                  link_del=self.link_del)
+        special_names = tuple(
+            dict.fromkeys([*self.special_values, *_RECORD_SPECIAL_VALUES]))
+        parser = MmapParser(parsing_obj=self.header_obj,
+                            delimiter=self.delimiter,
+                            special_names=special_names,
+                            header1=self.header,
+                            link_del=self.link_del)
+        scan_args = {
+            'parsing_obj': self.header_obj,
+            'delimiter': self.delimiter,
+            'special_names': special_names,
+            'header': self.header,
+            'link_del': self.link_del,
+            'quiet': quiet,
+            'parser': parser
+        }
 
-        return note
+        return scan_args
+
+    def scan_notes(self,
+                   notes_paths: Optional[list[str]] = None,
+                   quiet: bool = True) -> list[NoteRecord]:
+        """
+        Read the index-relevant content of many notes, as compact
+        records. Use `NoteRecord.to_note` to get full notes back.
+
+        :param notes_paths: paths of the notes, relative to the vault.
+                            Defaults to all the notes in the vault.
+        :param quiet: whether to skip checking that first header and
+                      title coincide.
+        :return: the records of the notes.
+        """
+        if notes_paths is None:
+            notes_paths = self.notes_paths()
+
+        scan_args = self._bulk_scan_args(quiet=quiet)
+        records = [
+            _parse_record(self.note_obj, scan_args, self.vault / note_path)
+            for note_path in notes_paths
+        ]
+
+        return records
+
+    def read_many(self,
+                  notes_paths: Optional[list[str]] = None,
+                  workers: int = 1,
+                  processes: bool = False,
+                  quiet: bool = True) -> NoteColumns:
+        """
+        Read the index-relevant content of many notes with a single
+        parser configuration, optionally in parallel.
+
+        :param notes_paths: paths of the notes, relative to the vault.
+                            Defaults to all the notes in the vault.
+        :param workers: how many notes to parse concurrently.
+        :param processes: whether to use processes instead of threads.
+        :param quiet: whether to skip checking that first header and
+                      title coincide. Reindexing the vault always
+                      checks it.
+        :return: the notes in columnar form, in the order of the paths.
+        """
+        if notes_paths is None:
+            notes_paths = self.notes_paths()
+
+        full_paths = [self.vault / note_path for note_path in notes_paths]
+        parse = partial(_parse_record, self.note_obj,
+                        self._bulk_scan_args(quiet=quiet))
+
+        if workers <= 1:
+            return NoteColumns.from_records(map(parse, full_paths))
+
+        executor_type = ProcessPoolExecutor if processes \
+            else ThreadPoolExecutor
+        chunksize = max(1, len(full_paths) // (workers * 4))
+        with executor_type(max_workers=workers) as executor:
+            # chunksize is ignored by thread pools
+            records = executor.map(parse, full_paths, chunksize=chunksize)
+            columns = NoteColumns.from_records(records)
+
+        return columns
 
     def multiprocess_index_vault(self) -> None:
         """
@@ -572,28 +1089,32 @@ class Zettelkasten(GitMixin):
         """
         # check if vault is a zettelkasten
         self._check_zettelkasten()
-        notes_paths: list[str] = glob1(str(self.vault), "*.md")
+        notes_paths = self.notes_paths()
         # drop the tables
         self.dbmanager.drop_tables()
         # create new tables
         self.dbmanager.create_tables()
 
-        with Pool() as executor:
-            notes = executor.map(self._read_note, notes_paths)
-
-        for note in notes:
-            self.dbmanager.add_to_index(note)
+        columns = self.read_many(notes_paths,
+                                 workers=os.cpu_count() or 1,
+                                 processes=True,
+                                 quiet=False)
+        self.dbmanager.add_many_to_index(columns)
 
     def get_last(self) -> str:
         """
-        Get ID of the last note as saved in .last.
+        Get ID of the last note created or updated, from the access
+        log. Vaults that don't have any yet fall back to .last.
 
-        :return: ID saved in .last
+        :return: ID of the last note.
         """
 
         # check if vault is a zettelkasten
         self._check_zettelkasten()
 
+        if (last := self.dbmanager.get_last_access(_LAST_ACTIONS)) is not None:
+            return last
+
         if not self.last.is_file():
             raise ZettelkastenException(".last file not found")
 
@@ -629,19 +1150,10 @@ class Zettelkasten(GitMixin):
                 raise ZettelkastenException(f"Note '{zk_id}' does not exist.")
 
         # read the previous notes
-        filenames = [Path(zk_id).with_suffix(".md") for zk_id in zk_ids]
-        notes = []
-        for filename in filenames:
-            note_path = self.vault / filename
-            note = self.note_obj.read(path=note_path,
-                                      parsing_obj=self.header_obj,
-                                      delimiter=self.delimiter,
-                                      special_names=self.special_values,
-                                      header=self.header,
-                                      link_del=self.link_del,
-                                      strict=strict,
-                                      quiet=True)
-            notes.append(note)
+        notes = [
+            self.read_note(zk_id, strict=strict, quiet=True)
+            for zk_id in zk_ids
+        ]
 
         # get links and other metadata
         links: set[str] = set()
@@ -664,19 +1176,18 @@ class Zettelkasten(GitMixin):
         if new_note is None:
             return None
 
-        new_filename = Path(new_note.zk_id).with_suffix(".md")
-
-        new_note_path = self.vault / new_filename
+        new_note_path = self.note_path(new_note.zk_id)
         self.dbmanager.add_to_index(new_note)
 
         # save the new note
+        new_note_path.parent.mkdir(exist_ok=True)
         with open(new_note_path, "w") as f:
             f.write(new_note.materialize())
+        self.note_cache.invalidate(new_note_path)
 
         # add link to new note to the body of old note
         for note in notes:
-            filename = Path(note.zk_id).with_suffix(".md")
-            note_path = self.vault / filename
+            note_path = self.note_path(note.zk_id)
             note.body += "\n\nNext -> " + f"[[{new_note.sluggify()}]]"
             note.links = list(note.links)
             note.links.append(new_note.sluggify())
@@ -685,12 +1196,13 @@ class Zettelkasten(GitMixin):
             # save the modified note
             with open(note_path, "w") as f:
                 f.write(note.materialize())
+            self.note_cache.invalidate(note_path)
 
             # add to index the modified old note
             self.dbmanager.update_note_to_index(note)
 
-        # update .last file
-        self._add_last_opened(new_filename)
+        # log the access
+        self.record_access(new_note.zk_id, 'new')
 
         # add and commit
         self.commit_and_sync(msg=f'Commit "{new_note.zk_id}" continuing '
@@ -723,6 +1235,82 @@ class Zettelkasten(GitMixin):
 
         return metadata
 
+    def get_metadata_many(
+            self, zk_ids: Collection[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get the metadata of many notes with a single visit to the index.
+
+        :param zk_ids: IDs of the notes.
+        :return: mapping from note ID to its metadata. Notes that are
+                 not in the index are missing.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        return self.dbmanager.get_metadata_many(zk_ids)
+
+    def resolve_id(self, zk_id: str) -> str:
+        """
+        Find the note an abbreviated ID points to, the way git finds
+        commits.
+
+        :param zk_id: the ID, or a prefix of it.
+        :return: the whole ID. IDs no note starts with, or every ID if
+                 the vault is not indexed, are returned unchanged.
+        :raises AmbiguousIDError: if more than one note starts with it.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+        try:
+            matches = self.dbmanager.match_id_prefix(zk_id)
+        except DBManagerException:
+            return zk_id
+        if len(matches) > 1:
+            raise AmbiguousIDError(
+                f"ID '{zk_id}' is ambiguous: more than one note starts "
+                "with it.")
+
+        return matches[0] if matches else zk_id
+
+    def abbreviate_ids(self, zk_ids: list[str]) -> dict[str, str]:
+        """
+        Abbreviate IDs to the shortest prefixes that resolve to them.
+
+        :param zk_ids: the IDs.
+        :return: mapping from IDs to their abbreviations.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        return self.dbmanager.abbreviate_ids(zk_ids)
+
+    def resolve_link(self, link: str) -> Optional[str]:
+        """
+        Find the note a link points to.
+
+        :param link: the link, as the sluggified title of the note.
+        :return: ID of the note, or None if no note has that title.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        return self.dbmanager.resolve_slug(link)
+
+    def get_neighborhood(self,
+                         zk_id: str) -> dict[str, list[tuple[str, str]]]:
+        """
+        Get the notes linking to a note (its backlinks), and the notes
+        two links away from it in either direction.
+
+        :param zk_id: ID of the note.
+        :return: mapping from 'incoming' and 'two_hop' to lists of
+                 (title, zk_id), sorted by title.
+        """
+        # check if vault is a zettelkasten
+        self._check_zettelkasten()
+
+        return self.dbmanager.get_neighborhood(zk_id)
+
 
 class ZettelkastenException(Exception):
     """Main exception raised by Zettelkasten"""
@@ -738,3 +1326,7 @@ class TitleClashError(ZettelkastenException):
 
 class VaultError(ZettelkastenException):
     pass
+
+
+class AmbiguousIDError(ZettelkastenException):
+    pass
@@ -0,0 +1,48 @@
+"""
+Latency benchmark for the fuzzy matcher.
+
+Types a few queries one character at a time against an index of
+random titles, and reports how long ranking the best matches takes
+after every keystroke.
+
+Run with `python -m benchmarks.bench_fuzzy`.
+"""
+import random
+import time
+from string import ascii_lowercase
+
+from appunti.cli.fuzzy import FuzzyIndex
+
+_TITLES = 100_000
+_RESULTS = 50
+_QUERIES = ["zettel", "note", "abcd", "method"]
+
+
+def _title() -> str:
+    words = ("".join(random.choices(ascii_lowercase, k=random.randint(3, 9)))
+             for _ in range(random.randint(2, 6)))
+
+    return " ".join(words).capitalize()
+
+
+def main() -> None:
+    random.seed(0)
+    rows = [(_title(), str(index)) for index in range(_TITLES)]
+
+    start = time.perf_counter()
+    index = FuzzyIndex(rows)
+    print(f"titles:  {_TITLES}")
+    print(f"load:    {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    for query in _QUERIES:
+        timings = []
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            index.search(query[:end], limit=_RESULTS)
+            timings.append((time.perf_counter() - start) * 1000)
+        keystrokes = " ".join(f"{timing:5.1f}" for timing in timings)
+        print(f"{query:8} {keystrokes} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for the body parser on large notes.
+
+Compares the single pass BodyParser against the previous implementation,
+which recompiled its regexes on every line, scanned every line three
+times and sluggified links one character at a time.
+
+Run with `python -m benchmarks.bench_parser`.
+"""
+import io
+import random
+import re
+import timeit
+from string import ascii_lowercase, punctuation
+
+from appunti.parser.parser import BodyParser
+
+_LINES = 20_000
+_REPEAT = 5
+
+
+def _legacy_sluggify(title: str) -> str:
+    clean_title = "".join(list(map(lambda x: x
+                                   if x not in punctuation or x == "-"
+                                   else "", title)))
+    return clean_title.lower().replace(" ", "-")
+
+
+def _legacy_parse(handle: io.StringIO) -> dict[str, object]:
+    """
+    Body parsing as it was done before the single pass tokenizer.
+    """
+    headers, links, next, body = [], [], [], []
+    context = False
+    for line in handle:
+        clean_line = line.rstrip()
+        body.append(clean_line)
+        if clean_line != "" and not clean_line.startswith("# ") \
+                and not context:
+            raise ValueError("The body needs to start with a title")
+        elif clean_line.startswith("# ") and not context:
+            context = True
+        if clean_line.startswith("# "):
+            headers.append(clean_line)
+            continue
+        pattern = re.compile(f"{re.escape('[[')}.*?{re.escape(']]')}")
+        line_links = set(
+            _legacy_sluggify(link) for link in [
+                link.removeprefix('[[').removesuffix(']]')
+                for link in pattern.findall(clean_line)
+            ] if link != "")
+        next_pattern = re.compile(
+            f"^Next -> {re.escape('[[')}.*?{re.escape(']]')}$")
+        if next_pattern.match(clean_line):
+            next.extend(line_links)
+        links.extend(line_links)
+
+    return {'header': headers, 'links': set(links), 'next': set(next),
+            'body': body}
+
+
+def _make_body(lines: int) -> str:
+    """
+    Generate the body of a large note, with headers, plain
+    text, links and next links.
+    """
+    random.seed(0)
+    words = ["".join(random.choices(ascii_lowercase, k=6)) for _ in range(500)]
+    body = ["# A very large note", ""]
+    for index in range(lines):
+        sentence = " ".join(random.choices(words, k=12))
+        if index % 50 == 0:
+            body.append(f"# {sentence.title()}")
+        elif index % 7 == 0:
+            body.append(f"{sentence} [[{random.choice(words)} Link!]] and "
+                        f"[[{random.choice(words)}]].")
+        elif index % 997 == 0:
+            body.append(f"Next -> [[{random.choice(words)}]]")
+        else:
+            body.append(sentence)
+
+    return "\n".join(body) + "\n"
+
+
+def main() -> None:
+    text = _make_body(_LINES)
+    parser = BodyParser()
+
+    new_result, _ = parser.parse(handle=io.StringIO(text))
+    old_result = _legacy_parse(io.StringIO(text))
+    assert new_result == old_result, "parsers disagree"
+
+    old = min(timeit.repeat(lambda: _legacy_parse(io.StringIO(text)),
+                            number=1, repeat=_REPEAT))
+    new = min(timeit.repeat(lambda: parser.parse(handle=io.StringIO(text)),
+                            number=1, repeat=_REPEAT))
+
+    size = len(text.encode()) / 2**20
+    print(f"note size:        {size:.2f} MiB, {_LINES} lines")
+    print(f"previous parser:  {old * 1000:8.2f} ms ({size / old:6.1f} MiB/s)")
+    print(f"single pass:      {new * 1000:8.2f} ms ({size / new:6.1f} MiB/s)")
+    print(f"speedup:          {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
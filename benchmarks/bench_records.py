@@ -0,0 +1,69 @@
+"""
+Memory benchmark for the compact note records.
+
+Compares the per-note memory of `Note` objects, as returned by
+`Note.scan`, and of the `NoteRecord` objects returned by the bulk APIs.
+
+Run with `python -m benchmarks.bench_records`.
+"""
+import random
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from string import ascii_lowercase
+from typing import Any
+
+from appunti.zettelkasten.notes import Note, NoteRecord
+
+_NOTES = 20_000
+_TAGS = [f"tag_{index}" for index in range(100)]
+_SLUGS = [f"note-number-{index}" for index in range(2_000)]
+
+
+def _parsed_note(index: int) -> Note:
+    """
+    Build a note like the parser does: every note gets its own
+    copies of tag and link strings.
+    """
+    date = datetime(2023, 1, 1, 12, 0, index % 60)
+    title = f"Note {index} " + "".join(random.choices(ascii_lowercase, k=20))
+    note = Note(title=title,
+                author="".join(["Anony", "mous"]),
+                date=date,
+                last=date,
+                zk_id=Note._generate_id(date),
+                tags=set("".join(tag) for tag in random.sample(_TAGS, 4)),
+                links=set("".join(slug) for slug in random.sample(_SLUGS, 8)),
+                next=set(),
+                body=None)  # type: ignore[arg-type]
+
+    return note
+
+
+def _measure(build: Callable[[int], Any]) -> float:
+    """
+    Return the average memory retained per object.
+    """
+    random.seed(0)
+    tracemalloc.start()
+    objects = [build(index) for index in range(_NOTES)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return current / _NOTES
+
+
+def main() -> None:
+    note_size = _measure(_parsed_note)
+    record_size = _measure(
+        lambda index: NoteRecord.from_note(_parsed_note(index)))
+
+    print(f"notes:       {_NOTES}, 4 tags and 8 links each")
+    print(f"Note:        {note_size:8.0f} B per note")
+    print(f"NoteRecord:  {record_size:8.0f} B per note")
+    print(f"reduction:   {1 - record_size / note_size:8.2%}")
+
+
+if __name__ == "__main__":
+    main()
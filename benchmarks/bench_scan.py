@@ -0,0 +1,62 @@
+"""
+Allocation benchmark for the indexing read mode.
+
+Compares the memory allocated while reading a batch of notes with
+`Note.read`, which keeps the whole body, and with `Note.scan`, which
+only keeps index-relevant fields.
+
+Run with `python -m benchmarks.bench_scan`.
+"""
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from appunti.zettelkasten.notes import Note
+
+_NOTES = 500
+_BODY_LINES = 400
+
+
+def _write_vault(vault: Path) -> list[Path]:
+    paths = []
+    for index in range(_NOTES):
+        note = Note.new(f"Note number {index}", "Anonymous")
+        note.body += "\n" + "\n".join(
+            f"line {line} of the body, linking [[note-number-{line}]]"
+            if line % 20 == 0 else f"line {line} of the body, no links here"
+            for line in range(_BODY_LINES))
+        path = vault / f"{note.zk_id}.md"
+        path.write_text(note.materialize())
+        paths.append(path)
+
+    return paths
+
+
+def _measure(reader: Callable[[Path], Note], paths: list[Path]) -> int:
+    """
+    Return the memory still allocated after reading all the notes.
+    """
+    tracemalloc.start()
+    notes = [reader(path) for path in paths]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del notes
+
+    return current
+
+
+def main() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        paths = _write_vault(Path(tmp_dir))
+        read = _measure(Note.read, paths)
+        scan = _measure(Note.scan, paths)
+
+    print(f"notes:      {_NOTES}, {_BODY_LINES} body lines each")
+    print(f"Note.read:  {read / 2**20:8.2f} MiB retained")
+    print(f"Note.scan:  {scan / 2**20:8.2f} MiB retained")
+    print(f"ratio:      {scan / read:8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from appunti.zettelkasten.cache import NoteCache
+from appunti.zettelkasten.notes import Note
+
+
+class TestNoteCache(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+        self.loaded: list[Path] = []
+
+    def _loader(self, path: Path) -> Note:
+        self.loaded.append(path)
+        return Note.read(path)
+
+    def _write_note(self, title: str) -> Path:
+        note = Note.new(title, "Anonymous")
+        path = self.tmp / f"{note.zk_id}.md"
+        path.write_text(note.materialize())
+        return path
+
+    def test_hits_and_misses(self):
+        cache = NoteCache()
+        path = self._write_note("First")
+        first = cache.get(path, self._loader)
+        second = cache.get(path, self._loader)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.loaded), 1)
+        self.assertEqual(cache.info(), (1, 1, 128, 1))
+
+    def test_returned_notes_are_copies(self):
+        cache = NoteCache()
+        path = self._write_note("First")
+        note = cache.get(path, self._loader)
+        note.title = "Changed"
+        note.links.add("link")
+
+        cached = cache.get(path, self._loader)
+        self.assertEqual(cached.title, "First")
+        self.assertEqual(cached.links, set())
+
+    def test_changed_file_is_reparsed(self):
+        cache = NoteCache()
+        path = self._write_note("First")
+        note = cache.get(path, self._loader)
+
+        note.title = "Second title"
+        path.write_text(note.materialize())
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(cache.get(path, self._loader).title, "Second title")
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_refresh(self):
+        cache = NoteCache()
+        path = self._write_note("First")
+        cache.get(path, self._loader)
+        cache.get(path, self._loader, refresh=True)
+
+        self.assertEqual(len(self.loaded), 2)
+        self.assertEqual(cache.get(path, self._loader).title, "First")
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_lru_eviction_and_invalidation(self):
+        cache = NoteCache(maxsize=2)
+        paths = [self._write_note(title) for title in "abc"]
+        for path in paths:
+            cache.get(path, self._loader)
+
+        self.assertNotIn(paths[0], cache)
+        self.assertIn(paths[2], cache)
+
+        cache.invalidate(paths[2])
+        self.assertNotIn(paths[2], cache)
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
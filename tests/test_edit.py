@@ -0,0 +1,128 @@
+import os
+import stat
+import unittest
+
+from appunti.zettelkasten.zettelkasten import TitleClashError
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class EditTestCase(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+        self.note = self.notes[0]
+        self.path = self.zk.note_path(self.note.zk_id)
+        self.content = self.path.read_text()
+
+    def editor(self, script: str) -> str:
+        path = self.vault.parent / "editor.sh"
+        path.write_text(f"#!/bin/sh\n{script}\n")
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+        return str(path)
+
+    def last_changed(self):
+        return self.zk.list_notes(zk_id=[self.note.zk_id],
+                                  show=['last_changed'])
+
+
+class TestUpdate(EditTestCase):
+    def test_unchanged_note_is_left_alone(self):
+        self.zk.editor = self.editor("exit 0")
+        mtime = os.stat(self.path).st_mtime_ns
+        last_changed = self.last_changed()
+
+        self.assertFalse(self.zk.update(self.note.zk_id))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+        self.assertEqual(self.path.read_text(), self.content)
+        self.assertEqual(self.last_changed(), last_changed)
+
+    def test_changed_note_is_saved(self):
+        self.zk.editor = self.editor('echo "more text" >> "$1"')
+
+        self.assertTrue(self.zk.update(self.note.zk_id))
+        self.assertIn("more text", self.path.read_text())
+
+
+class TestUpdateMany(EditTestCase):
+    def test_only_changed_notes_are_saved(self):
+        # the editor renames the first note it's given
+        self.zk.editor = self.editor(
+            "sed -i 's/First note/Renamed note/' \"$1\"")
+        zk_ids = [note.zk_id for note in self.notes[:3]]
+        others = [self.zk.note_path(zk_id).read_text() for zk_id in zk_ids]
+
+        self.assertEqual(self.zk.update_many(zk_ids), 1)
+        self.assertIn("title: Renamed note", self.path.read_text())
+        self.assertEqual(
+            [self.zk.note_path(zk_id).read_text() for zk_id in zk_ids[1:]],
+            others[1:])
+        self.assertEqual(
+            self.zk.list_notes(zk_id=[self.note.zk_id], show=['title']),
+            [("Renamed note", )])
+        self.assertEqual(self.zk.resolve_link("renamed-note"),
+                         self.note.zk_id)
+
+    def test_nothing_changed(self):
+        self.zk.editor = self.editor("exit 0")
+        zk_ids = [note.zk_id for note in self.notes]
+        self.assertEqual(self.zk.update_many(zk_ids), 0)
+        self.assertEqual(self.path.read_text(), self.content)
+
+    def test_titles_clashing_in_batch(self):
+        # the editor gives the same title to the first two notes
+        self.zk.editor = self.editor(
+            "sed -i 's/^title: .*/title: Same title/; "
+            "s/^# .*/# Same title/' \"$1\" \"$2\"")
+        zk_ids = [note.zk_id for note in self.notes[:2]]
+        contents = [self.zk.note_path(zk_id).read_text() for zk_id in zk_ids]
+
+        with self.assertRaises(TitleClashError):
+            self.zk.update_many(zk_ids, strict=True)
+        self.assertEqual(
+            [self.zk.note_path(zk_id).read_text() for zk_id in zk_ids],
+            contents)
+        # the edits are kept
+        kept = sorted(self.zk.tmp.glob("*.md"))
+        self.assertEqual(len(kept), 2)
+        self.assertIn("title: Same title", kept[0].read_text())
+
+    def test_swapped_titles(self):
+        self.zk.editor = self.editor(
+            "sed -i 's/First note/Swapped/; s/Second note/First note/; "
+            "s/Swapped/Second note/' \"$1\" \"$2\"")
+        zk_ids = [note.zk_id for note in self.notes[:3]]
+
+        self.assertEqual(self.zk.update_many(zk_ids, strict=True), 2)
+        self.assertEqual(
+            [
+                self.zk.list_notes(zk_id=[zk_id], show=['title'])
+                for zk_id in zk_ids[:2]
+            ], [[("Second note", )], [("First note", )]])
+
+    def test_title_of_unchanged_note_in_batch(self):
+        # the third note is part of the batch, but left as it is
+        self.zk.editor = self.editor(
+            "sed -i 's/First note/Third note/' \"$1\"")
+        zk_ids = [note.zk_id for note in self.notes[:3]]
+
+        with self.assertRaises(TitleClashError):
+            self.zk.update_many(zk_ids, strict=True)
+
+    def test_unreadable_note_is_skipped(self):
+        # the editor breaks the first note and changes the second
+        self.zk.editor = self.editor(
+            "sed -i 's/^date: .*/date: garbage/' \"$1\"\n"
+            "echo 'more text' >> \"$2\"")
+        zk_ids = [note.zk_id for note in self.notes[:2]]
+
+        self.assertEqual(self.zk.update_many(zk_ids), 1)
+        self.assertEqual(self.path.read_text(), self.content)
+        self.assertIn("more text",
+                      self.zk.note_path(zk_ids[1]).read_text())
+        kept, = self.zk.tmp.glob(f"{self.note.zk_id}-*.md")
+        self.assertIn("date: garbage", kept.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sqlite3
+import unittest
+
+from appunti.zettelkasten.zettelkasten import TitleClashError
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestExistence(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+
+    def test_title_exists(self):
+        dbmanager = self.zk.dbmanager
+        self.assertTrue(dbmanager.title_exists("First note"))
+        # same link as an existing note
+        self.assertTrue(dbmanager.title_exists("first Note"))
+        self.assertFalse(dbmanager.title_exists("Fifth note"))
+        self.assertFalse(
+            dbmanager.title_exists("First note", exclude=self.notes[0].zk_id))
+        self.assertFalse(
+            dbmanager.title_exists(
+                "Second note",
+                exclude=[note.zk_id for note in self.notes[:2]]))
+        self.assertTrue(
+            dbmanager.title_exists("Third note",
+                                   exclude=[self.notes[0].zk_id]))
+
+    def test_id_exists(self):
+        self.assertTrue(self.zk.dbmanager.id_exists(self.notes[0].zk_id))
+        self.assertFalse(self.zk.dbmanager.id_exists("0" * 32))
+
+    def test_strict_title_clash(self):
+        with self.assertRaises(TitleClashError):
+            self.zk._check_unique_title("Second note", strict=True)
+        self.zk._check_unique_title("Second note",
+                                    strict=True,
+                                    zk_id=self.notes[1].zk_id)
+
+    def test_lookups_use_indices(self):
+        with sqlite3.connect(self.zk.index) as conn:
+            plan = " ".join(
+                row[3] for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT 1 FROM zettelkasten "
+                    "WHERE title = ? OR slug = ?", ("a", "a")))
+        self.assertIn("zettelkasten_title", plan)
+        self.assertIn("zettelkasten_slug", plan)
+        self.assertNotIn("SCAN zettelkasten", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+
+from appunti.zettelkasten.sql import FRECENCY_HALF_LIFE
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestFrecency(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+        self.now = datetime(2024, 1, 1)
+
+    def _access(self, index: int, action: str, days_ago: float) -> None:
+        self.zk.dbmanager.record_access(self.notes[index].zk_id, action,
+                                        self.now - timedelta(days=days_ago))
+
+    def _ranking(self) -> list[str]:
+        results = self.zk.list_notes(sort_by='frecency', show=['title'])
+        return [title for title, in results]
+
+    def test_frequent_and_recent_first(self):
+        # three old accesses, one recent one
+        for days_ago in (40, 41, 42):
+            self._access(0, 'open', days_ago)
+        self._access(2, 'open', 0)
+        self._access(3, 'open', 1)
+
+        self.assertEqual(self._ranking()[:3],
+                         ["Third note", "Fourth note", "First note"])
+        # notes never accessed come last, newest first
+        self.assertEqual(self._ranking()[3], "Second note")
+
+    def test_accesses_decay(self):
+        half_life = FRECENCY_HALF_LIFE / (24 * 60 * 60)
+        # two accesses one half-life ago weigh as much as a recent one
+        self._access(0, 'open', half_life + 0.01)
+        self._access(0, 'open', half_life + 0.01)
+        self._access(1, 'open', 0)
+        self.assertEqual(self._ranking()[:2], ["Second note", "First note"])
+
+        # prints weigh less than opens
+        self._access(2, 'print', 0)
+        self.assertEqual(self._ranking()[:3],
+                         ["Second note", "First note", "Third note"])
+
+    def test_filters_and_joins(self):
+        self._access(1, 'open', 0)
+        results = self.zk.list_notes(tags=["%common%"],
+                                     sort_by='frecency',
+                                     show=['title', 'tag'])
+        self.assertEqual(results[0], ("Second note", "common"))
+
+    def test_get_last(self):
+        self.zk.last.write_text(f"{self.notes[3].zk_id}.md\n")
+        self.assertEqual(self.zk.get_last(), self.notes[3].zk_id)
+
+        self._access(1, 'update', 1)
+        self._access(0, 'print', 0)
+        self.assertEqual(self.zk.get_last(), self.notes[1].zk_id)
+
+    def test_last_file_follows_log(self):
+        self.zk.record_access(self.notes[2].zk_id, 'update')
+        self.zk.record_access(self.notes[0].zk_id, 'open')
+        self.assertEqual(self.zk.last.read_text().strip(),
+                         self.notes[2].zk_id)
+
+    def test_print_without_record(self):
+        ranking = self._ranking()
+        self.zk.print_note(self.notes[2].zk_id, record=False)
+        self.assertEqual(self._ranking(), ranking)
+        self.zk.print_note(self.notes[2].zk_id)
+        self.assertEqual(self._ranking()[0], "Third note")
+
+
+if __name__ == "__main__":
+    unittest.main()
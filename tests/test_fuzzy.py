@@ -0,0 +1,69 @@
+import unittest
+
+from appunti.cli.fuzzy import FuzzyIndex, best_score, score
+
+
+class TestScore(unittest.TestCase):
+    def test_no_match(self):
+        self.assertIsNone(score("hello", "hello", "xyz"))
+        self.assertIsNone(score("hello", "hello", "oh"))
+
+    def test_word_start_gets_best_score(self):
+        title = "Notes on Zettelkasten"
+        self.assertEqual(score(title, title.lower(), "zettel"),
+                         best_score(6))
+
+    def test_bonuses(self):
+        # consecutive beats scattered
+        self.assertGreater(score("abc", "abc", "ab"),
+                           score("axb", "axb", "ab"))
+        # word boundaries beat the middle of words
+        self.assertGreater(score("xa b", "xa b", "ab"),
+                           score("xaxb", "xaxb", "ab"))
+        # camel case humps count
+        self.assertGreater(score("fooBar", "foobar", "fb"),
+                           score("foobar", "foobar", "fb"))
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    rows = [("Zettelkasten method", "1"), ("A note on zettels", "2"),
+            ("Unrelated", "3"), ("Zealous cats", "4"),
+            ("Lazy evening tales", "5")]
+
+    def setUp(self):
+        self.index = FuzzyIndex(self.rows)
+
+    def _ids(self, query, limit=None):
+        return [row[1] for row in self.index.search(query, limit)]
+
+    def test_empty_query_keeps_order(self):
+        self.assertEqual(self._ids(""), ["1", "2", "3", "4", "5"])
+        self.assertEqual(self._ids("", 2), ["1", "2"])
+
+    def test_ranking(self):
+        # shorter titles win among equal scores
+        self.assertEqual(self._ids("zettel"), ["2", "1"])
+        self.assertEqual(self._ids("zt")[:2], ["2", "1"])
+        self.assertNotIn("3", self._ids("zt"))
+
+    def test_limit_matches_full_ranking(self):
+        for query in ["z", "ze", "zt", "zet", "ets", "n", "ZE", "Ze"]:
+            with self.subTest(query=query):
+                self.assertEqual(self._ids(query, 2), self._ids(query)[:2])
+
+    def test_incremental_matches_fresh(self):
+        for query in ["z", "ze", "zet", "zetk", "zet", "tl"]:
+            with self.subTest(query=query):
+                fresh = FuzzyIndex(self.rows)
+                self.assertEqual(self.index.matches(query),
+                                 fresh.matches(query))
+
+    def test_smart_case(self):
+        self.assertEqual(self._ids("Zc"), ["4"])
+        self.assertEqual(self._ids("zc"), ["4"])
+        self.assertEqual(self._ids("ZC"), [])
+        self.assertEqual(self._ids("UNR"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from appunti.wrappers.fzf_wrapper import Fzf
+
+# stand-in for fzf: record the arguments, then select the notes whose
+# line matches $FZF_PICK, or exit like fzf does when nothing matches
+_FAKE_FZF = """#!/bin/sh
+echo "$@" > "$FZF_ARGS"
+grep -e "$FZF_PICK" || exit 1
+"""
+
+
+class TestFzf(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self.args = self.root / "args"
+
+        fzf = self.root / "fzf"
+        fzf.write_text(_FAKE_FZF)
+        fzf.chmod(0o755)
+        env_patcher = mock.patch.dict(
+            os.environ, {
+                'PATH': f"{self.root}{os.pathsep}{os.environ['PATH']}",
+                'FZF_ARGS': str(self.args),
+            })
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def _select(self, pick, notes, **kwargs):
+        with mock.patch.dict(os.environ, {'FZF_PICK': pick}):
+            return Fzf(**kwargs).select(notes)
+
+    def test_select_returns_ids(self):
+        notes = [("First note", "1"), ("Second note", "2"),
+                 ("Third\tnote", "3")]
+        self.assertEqual(self._select("Second", iter(notes)), ["2"])
+        self.assertEqual(self._select("d", iter(notes)), ["2", "3"])
+
+    def test_no_match(self):
+        self.assertEqual(self._select("nothing", [("First", "1")]), [])
+
+    def test_options(self):
+        self._select("x", [], multi=False, preview="print {2}")
+        args = self.args.read_text()
+        self.assertNotIn("--multi", args)
+        self.assertIn("--preview print {2}", args)
+
+    def test_fzf_quitting_early(self):
+        fzf = self.root / "fzf"
+        fzf.write_text("#!/bin/sh\nhead -n 1\n")
+
+        def notes():
+            for index in range(100_000):
+                yield (f"note {index}", str(index))
+
+        self.assertEqual(self._select("", notes()), ["0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from appunti.wrappers.git_wrapper import Git
+
+_GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'Anonymous',
+    'GIT_AUTHOR_EMAIL': 'anonymous@example.com',
+    'GIT_COMMITTER_NAME': 'Anonymous',
+    'GIT_COMMITTER_EMAIL': 'anonymous@example.com',
+    'GIT_CONFIG_COUNT': '2',
+    'GIT_CONFIG_KEY_0': 'init.defaultBranch',
+    'GIT_CONFIG_VALUE_0': 'master',
+    'GIT_CONFIG_KEY_1': 'pull.rebase',
+    'GIT_CONFIG_VALUE_1': 'false',
+}
+
+
+def _git(*args: str, cwd: Path) -> str:
+    process = subprocess.run(['git', *args], cwd=cwd, check=True,
+                             capture_output=True)
+    return process.stdout.decode('utf-8').strip()
+
+
+class TestFastSync(unittest.TestCase):
+    """
+    Run the fast sync against a local bare repository standing in
+    for the remote origin.
+    """
+
+    def setUp(self):
+        env_patcher = mock.patch.dict(os.environ, _GIT_ENV)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+
+        self.remote = self.root / "remote.git"
+        _git('init', '--bare', str(self.remote), cwd=self.root)
+
+        self.vault = self.root / "vault"
+        self.vault.mkdir()
+        self.git = Git.init(self.vault, to_ignore=['.tmp'])
+        self.git.origin = str(self.remote)
+
+    def _clone_other(self) -> Path:
+        other = self.root / "other"
+        _git('clone', str(self.remote), str(other), cwd=self.root)
+        return other
+
+    def _commit_other(self, other: Path, name: str) -> None:
+        (other / name).write_text("content\n")
+        _git('add', '-A', cwd=other)
+        _git('commit', '-m', f'add {name}', cwd=other)
+        _git('push', 'origin', 'master', cwd=other)
+
+    def test_push_when_branch_missing_on_remote(self):
+        self.assertEqual(self.git.remote_ref(), "")
+        self.assertEqual(self.git.fast_sync(), (False, True))
+        self.assertEqual(self.git.remote_ref(), self.git.local_ref())
+
+    def test_idle_sync_is_noop(self):
+        self.git.push()
+        self.assertEqual(self.git.fast_sync(), (False, False))
+
+    def test_push_only_when_ahead(self):
+        self.git.push()
+        (self.vault / "note.md").write_text("note\n")
+        self.assertEqual(self.git.fast_sync(), (False, True))
+        self.assertEqual(self.git.remote_ref(), self.git.local_ref())
+        self.assertEqual(self.git.fast_sync(), (False, False))
+
+    def test_pull_only_when_behind(self):
+        self.git.push()
+        other = self._clone_other()
+        self._commit_other(other, "remote.md")
+
+        self.assertEqual(self.git.fast_sync(), (True, False))
+        self.assertTrue((self.vault / "remote.md").is_file())
+        self.assertEqual(self.git.remote_ref(), self.git.local_ref())
+
+    def test_pull_and_push_when_diverged(self):
+        self.git.push()
+        other = self._clone_other()
+        self._commit_other(other, "remote.md")
+        (self.vault / "local.md").write_text("local\n")
+
+        self.assertEqual(self.git.fast_sync(), (True, True))
+        self.assertTrue((self.vault / "remote.md").is_file())
+        self.assertEqual(self.git.remote_ref(), self.git.local_ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from appunti.zettelkasten.zettelkasten import AmbiguousIDError
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestIDPrefix(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+        self.zk_ids = sorted(note.zk_id for note in self.notes)
+
+    def test_unique_prefix(self):
+        abbreviations = self.zk.abbreviate_ids(self.zk_ids)
+        for zk_id in self.zk_ids:
+            self.assertGreaterEqual(len(abbreviations[zk_id]), 7)
+            self.assertTrue(zk_id.startswith(abbreviations[zk_id]))
+            self.assertEqual(self.zk.resolve_id(abbreviations[zk_id]), zk_id)
+            self.assertEqual(self.zk.resolve_id(zk_id), zk_id)
+
+    def test_ambiguous_prefix(self):
+        with self.assertRaises(AmbiguousIDError):
+            self.zk.resolve_id("")
+
+    def test_digit_prefix(self):
+        # prefixes made of digits are not compared as numbers
+        self.assertEqual(self.zk.dbmanager.match_id_prefix("0123456789"), [])
+        for zk_id in self.zk_ids:
+            digits = zk_id[:1]
+            if digits.isdigit():
+                self.assertIn(
+                    zk_id, self.zk.dbmanager.match_id_prefix(digits, limit=4))
+
+    def test_unknown_prefix(self):
+        self.assertEqual(self.zk.resolve_id("xyz"), "xyz")
+
+    def test_abbreviation_grows_on_clash(self):
+        dbmanager = self.zk.dbmanager
+        zk_id = self.zk_ids[0]
+        twin = zk_id[:10] + ("0" if zk_id[10] != "0" else "1") + zk_id[11:]
+        note = self.notes[0]
+        note.zk_id = twin
+        dbmanager.add_to_index(note)
+        self.assertEqual(
+            dbmanager.abbreviate_ids([zk_id])[zk_id], zk_id[:11])
+        with self.assertRaises(AmbiguousIDError):
+            self.zk.resolve_id(zk_id[:10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import sqlite3
+import unittest
+
+from appunti.zettelkasten.sql import DBManager
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestNeighborhood(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        # every note links to the one before, the first to the last
+        self.zk.index_vault()
+
+    def test_resolve_link(self):
+        self.assertEqual(self.zk.resolve_link("third-note"),
+                         self.notes[2].zk_id)
+        self.assertIsNone(self.zk.resolve_link("missing-note"))
+
+    def test_resolve_renamed_note(self):
+        note = self.notes[2]
+        note.title = "Renamed note"
+        self.zk.dbmanager.update_note_to_index(note)
+        self.assertIsNone(self.zk.resolve_link("third-note"))
+        self.assertEqual(self.zk.resolve_link("renamed-note"), note.zk_id)
+
+    def test_neighborhood(self):
+        neighborhood = self.zk.get_neighborhood(self.notes[1].zk_id)
+        self.assertEqual(neighborhood['incoming'],
+                         [("Third note", self.notes[2].zk_id)])
+        self.assertEqual(neighborhood['two_hop'],
+                         [("Fourth note", self.notes[3].zk_id)])
+
+    def test_migrate_old_index(self):
+        with sqlite3.connect(self.zk.index) as conn:
+            conn.execute("DROP INDEX zettelkasten_slug")
+            conn.execute("ALTER TABLE zettelkasten DROP COLUMN slug")
+
+        dbmanager = DBManager(self.zk.index)
+        self.assertEqual(dbmanager.resolve_slug("first-note"),
+                         self.notes[0].zk_id)
+        self.assertEqual(
+            dbmanager.get_neighborhood(self.notes[0].zk_id)['incoming'],
+            [("Second note", self.notes[1].zk_id)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import pickle
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from appunti.zettelkasten.notes import Note, NoteRecord
+
+
+class TestNoteScan(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+
+        note = Note.new("The quick brown fox", "Anonymous")
+        note.tags = {"test", "unittest"}
+        note.body += "\n\n[[Lazy Dog]] and [[license]]\n\nNext -> [[Other]]"
+        self.path = Path(tmp_dir.name) / f"{note.zk_id}.md"
+        self.path.write_text(note.materialize())
+
+    def test_scan_matches_read(self):
+        """
+        Test that a scanned note has the same fields of a fully read one
+        """
+        read_note = Note.read(self.path)
+        scanned_note = Note.scan(self.path)
+
+        self.assertEqual(scanned_note.links, {"lazy-dog", "license", "other"})
+        self.assertEqual(scanned_note.next, {"other"})
+        self.assertEqual(scanned_note, read_note)
+
+    def test_body_is_lazy(self):
+        scanned_note = Note.scan(self.path)
+        self.assertIsNone(scanned_note.__dict__['_body'])
+
+        body = Note.read(self.path).body
+        self.assertEqual(scanned_note.body, body)
+        self.assertEqual(scanned_note.__dict__['_body'], body)
+
+    def test_scanned_note_survives_pickling(self):
+        scanned_note = pickle.loads(pickle.dumps(Note.scan(self.path)))
+        self.assertEqual(scanned_note.body, Note.read(self.path).body)
+
+
+class TestNoteRecord(unittest.TestCase):
+    def setUp(self):
+        self.note = Note.new("The quick brown fox", "Anonymous")
+        self.note.date = self.note.date.replace(microsecond=0)
+        self.note.last = self.note.date
+        self.note.tags = {"test", "unittest"}
+        self.note.links = {"lazy-dog", "other"}
+        self.note.next = {"other"}
+
+    def test_round_trip(self):
+        record = NoteRecord.from_note(self.note)
+        self.assertEqual(record.tags, frozenset({"test", "unittest"}))
+        self.assertEqual(record.date, self.note.date)
+        self.assertEqual(record.to_note(self.note.body), self.note)
+
+    @unittest.skipUnless(hasattr(time, 'tzset'), "needs time.tzset")
+    def test_round_trip_when_clocks_go_back(self):
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = "Europe/Rome"
+        time.tzset()
+
+        def restore_tz():
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+
+        self.addCleanup(restore_tz)
+
+        # hours skipped and repeated by the clocks, and the first date
+        for date in [
+                datetime(2023, 3, 26, 2, 30),
+                datetime(2023, 10, 29, 2, 30),
+                datetime(1, 1, 1)
+        ]:
+            self.note.date = self.note.last = date
+            record = NoteRecord.from_note(self.note)
+            self.assertEqual(record.date, date)
+            self.assertEqual(record.last, date)
+
+    def test_record_is_compact_and_immutable(self):
+        record = NoteRecord.from_note(self.note)
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.title = "Another title"  # type: ignore[misc]
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+
+if __name__ == "__main__":
+    unittest.main()
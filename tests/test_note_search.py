@@ -0,0 +1,71 @@
+import unittest
+
+from appunti.cli.pager import (CURRENT_MATCH_PAIR, MATCH_PAIR, NoteSearch,
+                               Position, Span, WrappedContent)
+
+CONTENT = "\n".join([
+    "# Apples",
+    "apples and pears, then more apples",
+    "",
+    "nothing here",
+    "Apples again at the end",
+])
+
+
+class TestNoteSearch(unittest.TestCase):
+    def setUp(self):
+        self.text = WrappedContent(CONTENT)
+        self.text.set_width(20)
+
+    def test_incremental(self):
+        search = NoteSearch(self.text)
+        self.assertEqual(search.update("p"), 3)
+        # the longer query goes on from the current match
+        self.assertEqual(search.update("pe"), CONTENT.index("pears"))
+        self.assertEqual(search.update("pex"), None)
+        self.assertEqual(search.update("p"), 3)
+
+    def test_next_wraps_around(self):
+        search = NoteSearch(self.text, origin=CONTENT.index("nothing"))
+        first = search.update("apples")
+        self.assertEqual(first, CONTENT.index("Apples again"))
+        self.assertEqual(search.next(), 2)
+        self.assertEqual(search.next(forward=False), first)
+
+    def test_backward(self):
+        search = NoteSearch(self.text,
+                            origin=CONTENT.index("nothing"),
+                            forward=False)
+        self.assertEqual(search.update("apples"), CONTENT.index("apples\n"))
+        # n keeps going backward, N goes forward
+        self.assertEqual(search.next(), CONTENT.index("apples and"))
+        self.assertEqual(search.next(forward=False),
+                         CONTENT.index("apples\n"))
+
+    def test_smartcase(self):
+        search = NoteSearch(self.text)
+        self.assertEqual(search.update("Apples"), 2)
+        self.assertEqual(search.next(), CONTENT.index("Apples again"))
+
+    def test_locate(self):
+        offset = CONTENT.index("more apples")
+        line, row = self.text.locate(offset)
+        self.assertEqual(line, 1)
+        self.assertIn("more", self.text.wrap(line)[row][1])
+        self.assertEqual(self.text.offset(Position(4, 0)),
+                         CONTENT.index("Apples again"))
+
+    def test_matches_are_marked(self):
+        search = NoteSearch(self.text)
+        search.update("apples")
+        self.assertEqual(search.line_matches(1), [
+            Span(1, 0, 6, MATCH_PAIR),
+            Span(1, 28, 34, MATCH_PAIR),
+        ])
+        self.assertEqual(search.line_matches(0)[0].pair, CURRENT_MATCH_PAIR)
+        rows = list(self.text.rows(Position(1, 0), 1, search.line_matches))
+        self.assertEqual(rows[0][1][-1], (0, "apples", MATCH_PAIR))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from appunti.cli.pager import NotePrefetcher
+from appunti.zettelkasten.notes import Note
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestNotePrefetcher(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+        self.prefetcher = NotePrefetcher(self.zk)
+        self.addCleanup(self.prefetcher.close)
+
+    def test_resolve(self):
+        self.assertEqual(self.prefetcher.resolve("second-note"),
+                         self.notes[1].zk_id)
+        self.assertIsNone(self.prefetcher.resolve("missing-note"))
+
+        # notes created later are found as well
+        note = Note.new("Fifth note", "Anonymous")
+        self.write_note(note)
+        self.zk.dbmanager.add_to_index(note)
+        self.assertEqual(self.prefetcher.resolve("fifth-note"), note.zk_id)
+
+    def test_prefetch_links(self):
+        links = ["first-note", "second-note", "missing-note"]
+        self.prefetcher.prefetch(links, width=10, rows=5)
+        self.assertTrue(self.prefetcher.wait(timeout=5))
+
+        misses = self.zk.note_cache.misses
+        first = self.prefetcher.get(self.notes[0].zk_id)
+        self.assertIs(self.prefetcher.get(self.notes[0].zk_id), first)
+        self.prefetcher.get(self.notes[1].zk_id)
+        self.assertEqual(self.zk.note_cache.misses, misses)
+        self.assertEqual(first.note.title, "First note")
+        # the first screen is wrapped already
+        self.assertEqual(first.text.width, 10)
+        self.assertIn(0, first.text._wrapped)
+
+    def test_prepared_again_when_stale(self):
+        note = self.notes[0]
+        prepared = self.prefetcher.get(note.zk_id)
+        self.assertIs(self.prefetcher.get(note.zk_id), prepared)
+
+        note.body += "\n\nMore text"
+        self.write_note(note)
+        self.assertIn("More text",
+                      self.prefetcher.get(note.zk_id).text.content)
+
+if __name__ == "__main__":
+    unittest.main()
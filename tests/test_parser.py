@@ -0,0 +1,148 @@
+import io
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from appunti.parser.parser import BodyParser, BodyException, HeaderParser
+from appunti.parser.parser import MmapParser, FrontmatterException
+from appunti.utils import sluggify
+
+_FIXTURE = Path(__file__).parent / "fixtures" / "example_note.md"
+
+
+class TestBodyParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = BodyParser()
+
+    def _parse(self, text: str):
+        parsed, _ = self.parser.parse(handle=io.StringIO(text))
+        return parsed
+
+    def test_parse_fixture(self):
+        """
+        Test that headers and links are collected from the body
+        of a note
+        """
+        header_parser = HeaderParser(
+            parsing_obj=['title', 'author', 'date', 'zk_id', 'tags'])
+        with open(_FIXTURE) as f:
+            header_parser.parse(handle=f)
+            parsed, _ = self.parser.parse(handle=f)
+
+        self.assertEqual(parsed['header'],
+                         ['# Ciao come va', '# Another way'])
+        self.assertEqual(parsed['links'], {'license', 'description'})
+        self.assertEqual(parsed['next'], set())
+
+    def test_next_links(self):
+        parsed = self._parse("# Title\n\nNext -> [[Other Note!]]\n"
+                             "Next -> [[a]] not a next link\n")
+        self.assertEqual(parsed['next'], {'other-note'})
+        self.assertEqual(parsed['links'], {'other-note', 'a'})
+
+    def test_links_in_headers_are_ignored(self):
+        parsed = self._parse("# Title [[nope]]\n\n[[yes]] [[]]\n")
+        self.assertEqual(parsed['links'], {'yes'})
+
+    def test_body_must_start_with_title(self):
+        with self.assertRaises(BodyException):
+            self._parse("\nno title here\n")
+
+
+class TestMmapParser(unittest.TestCase):
+    """
+    The memory-mapped parser must give the same output as
+    HeaderParser followed by BodyParser.
+    """
+    parsing_obj = ['title', 'author', 'date', 'zk_id', 'tags']
+
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+
+    def _compare(self, path: Path) -> None:
+        header_parser = HeaderParser(parsing_obj=self.parsing_obj)
+        with open(path) as f:
+            expected_header, _ = header_parser.parse(handle=f)
+            expected_body, _ = BodyParser().parse(handle=f)
+
+        mmap_parser = MmapParser(parsing_obj=self.parsing_obj, keep_body=True)
+        header, body = mmap_parser.parse(path)
+
+        self.assertEqual(header, expected_header)
+        self.assertEqual(body, expected_body)
+
+    def _write(self, body: str) -> Path:
+        path = self.tmp / "note.md"
+        path.write_bytes(("---\ntitle: Title\nauthor: Anonymous\n"
+                          "date: 2023-10-19T19:30:01\n"
+                          "zk_id: 3e804e0062ecdba15ee1dd655385c8b8\n"
+                          "tags: #a #b\n---\n" + body).encode())
+        return path
+
+    def test_fixture(self):
+        self._compare(_FIXTURE)
+
+    def test_links_headers_and_next(self):
+        path = self._write("\n\n# Title [[not a link]]\n\n"
+                           "Some [[Link One]] and [[link-two]] and [[]].\n"
+                           "Next -> [[Following Note]]   \n"
+                           "Next -> [[a]] and [[b]]\n"
+                           "not Next -> [[c]]\n"
+                           "# Another header\n"
+                           "[[broken link\n"
+                           "ünïcödé [[Ünïcödé Link]]\n")
+        self._compare(path)
+
+    def test_windows_newlines(self):
+        self._compare(self._write("# Title\r\n\r\n[[link]]\r\n"
+                                  "Next -> [[next]]\r\n"))
+
+    def test_carriage_return_newlines(self):
+        path = self._write("# Title\r\r[[link]]\r"
+                           "Next -> [[next]]\r")
+        path.write_bytes(path.read_bytes().replace(b"\n", b"\r"))
+        self._compare(path)
+
+    def test_no_trailing_newline(self):
+        self._compare(self._write("# Title\n\n[[link]]"))
+        self._compare(self._write(""))
+
+    def test_body_must_start_with_title(self):
+        mmap_parser = MmapParser(parsing_obj=self.parsing_obj)
+        with self.assertRaises(BodyException):
+            mmap_parser.parse(self._write("\nno title here\n# Title\n"))
+
+    def test_frontmatter_not_closed(self):
+        mmap_parser = MmapParser(parsing_obj=self.parsing_obj)
+        path = self.tmp / "note.md"
+        path.write_text("---\ntitle: Title\n")
+        with self.assertRaises(FrontmatterException):
+            mmap_parser.parse(path)
+        path.write_text("")
+        with self.assertRaises(FrontmatterException):
+            mmap_parser.parse(path)
+
+    def test_malformed_frontmatter(self):
+        mmap_parser = MmapParser(parsing_obj=self.parsing_obj)
+        path = self.tmp / "note.md"
+        for date in ["garbage", "2023-01-01 10:00:00"]:
+            path.write_text(f"---\ntitle: Title\ndate: {date}\n---\n"
+                            "# Title\n")
+            with self.assertRaises(FrontmatterException):
+                mmap_parser.parse(path)
+        # the frontmatter is checked before the body
+        path.write_text("---\ndate: garbage\n---\nno title\n")
+        with self.assertRaises(FrontmatterException):
+            mmap_parser.parse(path)
+
+
+class TestSluggify(unittest.TestCase):
+    def test_sluggify(self):
+        self.assertEqual(sluggify("Hello, World! It's-me"),
+                         "hello-world-its-me")
+
+
+if __name__ == "__main__":
+    unittest.main()
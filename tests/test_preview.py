@@ -0,0 +1,57 @@
+import unittest
+
+from appunti.cli.preview import PreviewLoader
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestMetadataMany(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+
+    def test_matches_single_lookups(self):
+        zk_ids = [note.zk_id for note in self.notes]
+        metadata = self.zk.get_metadata_many(zk_ids + ["missing"])
+
+        self.assertEqual(set(metadata), set(zk_ids))
+        for zk_id in zk_ids:
+            self.assertEqual(metadata[zk_id], self.zk.get_metadata(zk_id))
+
+    def test_read_head(self):
+        note = self.notes[1]
+        head = self.zk.read_head(note.zk_id, lines=1)
+
+        self.assertEqual(head, [note.body.strip().splitlines()[0]])
+
+
+class TestPreviewLoader(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+        self.loader = PreviewLoader(self.zk, lines=3)
+        self.addCleanup(self.loader.close)
+
+    def test_prefetch_loads_page(self):
+        zk_ids = [note.zk_id for note in self.notes]
+        self.assertIsNone(self.loader.get(zk_ids[0]))
+
+        self.loader.prefetch(zk_ids)
+        self.assertTrue(self.loader.wait(zk_ids[-1], timeout=5))
+        for note in self.notes:
+            preview = self.loader.get(note.zk_id)
+            assert preview is not None
+            self.assertEqual(preview.metadata['title'], note.title)
+            self.assertEqual(preview.metadata['tag'], note.tags)
+            self.assertLessEqual(len(preview.head), 3)
+
+    def test_missing_note_is_empty(self):
+        self.loader.prefetch(["missing"])
+        self.assertTrue(self.loader.wait("missing", timeout=5))
+        preview = self.loader.get("missing")
+        assert preview is not None
+        self.assertEqual(preview.metadata, {})
+        self.assertEqual(preview.head, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
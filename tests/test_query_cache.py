@@ -0,0 +1,59 @@
+import unittest
+
+from appunti.cli.interactive_selection import (Interactive, QueryCache,
+                                               QueryKey)
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+def _key(text: str) -> QueryKey:
+    return QueryKey.from_filters(*Interactive.parse_text(text))
+
+
+class TestQueryKey(unittest.TestCase):
+    def test_longer_text_refines(self):
+        self.assertTrue(_key("zett").refines(_key("zet")))
+        self.assertTrue(_key("ZETT").refines(_key("zet")))
+        self.assertFalse(_key("zet").refines(_key("zett")))
+
+    def test_added_filters_refine(self):
+        self.assertTrue(_key("zet #tag").refines(_key("zet")))
+        self.assertTrue(_key("zet #tag [[li").refines(_key("zet #ta")))
+        self.assertFalse(_key("zet").refines(_key("zet #tag")))
+
+    def test_negated_filters(self):
+        self.assertTrue(_key("!zet").refines(_key("!zett")))
+        self.assertFalse(_key("!zett").refines(_key("!zet")))
+        self.assertFalse(_key("!zet").refines(_key("zet")))
+
+
+class TestQueryCache(ZettelkastenTestCase):
+    queries = ["", "note", "note th", "#tag", "#tag1", "#!tag1", "no #common",
+               "[[note", "[[!first", "!first", "!first note", "f_rst%",
+               "#comm [[sec"]
+
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+
+    def _query(self, text: str) -> list[tuple[str, ...]]:
+        title, tags, links = Interactive.parse_text(text)
+        return self.zk.list_notes(title=title, tags=tags, links=links,
+                                  sort_by='creation_date', descending=False)
+
+    def test_refinements_match_index(self):
+        for query in self.queries:
+            with self.subTest(query=query):
+                cache = QueryCache(self.zk)
+                cache.put(_key(""), self._query(""))
+                self.assertEqual(cache.get(_key(query)), self._query(query))
+
+    def test_unrelated_query_misses(self):
+        cache = QueryCache(self.zk)
+        cache.put(_key("first"), self._query("first"))
+        self.assertIsNone(cache.get(_key("second")))
+        self.assertIsNone(cache.get(_key("firs")))
+        self.assertEqual(cache.get(_key("first")), self._query("first"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import unittest
+from threading import Event
+
+from appunti.cli.interactive_selection import QueryWorker
+from appunti.zettelkasten.sql import DBManagerCancelled
+
+
+class TestQueryWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.worker = QueryWorker(self._query, debounce=0.05)
+        self.addCleanup(self.worker.close)
+
+    def _query(self, title, cancelled):
+        self.calls.append(title)
+        return [(title, "id")]
+
+    def test_wait_returns_latest_results(self):
+        self.worker.submit(title="a")
+        self.assertEqual(self.worker.wait(), [("a", "id")])
+        self.assertFalse(self.worker.pending)
+        self.assertIsNone(self.worker.poll())
+
+    def test_burst_runs_only_last_query(self):
+        for title in ["a", "ab", "abc"]:
+            self.worker.submit(title=title)
+        self.assertEqual(self.worker.wait(), [("abc", "id")])
+        self.assertEqual(self.calls, ["abc"])
+
+    def test_superseded_query_is_cancelled(self):
+        started = Event()
+
+        def slow_query(title, cancelled):
+            if title == "slow":
+                started.set()
+                while not cancelled():
+                    time.sleep(0.001)
+                raise DBManagerCancelled("cancelled")
+            return [(title, "id")]
+
+        worker = QueryWorker(slow_query, debounce=0)
+        self.addCleanup(worker.close)
+        worker.submit(title="slow")
+        self.assertTrue(started.wait(1))
+        worker.submit(title="fast")
+        self.assertEqual(worker.wait(), [("fast", "id")])
+
+    def test_errors_are_raised_to_the_caller(self):
+
+        def failing_query(cancelled):
+            raise ValueError("boom")
+
+        worker = QueryWorker(failing_query, debounce=0)
+        self.addCleanup(worker.close)
+        worker.submit()
+        with self.assertRaises(ValueError):
+            worker.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from appunti.zettelkasten.zettelkasten import SHARDED_MARKER, Zettelkasten
+from tests.test_zettelkasten import ZettelkastenTestCase
+
+
+class TestSharding(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+
+    def test_migrate(self):
+        self.assertEqual(self.zk.migrate_layout(), len(self.notes))
+        self.assertTrue((self.vault / SHARDED_MARKER).is_file())
+        for note in self.notes:
+            path = self.vault / note.zk_id[:2] / f"{note.zk_id}.md"
+            self.assertTrue(path.is_file())
+            self.assertEqual(self.zk.note_path(note.zk_id), path)
+            self.assertEqual(self.zk.read_note(note.zk_id).title, note.title)
+        self.assertFalse(list(self.vault.glob("*.md")))
+
+        # a new instance finds the layout from the marker
+        zk = Zettelkasten(self.vault, "Anonymous", autocommit=False)
+        self.assertTrue(zk.sharded)
+        zk.index_vault()
+        self.assertEqual(len(zk.list_notes()), len(self.notes))
+
+    def test_migrate_back(self):
+        self.zk.migrate_layout()
+        self.assertEqual(self.zk.migrate_layout(sharded=False),
+                         len(self.notes))
+        self.assertFalse((self.vault / SHARDED_MARKER).exists())
+        self.assertEqual(sorted(self.zk.notes_paths()),
+                         sorted(f"{note.zk_id}.md" for note in self.notes))
+        # emptied shards are removed
+        self.assertEqual(
+            [path for path in self.vault.iterdir() if path.is_dir()],
+            [self.vault / ".tmp"])
+
+    def test_notes_in_other_layout(self):
+        self.zk.migrate_layout()
+        # a note pulled from a clone that wasn't migrated
+        note = self.notes[0]
+        (self.vault / note.zk_id[:2] / f"{note.zk_id}.md").rename(
+            self.vault / f"{note.zk_id}.md")
+        self.assertEqual(self.zk.note_path(note.zk_id),
+                         self.vault / f"{note.zk_id}.md")
+        self.assertEqual(len(self.zk.notes_paths()), len(self.notes))
+
+
+if __name__ == "__main__":
+    unittest.main()
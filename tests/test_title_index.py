@@ -0,0 +1,43 @@
+import unittest
+
+from appunti.cli.title_index import TitleIndex
+
+ROWS = [
+    ("Zettelkasten method", "1"),
+    ("Notes on the method", "2"),
+    ("Methodology", "3"),
+    ("C++ templates", "4"),
+]
+
+
+class TestTitleIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TitleIndex(ROWS)
+
+    def test_empty_query(self):
+        self.assertEqual(self.index.search(""), ROWS)
+        self.assertEqual(self.index.search("  ", limit=2), ROWS[:2])
+
+    def test_prefix_first(self):
+        # prefix matches come first, then the others in order
+        self.assertEqual([zk_id for _, zk_id in self.index.search("Meth")],
+                         ["3", "1", "2"])
+        self.assertEqual(self.index.search("meth", limit=1), [ROWS[2]])
+
+    def test_slug(self):
+        self.assertEqual(self.index.search("notes-on"), [ROWS[1]])
+        self.assertEqual(self.index.search("c-templates"), [ROWS[3]])
+
+    def test_substring(self):
+        self.assertEqual(self.index.substring("the"), [1])
+        self.assertEqual(self.index.substring("od"), [0, 1, 2])
+        self.assertEqual(self.index.search("xyz"), [])
+
+    def test_no_notes(self):
+        index = TitleIndex([])
+        self.assertEqual(index.search("a"), [])
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from appunti.cli.interactive_selection import WindowedResults
+
+
+class TestWindowedResults(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [(f"title {index}", str(index)) for index in range(25)]
+        self.fetches = []
+
+    def _fetch(self, offset, limit):
+        self.fetches.append((offset, limit))
+        return self.rows[offset:offset + limit]
+
+    def test_rows_are_fetched_by_page(self):
+        results = WindowedResults(self._fetch, len(self.rows), page_size=10)
+        self.assertEqual(len(results), 25)
+        self.assertEqual(results[0], self.rows[0])
+        self.assertEqual(results[9], self.rows[9])
+        self.assertEqual(results[-1], self.rows[-1])
+        self.assertEqual(self.fetches, [(0, 10), (20, 10)])
+        self.assertEqual(results[5:12], self.rows[5:12])
+        self.assertEqual(list(results), self.rows)
+        with self.assertRaises(IndexError):
+            results[25]
+
+    def test_least_recently_used_pages_are_dropped(self):
+        results = WindowedResults(self._fetch,
+                                  len(self.rows),
+                                  page_size=10,
+                                  max_pages=2)
+        for index in [0, 10, 0, 20, 0, 10]:
+            results[index]
+        self.assertEqual(self.fetches, [(0, 10), (10, 10), (20, 10),
+                                        (10, 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
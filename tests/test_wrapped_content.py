@@ -0,0 +1,83 @@
+import unittest
+
+from appunti.cli.pager import (HighlightCache, Position, Span,
+                               WrappedContent)
+
+CONTENT = "\n".join([
+    "---",
+    "title: Note",
+    "---",
+    "",
+    "# Note",
+    "a long line that wraps on more than one row, with a [[link]]",
+    "```",
+    "code",
+    "```",
+    "end",
+])
+
+
+class TestWrappedContent(unittest.TestCase):
+    def setUp(self):
+        self.text = WrappedContent(CONTENT)
+        self.text.set_width(20)
+
+    def test_spans(self):
+        self.assertEqual(self.text.spans, [
+            Span(1, 0, 11, 1),
+            Span(4, 0, 6, 2),
+            Span(5, 52, 60, 4),
+            Span(7, 0, 4, 3),
+        ])
+        self.assertEqual(self.text.line_spans(5), [Span(5, 52, 60, 4)])
+        self.assertEqual(self.text.line_spans(6), [])
+
+    def test_spans_follow_rows(self):
+        rows = list(self.text.rows(Position(5, 0), 4))
+        self.assertEqual([text for text, _ in rows], [
+            "a long line that", "wraps on more than", "one row, with a",
+            "[[link]]"
+        ])
+        self.assertEqual(rows[3][1], [(0, "[[link]]", 4)])
+        # a row can start in the middle of a span
+        self.text.set_width(5)
+        rows = list(self.text.rows(Position(5, 0), len(self.text.wrap(5))))
+        colored = [part for _, parts in rows for part in parts]
+        self.assertGreater(len(colored), 1)
+        self.assertEqual("".join(text for _, text, _ in colored), "[[link]]")
+        for (row, parts) in rows:
+            for column, text, _ in parts:
+                self.assertEqual(row[column:column + len(text)], text)
+
+    def test_highlights_are_cached_by_content(self):
+        cache = HighlightCache()
+        spans = WrappedContent(CONTENT, cache).spans
+        self.assertIs(WrappedContent(CONTENT, cache).spans, spans)
+        self.assertIsNot(WrappedContent(CONTENT + "\n", cache).spans, spans)
+
+    def test_moving_through_rows(self):
+        self.assertEqual(self.text.wrap(3), [(0, "")])
+        self.assertEqual(len(self.text.wrap(5)), 4)
+
+        start = Position(0, 0)
+        self.assertEqual(self.text.forward(start, 6), Position(5, 1))
+        self.assertEqual(self.text.wrap(5)[1], (17, "wraps on more than"))
+        self.assertEqual(self.text.forward(start, 100), self.text.last())
+        self.assertEqual(self.text.last(), Position(9, 0))
+        self.assertEqual(self.text.backward(Position(6, 0), 2),
+                         Position(5, 2))
+        self.assertEqual(self.text.backward(Position(6, 0), 100), start)
+
+    def test_only_shown_lines_are_wrapped(self):
+        text = WrappedContent("\n".join(f"line {i}" for i in range(10000)))
+        text.set_width(20)
+        text.backward(text.last(), 30)
+        self.assertEqual(len(text._wrapped), 31)
+
+        # a new width wraps again
+        text.set_width(3)
+        self.assertEqual(text.wrap(0), [(0, "lin"), (3, "e 0")])
+
+
+if __name__ == "__main__":
+    unittest.main()
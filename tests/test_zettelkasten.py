@@ -0,0 +1,159 @@
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from tempfile import TemporaryDirectory
+
+from appunti.zettelkasten.notes import Note, NoteException, NoteRecord
+from appunti.zettelkasten.zettelkasten import Zettelkasten
+
+
+class ZettelkastenTestCase(unittest.TestCase):
+    """
+    Create a vault with a few notes, written directly on disk.
+    """
+    titles = ["First note", "Second note", "Third note", "Fourth note"]
+
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.vault = Path(tmp_dir.name) / "vault"
+        Zettelkasten.initialize(self.vault, "Anonymous")
+        self.zk = Zettelkasten(self.vault, "Anonymous", autocommit=False)
+
+        self.notes: list[Note] = []
+        for index, title in enumerate(self.titles):
+            note = Note.new(title, "Anonymous")
+            note.date = note.date.replace(microsecond=0)
+            note.last = note.date
+            note.tags = {f"tag{index}", "common"}
+            note.body += f"\n\n[[{self.titles[index - 1]}]]"
+            note.links = {self.titles[index - 1].lower().replace(" ", "-")}
+            self.write_note(note)
+            self.notes.append(note)
+
+    def write_note(self, note: Note) -> None:
+        path = self.vault / f"{note.zk_id}.md"
+        path.write_text(note.materialize())
+
+
+class TestReadMany(ZettelkastenTestCase):
+    def test_columns_match_notes(self):
+        paths = [f"{note.zk_id}.md" for note in self.notes]
+        columns = self.zk.read_many(paths)
+
+        self.assertEqual(len(columns), len(self.notes))
+        self.assertEqual(columns.zk_id, [note.zk_id for note in self.notes])
+        self.assertEqual(columns.title, self.titles)
+        self.assertEqual(list(columns.records()),
+                         [NoteRecord.from_note(note) for note in self.notes])
+
+    def test_parallel_reads_keep_order(self):
+        paths = [f"{note.zk_id}.md" for note in self.notes]
+        expected = self.zk.read_many(paths)
+
+        self.assertEqual(self.zk.read_many(paths, workers=3), expected)
+        self.assertEqual(
+            self.zk.read_many(paths, workers=2, processes=True), expected)
+
+    def test_title_check_is_quiet(self):
+        note = self.notes[0]
+        note.body = note.body.replace("# First note", "# Another header")
+        self.write_note(note)
+        paths = [f"{note.zk_id}.md"]
+
+        with redirect_stdout(StringIO()) as output:
+            self.zk.read_many(paths)
+            self.zk.scan_notes(paths)
+        self.assertEqual(output.getvalue(), "")
+
+        with redirect_stdout(StringIO()) as output:
+            self.zk.scan_notes(paths, quiet=False)
+        self.assertIn("do not coincide", output.getvalue())
+
+    def test_reindex_warns_about_titles(self):
+        note = self.notes[0]
+        note.body = note.body.replace("# First note", "# Another header")
+        self.write_note(note)
+
+        with redirect_stdout(StringIO()) as output:
+            self.zk.index_vault()
+        self.assertIn(f"note {note.zk_id} do not coincide", output.getvalue())
+
+        # workers print on their own output
+        with mock.patch.object(self.zk, 'read_many',
+                               wraps=self.zk.read_many) as read_many:
+            self.zk.multiprocess_index_vault()
+        self.assertFalse(read_many.call_args.kwargs['quiet'])
+
+    def test_reindex_with_default_special_values(self):
+        # initialize doesn't parse 'last' as a date
+        vault = self.vault.parent / "initialized"
+        zk = Zettelkasten.initialize(vault, author="Anonymous")
+        note = self.notes[0]
+        (vault / f"{note.zk_id}.md").write_text(note.materialize())
+
+        zk.index_vault()
+        self.assertEqual(
+            zk.list_notes(show=['title', 'creation_date', 'last_changed']),
+            [(note.title, str(note.date), str(note.last))])
+
+    def test_reindex(self):
+        self.zk.index_vault()
+        results = self.zk.list_notes(tags=["common"], show=['title'])
+        self.assertEqual(sorted(title for title, in results),
+                         sorted(self.titles))
+
+        links = self.zk.list_notes(zk_id=[self.notes[1].zk_id],
+                                   show=['link'])
+        self.assertEqual(links, [("first-note", )])
+
+
+class TestReadNote(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.note = self.notes[0]
+        self.note.body = self.note.body.replace("# First note",
+                                                "# Another header")
+        self.write_note(self.note)
+        with redirect_stdout(StringIO()):
+            self.zk.index_vault()
+
+    def test_cached_notes_are_checked(self):
+        self.zk.read_note(self.note.zk_id)
+
+        with redirect_stdout(StringIO()) as output:
+            self.zk.print_note(self.note.zk_id, record=False)
+        self.assertIn("do not coincide", output.getvalue())
+
+        with self.assertRaises(NoteException):
+            self.zk.read_note(self.note.zk_id, strict=True, quiet=False)
+
+
+class TestListNotes(ZettelkastenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zk.index_vault()
+
+    def test_pages_match_full_list(self):
+        full = self.zk.list_notes(sort_by='creation_date', descending=False)
+        self.assertEqual(len(full), len(self.titles))
+        pages = [
+            self.zk.list_notes(sort_by='creation_date',
+                               descending=False,
+                               limit=3,
+                               offset=offset) for offset in (0, 3)
+        ]
+        self.assertEqual(pages[0] + pages[1], full)
+
+    def test_count_matches_list(self):
+        for filters in [{}, {'title': ['%th%']}, {'tags': ['%tag1%']},
+                        {'tags': ['!%tag1%'], 'links': ['%note%']}]:
+            with self.subTest(filters=filters):
+                self.assertEqual(self.zk.count_notes(**filters),
+                                 len(self.zk.list_notes(**filters)))
+
+
+if __name__ == "__main__":
+    unittest.main()